@@ -1,28 +1,248 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import PyPDF2
-import re
 from io import BytesIO
-import numpy as np
-import sys
 import os
-import time
+import tempfile
 
-# Ajouter le répertoire utils au path pour les imports
-sys.path.append('utils')
+# Les modules lourds (pdfplumber, python-pptx, reportlab, plotly express) ne sont
+# importés qu'à la demande : la page d'accueil n'en a pas besoin et démarre ainsi
+# plus vite. plotly.graph_objects est de toute façon chargé par streamlit.
+# Voir scripts/measure_startup.py pour la mesure du temps de démarrage.
 
-try:
-    from pdf_parser import TelephoneReportParser
-    from visualizations import TelephoneReportVisualizer
-    from report_generator import PowerPointReportGenerator
-except ImportError:
-    # Fallback si les modules ne sont pas disponibles
-    TelephoneReportParser = None
-    TelephoneReportVisualizer = None
-    PowerPointReportGenerator = None
+# En production, RAPPORT_PIPELINE_STRICT=1 interdit le repli sur les données
+# de démonstration si un composant du pipeline ne se charge pas.
+STRICT_PIPELINE = os.environ.get('RAPPORT_PIPELINE_STRICT', '0') == '1'
+
+# Noms de colonnes affichés dans l'interface
+DISPLAY_COLUMNS = {
+    'mois': 'Mois',
+    'appels_traites': 'Appels_Traités',
+    'appels_presentes': 'Appels_Présentés',
+    'duree_moyenne_conv_s': 'Durée_Moyenne_Conv_s',
+    'nb_agents_max': 'Nb_Agents_Max',
+    'agent': 'Agent',
+    'performance': 'Performance'
+}
+
+
+# Nombre de workers partagés par toutes les sessions pour les exports
+EXPORT_WORKERS = int(os.environ.get('RAPPORT_EXPORT_WORKERS', '4'))
+
+# Les classeurs Excel, les présentations et les rapports PDF sont écrits dans un
+# fichier temporaire puis servis depuis le disque (RAPPORT_EXPORT_TO_DISK=0 pour
+# les garder en mémoire)
+EXPORT_TO_DISK = os.environ.get('RAPPORT_EXPORT_TO_DISK', '1') == '1'
+
+# Plafond mémoire du parsing en Mo (0 : parsing standard). Au-delà de quelques
+# centaines de pages, le mode borné libère les caches de chaque page traitée.
+PARSER_MEMORY_LIMIT_MB = float(os.environ.get('RAPPORT_PARSER_MEMORY_LIMIT_MB', '0'))
+
+# Budget de temps par page du PDF en secondes (0 : pas de limite). Les pages
+# sont alors extraites dans un worker tué en cas de dépassement.
+PARSER_PAGE_TIMEOUT = float(os.environ.get('RAPPORT_PARSER_PAGE_TIMEOUT', '0'))
+
+# Fichier des gabarits de mise en page appris par le parser (vide : désactivé).
+# Les tables ne sont ensuite détectées que dans les zones connues du gabarit.
+LAYOUT_CACHE_PATH = os.environ.get('RAPPORT_LAYOUT_CACHE', '')
+
+# Nombre de processus de parsing des uploads multi-sites (0 : un par cœur, 8 au plus)
+PARSE_WORKERS = int(os.environ.get('RAPPORT_PARSE_WORKERS', '0')) or min(8, os.cpu_count() or 1)
+
+# Traces d'exécution activées par défaut (RAPPORT_DEBUG=1)
+DEBUG_TRACES = os.environ.get('RAPPORT_DEBUG', '0') == '1'
+
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MIME_ZIP = "application/zip"
+
+# Formats d'export des données proposés dans l'interface
+DATA_EXPORT_FORMATS = {
+    'Excel (.xlsx)': 'xlsx',
+    'Parquet': 'parquet',
+    'Arrow IPC': 'arrow',
+    'CSV': 'csv'
+}
+MIME_PPTX = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+MIME_PDF = "application/pdf"
+
+
+@st.cache_resource(show_spinner=False)
+def get_pipeline():
+    """Charge à la demande le parser, le visualiseur et le générateur PowerPoint"""
+    from utils import load_pipeline
+    
+    return load_pipeline(strict=STRICT_PIPELINE, parser_options=parser_options())
+
+
+def parser_options():
+    """Options du parser issues de l'environnement"""
+    return {
+        'memory_limit_mb': PARSER_MEMORY_LIMIT_MB or None,
+        'page_timeout': PARSER_PAGE_TIMEOUT or None,
+        'layout_cache_path': LAYOUT_CACHE_PATH or None,
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def get_parse_pool():
+    """Pool de processus partagé par les sessions pour parser plusieurs rapports à la fois"""
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_queue():
+    """File de jobs d'export partagée entre toutes les sessions du serveur"""
+    from utils.jobs import ExportJobQueue
+    return ExportJobQueue(max_workers=EXPORT_WORKERS)
+
+
+def build_excel_export(frames, progress):
+    """Construit le classeur Excel ligne par ligne (exécuté dans un worker)"""
+    from utils.exporters import export_excel_to_tempfile, write_excel_streaming
+    
+    if EXPORT_TO_DISK:
+        return export_excel_to_tempfile(frames, progress=progress)
+    
+    output = BytesIO()
+    write_excel_streaming(frames, output, progress=progress)
+    return output.getvalue()
+
+
+def build_tables_export(parsed_data, fmt, progress):
+    """Exporte les tables au format colonnaire dans une archive ZIP (exécuté dans un worker)"""
+    from utils.exporters import export_tables
+    
+    output = BytesIO()
+    export_tables(parsed_data, fmt, output, progress=progress)
+    return output.getvalue()
+
+
+def build_powerpoint_export(pipeline, parsed_data, progress):
+    """Construit la présentation PowerPoint (exécuté dans un worker)"""
+    figures = {}
+    if pipeline.visualizer is not None:
+        progress(0.1, "Création des graphiques")
+        figures = pipeline.visualizer.create_monthly_performance_dashboard(parsed_data['monthly_data'])
+    
+    progress(0.3, "Assemblage des slides")
+    prs = pipeline.generator.create_presentation(parsed_data, figures)
+    progress(0.9, "Sérialisation du fichier")
+    if EXPORT_TO_DISK:
+        # Écriture directe dans le fichier servi au téléchargement, sans copie en mémoire
+        fd, path = tempfile.mkstemp(prefix='rapport_telephonie_', suffix='.pptx')
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                pipeline.generator.write_presentation(prs, output)
+        except Exception:
+            os.remove(path)
+            raise
+        return path
+    return pipeline.generator.get_presentation_bytes(prs)
+
+
+def build_pdf_export(pipeline, parsed_data, progress):
+    """Construit le rapport PDF (exécuté dans un worker)"""
+    from utils.pdf_report import PDFReportGenerator
+    
+    figures = {}
+    if pipeline.visualizer is not None:
+        progress(0.1, "Création des graphiques")
+        figures = pipeline.visualizer.create_monthly_performance_dashboard(parsed_data['monthly_data'])
+    
+    progress(0.3, "Mise en page du rapport")
+    generator = PDFReportGenerator()
+    if EXPORT_TO_DISK:
+        fd, path = tempfile.mkstemp(prefix='rapport_telephonie_', suffix='.pdf')
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                generator.write_pdf(parsed_data, figures, output)
+        except Exception:
+            os.remove(path)
+            raise
+        return path
+    return generator.get_pdf_bytes(parsed_data, figures)
+
+
+def submit_export(kind, func, *args, file_name, mime):
+    """Soumet un export à la file et mémorise le job dans la session"""
+    job_id = get_export_queue().submit(kind, func, *args, file_name=file_name, mime=mime)
+    st.session_state.setdefault('export_jobs', []).append(job_id)
+
+
+def render_export_downloads():
+    """Affiche les téléchargements prêts et les erreurs des exports de la session"""
+    from utils.jobs import JOB_DONE, JOB_FAILED
+    
+    jobs = get_export_queue().poll(st.session_state.get('export_jobs', []))
+    for job in reversed(jobs):
+        if job.status == JOB_DONE:
+            st.download_button(
+                label=f"📥 Télécharger {job.file_name}",
+                # Lu à la demande, au clic : le fichier n'est pas chargé à chaque rerun
+                data=job.read_result,
+                file_name=job.file_name,
+                mime=job.mime,
+                key=f"download_{job.id}"
+            )
+        elif job.status == JOB_FAILED:
+            st.error(f"{job.kind} : {job.message}")
+
+
+def render_export_progress():
+    """Affiche l'avancement des exports en cours de la session"""
+    jobs = get_export_queue().poll(st.session_state.get('export_jobs', []))
+    pending = [job.id for job in jobs if not job.is_finished]
+    
+    # Un export vient de se terminer : relance la page pour afficher son téléchargement
+    if set(st.session_state.get('pending_export_jobs', [])) - set(pending):
+        st.session_state['pending_export_jobs'] = pending
+        st.rerun()
+    st.session_state['pending_export_jobs'] = pending
+    
+    for job in jobs:
+        if not job.is_finished:
+            st.progress(job.progress, text=f"{job.kind} : {job.message}")
+
+
+def activate_tracing(enabled):
+    """Active le traceur de la session : parsing, graphiques et exports y sont enregistrés"""
+    from utils.tracing import Tracer, set_tracer
+    
+    if enabled:
+        tracer = st.session_state.setdefault('tracer', Tracer())
+        set_tracer(tracer)
+        return tracer
+    set_tracer(None)
+    return None
+
+
+def render_debug_panel(tracer):
+    """Affiche la durée et la mémoire de chaque étape tracée, avec export des traces"""
+    with st.expander("🐞 Traces d'exécution", expanded=False):
+        summary = tracer.summary()
+        if not summary:
+            st.info("Aucune étape tracée pour le moment")
+            return
+        
+        st.dataframe(pd.DataFrame(summary).round(1), use_container_width=True)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button("📥 Traces JSON", data=tracer.to_json(),
+                               file_name="traces.json", mime="application/json")
+        with col2:
+            # Format lisible par chrome://tracing ou Perfetto
+            st.download_button("📥 Chrome Trace", data=tracer.to_chrome_trace(),
+                               file_name="traces_chrome.json", mime="application/json")
+        with col3:
+            if st.button("🗑️ Réinitialiser les traces"):
+                tracer.clear()
+                st.rerun()
+
+
+# Rafraîchissement de l'avancement chaque seconde sans relancer toute la page
+if hasattr(st, 'fragment'):
+    render_export_progress = st.fragment(run_every=1)(render_export_progress)
 
 # Configuration de la page
 st.set_page_config(
@@ -38,51 +258,257 @@ st.markdown("Transformez vos rapports PDF en présentations interactives")
 
 # Sidebar pour upload et configuration
 st.sidebar.header("📁 Configuration")
-uploaded_file = st.sidebar.file_uploader(
-    "Choisissez un fichier PDF", 
+uploaded_files = st.sidebar.file_uploader(
+    "Choisissez un ou plusieurs fichiers PDF", 
     type="pdf",
-    help="Uploadez votre rapport de performance téléphonique"
-)
+    accept_multiple_files=True,
+    help="Uploadez votre rapport de performance téléphonique, ou un rapport par site pour les comparer"
+) or []
+uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
 
 # Options avancées
 st.sidebar.subheader("Options d'analyse")
 enable_advanced_parsing = st.sidebar.checkbox("Parser avancé", value=True)
 include_trends = st.sidebar.checkbox("Analyse des tendances", value=True)
 generate_recommendations = st.sidebar.checkbox("Recommandations automatiques", value=True)
+debug_mode = st.sidebar.checkbox("🐞 Mode debug (traces)", value=DEBUG_TRACES,
+                                 help="Mesure la durée et la mémoire de chaque étape du pipeline")
+tracer = activate_tracing(debug_mode)
 
 def extract_data_from_pdf(pdf_file):
     """Extrait les données du PDF (fonction de base pour fallback)"""
-    monthly_data = {
-        'Mois': ['Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin', 'Juillet', 'Août'],
-        'Appels_Traités': [570, 543, 550, 626, 434, 655, 502, 331],
-        'Appels_Présentés': [594, 554, 584, 641, 443, 672, 522, 342],
-        'Durée_Moyenne_Conv': [5.51, 5.06, 5.14, 5.26, 5.00, 4.51, 5.09, 6.16],
-        'Nb_Agents_Max': [3, 3, 2, 2, 1, 4, 4, 1]
+    monthly_data = pd.DataFrame({
+        'mois': ['Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin', 'Juillet', 'Août'],
+        'appels_traites': [570, 543, 550, 626, 434, 655, 502, 331],
+        'appels_presentes': [594, 554, 584, 641, 443, 672, 522, 342],
+        'duree_moyenne_conv_s': [331, 304, 308, 316, 300, 271, 305, 370],
+        'nb_agents_max': [3, 3, 2, 2, 1, 4, 4, 1]
+    })
+    
+    agents_data = pd.DataFrame({
+        'agent': ['Fabienne Cocquart', 'Philippe Kubler', 'Sébastien Sie', 'Franck Paira'],
+        'appels_presentes': [1890, 1654, 15, 3],
+        'appels_traites': [1830, 1598, 15, 3],
+        'performance': [97.0, 96.6, 100.0, 100.0]
+    })
+    
+    return {
+        'monthly_data': monthly_data,
+        'agents_data': agents_data,
+        'kpi_data': {},
+        'resolution_data': pd.DataFrame(),
+        'tickets_data': pd.DataFrame(),
+        'parsing_success': True
     }
+
+def parse_report(source, pipeline):
+    """Parse le PDF, ou réutilise le résultat de la session si son contenu est inchangé
+    
+    L'empreinte est calculée sur le tampon partagé de la PDFSource : chaque
+    relance du script (clic sur un bouton...) évite un nouveau parsing.
+    """
+    cached = st.session_state.get('parsed_report')
+    if cached is not None and cached[0] == source.digest:
+        return cached[1]
+    
+    parsed_data = pipeline.parser.parse_pdf(source)
+    if parsed_data.get('parsing_success'):
+        st.session_state['parsed_report'] = (source.digest, parsed_data)
+    return parsed_data
+
+def load_report_data(pdf_file, pipeline):
+    """Parse le PDF avec le pipeline avancé et signale explicitement tout repli"""
+    if not enable_advanced_parsing:
+        st.warning("Parser avancé désactivé : affichage des données de démonstration")
+        return extract_data_from_pdf(pdf_file)
+    
+    if pipeline.parser is None:
+        st.warning(f"Parser avancé indisponible ({pipeline.errors.get('parser')}) : "
+                   "affichage des données de démonstration")
+        return extract_data_from_pdf(pdf_file)
+    
+    parsed_data = parse_report(pdf_file, pipeline)
+    if not parsed_data.get('parsing_success'):
+        st.error(f"Erreur de parsing PDF : {parsed_data.get('error')}")
+        return None
+    
+    skipped_pages = parsed_data.get('skipped_pages')
+    if skipped_pages:
+        pages = ', '.join(str(skipped['page']) for skipped in skipped_pages)
+        st.warning(f"Pages ignorées (extraction trop longue ou en erreur) : {pages}")
+    
+    # Les colonnes numériques extraites des tableaux arrivent sous forme de texte
+    from utils.batch import coerce_numeric_columns
+    return coerce_numeric_columns(parsed_data)
+
+
+def parse_site_reports(files):
+    """Parse les rapports des sites sur le pool de processus et affiche chacun dès qu'il est prêt
+    
+    Les rapports déjà parsés dans la session (même contenu) ne sont pas
+    renvoyés au pool. Retourne les rapports parsés avec succès, par site.
+    """
+    from utils.batch import parse_reports_concurrently
+    from utils.ingestion import PDFSource
     
-    agents_data = {
-        'Agent': ['Fabienne Cocquart', 'Philippe Kubler', 'Sébastien Sie', 'Franck Paira'],
-        'Appels_Présentés_Total': [1890, 1654, 15, 3],
-        'Appels_Traités_Total': [1830, 1598, 15, 3],
-        'Performance': [97.0, 96.6, 100.0, 100.0]
+    cache = st.session_state.setdefault('site_reports', {})
+    digests, pending = {}, {}
+    for uploaded in files:
+        site = os.path.splitext(uploaded.name)[0]
+        # Deux fichiers de même nom restent deux sites distincts
+        while site in digests:
+            site += " (bis)"
+        with PDFSource.from_upload(uploaded) as source:
+            digests[site] = source.digest
+            if source.digest not in cache:
+                # Copie nécessaire : le contenu est transmis à un autre processus
+                pending[site] = source.view.tobytes()
+    
+    progress = st.progress(0.0, text="Analyse des rapports")
+    status = {site: st.empty() for site in digests}
+    
+    def show(site, parsed_data):
+        if parsed_data.get('parsing_success'):
+            status[site].success(f"✅ {site} : {len(parsed_data['monthly_data'])} mois, "
+                                 f"{len(parsed_data['agents_data'])} agents")
+        else:
+            status[site].error(f"❌ {site} : {parsed_data.get('error')}")
+    
+    for site, digest in digests.items():
+        if site in pending:
+            status[site].info(f"⏳ {site} : analyse en cours")
+        else:
+            show(site, cache[digest])
+    
+    done = len(digests) - len(pending)
+    for site, parsed_data in parse_reports_concurrently(get_parse_pool(), pending, parser_options()):
+        cache[digests[site]] = parsed_data
+        done += 1
+        progress.progress(done / len(digests), text=f"{done}/{len(digests)} rapports analysés")
+        show(site, parsed_data)
+    progress.empty()
+    
+    # Seuls les rapports de l'upload courant sont conservés dans la session
+    st.session_state['site_reports'] = {digest: cache[digest] for digest in digests.values()}
+    return {
+        site: cache[digest] for site, digest in digests.items()
+        if cache[digest].get('parsing_success')
     }
+
+
+def render_sites_dashboard(files):
+    """Tableau de bord consolidé de plusieurs sites"""
+    import plotly.express as px
+    from utils.batch import consolidate_reports
+    from utils.rollup import RollupCube
     
-    return monthly_data, agents_data
+    st.header("🏢 Comparaison Multi-Sites")
+    reports = parse_site_reports(files)
+    if not reports:
+        st.error("Aucun rapport exploitable parmi les fichiers uploadés")
+        st.stop()
+    
+    consolidated = consolidate_reports(reports)
+    sites = consolidated['sites']
+    if 'appels_presentes' not in sites:
+        st.error("Aucune donnée mensuelle exploitable n'a été extraite des PDF")
+        st.stop()
+    
+    totals = RollupCube.from_reports(reports).totals()
+    total_appels = totals['appels_presentes']
+    total_traités = totals['appels_traites']
+    taux_resolution = (total_traités / total_appels * 100) if total_appels > 0 else 0
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Sites", len(reports))
+    with col2:
+        st.metric("Total Appels Présentés", f"{total_appels:,.0f}")
+    with col3:
+        st.metric("Total Appels Traités", f"{total_traités:,.0f}")
+    with col4:
+        st.metric("Taux de Résolution", f"{taux_resolution:.1f}%")
+    
+    fig_sites = px.bar(
+        sites, x='site', y=['appels_presentes', 'appels_traites'],
+        title="Volume d'Appels par Site", barmode='group'
+    )
+    st.plotly_chart(fig_sites, use_container_width=True)
+    
+    fig_taux = px.bar(sites, x='site', y='taux_resolution', title="Taux de Résolution par Site (%)")
+    st.plotly_chart(fig_taux, use_container_width=True)
+    
+    monthly_by_site = consolidated['monthly_by_site']
+    fig_monthly = px.line(
+        monthly_by_site, x='mois', y='appels_traites', color='site', markers=True,
+        title="Appels Traités par Mois et par Site"
+    )
+    st.plotly_chart(fig_monthly, use_container_width=True)
+    
+    st.subheader("Données Consolidées")
+    tab1, tab2, tab3 = st.tabs(["🏢 Sites", "📈 Mensuel (tous sites)", "👥 Agents (tous sites)"])
+    with tab1:
+        st.dataframe(sites, use_container_width=True)
+    with tab2:
+        st.dataframe(consolidated['monthly_data'].rename(columns=DISPLAY_COLUMNS), use_container_width=True)
+    with tab3:
+        st.dataframe(consolidated['agents_data'].rename(columns=DISPLAY_COLUMNS), use_container_width=True)
+    
+    if st.button("📊 Export Excel consolidé"):
+        frames = {
+            'Sites': sites,
+            'Mensuel consolidé': consolidated['monthly_data'],
+            'Mensuel par site': monthly_by_site,
+            'Agents': consolidated['agents_data'],
+        }
+        submit_export(
+            "Export Excel multi-sites", build_excel_export,
+            {name: df for name, df in frames.items() if not df.empty},
+            file_name=f"rapport_multisites_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx", mime=MIME_XLSX
+        )
+    render_export_progress()
+    render_export_downloads()
 
 # Interface principale
-if uploaded_file is not None:
+if len(uploaded_files) > 1:
+    render_sites_dashboard(uploaded_files)
+    
+    if tracer is not None:
+        render_debug_panel(tracer)
+
+elif uploaded_file is not None:
+    import plotly.express as px
+
     st.success("📄 Fichier PDF chargé avec succès")
+
+    pipeline = get_pipeline()
+    with st.sidebar.expander("🔧 Composants du pipeline", expanded=not pipeline.is_complete):
+        for name, status in pipeline.status_report().items():
+            st.write(f"{'✅' if name in pipeline.loaded else '❌'} {name} : {status}")
+    
+    # Extraction des données : le PDF est lu une fois dans le tampon de l'upload,
+    # partagé par le hachage et le parsing
+    from utils.ingestion import PDFSource
+    
+    with PDFSource.from_upload(uploaded_file) as source:
+        parsed_data = load_report_data(source, pipeline)
+    if parsed_data is None:
+        st.stop()
+    
+    monthly_df = parsed_data['monthly_data']
+    agents_df = parsed_data['agents_data']
+    if monthly_df.empty or 'appels_presentes' not in monthly_df or 'appels_traites' not in monthly_df:
+        st.error("Aucune donnée mensuelle exploitable n'a été extraite du PDF")
+        st.stop()
     
-    # Extraction des données
-    monthly_data, agents_data = extract_data_from_pdf(uploaded_file)
-    monthly_df = pd.DataFrame(monthly_data)
-    agents_df = pd.DataFrame(agents_data)
+    # Calcul des KPIs (cube d'agrégats construit une fois, réutilisé par l'export PowerPoint)
+    from utils.rollup import rollup_for
     
-    # Calcul des KPIs
-    total_appels = monthly_df['Appels_Présentés'].sum()
-    total_traités = monthly_df['Appels_Traités'].sum()
-    taux_resolution = (total_traités / total_appels * 100)
-    duree_moy_globale = monthly_df['Durée_Moyenne_Conv'].mean()
+    totals = rollup_for(parsed_data).totals()
+    total_appels = totals['appels_presentes']
+    total_traités = totals['appels_traites']
+    taux_resolution = (total_traités / total_appels * 100) if total_appels > 0 else 0
+    duree_moy_globale = totals['duree_moyenne_conv_s'] / 60 if 'duree_moyenne_conv_s' in monthly_df else 0
     
     # Section KPI
     st.header("📊 Indicateurs Clés de Performance")
@@ -111,21 +537,25 @@ if uploaded_file is not None:
     # Graphiques
     st.header("📊 Visualisations")
     
+    monthly_display = monthly_df.rename(columns=DISPLAY_COLUMNS)
+    agents_display = agents_df.rename(columns=DISPLAY_COLUMNS)
+    
     # Graphique volume mensuel
-    fig_volume = px.bar(
-        monthly_df, 
-        x='Mois', 
-        y=['Appels_Présentés', 'Appels_Traités'],
-        title="Volume d'Appels Mensuel",
-        barmode='group'
-    )
-    st.plotly_chart(fig_volume, use_container_width=True)
+    if 'Mois' in monthly_display:
+        fig_volume = px.bar(
+            monthly_display, 
+            x='Mois', 
+            y=['Appels_Présentés', 'Appels_Traités'],
+            title="Volume d'Appels Mensuel",
+            barmode='group'
+        )
+        st.plotly_chart(fig_volume, use_container_width=True)
     
     # Graphique agents
-    if not agents_df.empty:
+    if not agents_display.empty and 'Agent' in agents_display and 'Appels_Traités' in agents_display:
         fig_agents = px.pie(
-            agents_df, 
-            values='Appels_Traités_Total', 
+            agents_display, 
+            values='Appels_Traités', 
             names='Agent',
             title="Répartition des Appels par Agent"
         )
@@ -135,23 +565,53 @@ if uploaded_file is not None:
     st.header("📄 Export")
     col1, col2 = st.columns(2)
     
+    export_date = pd.Timestamp.now().strftime('%Y%m%d')
+    
     with col1:
-        if st.button("📊 Export Excel"):
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                monthly_df.to_excel(writer, sheet_name='Données Mensuelles', index=False)
-                agents_df.to_excel(writer, sheet_name='Agents', index=False)
-            
-            st.download_button(
-                label="📥 Télécharger Excel",
-                data=output.getvalue(),
-                file_name=f"rapport_telephonie_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        export_format = DATA_EXPORT_FORMATS[st.selectbox("Format des données", list(DATA_EXPORT_FORMATS))]
+        
+        if export_format != 'xlsx' and st.button("📊 Exporter les données"):
+            submit_export(
+                f"Export {export_format}", build_tables_export, parsed_data, export_format,
+                file_name=f"rapport_telephonie_{export_date}_{export_format}.zip", mime=MIME_ZIP
+            )
+        
+        if export_format == 'xlsx' and st.button("📊 Export Excel"):
+            excel_frames = {
+                'Données Mensuelles': monthly_display,
+                'Agents': agents_display,
+                'Résolution': parsed_data.get('resolution_data', pd.DataFrame()),
+                'Tickets N2': parsed_data.get('tickets_data', pd.DataFrame())
+            }
+            excel_frames = {name: df for name, df in excel_frames.items() if not df.empty}
+            submit_export(
+                "Export Excel", build_excel_export, excel_frames,
+                file_name=f"rapport_telephonie_{export_date}.xlsx", mime=MIME_XLSX
             )
     
     with col2:
         if st.button("📄 Générer PowerPoint"):
-            st.info("Génération PowerPoint disponible avec les modules avancés")
+            if pipeline.generator is None:
+                st.info("Génération PowerPoint disponible avec les modules avancés")
+            else:
+                submit_export(
+                    "PowerPoint", build_powerpoint_export, pipeline, parsed_data,
+                    file_name=f"rapport_telephonie_{export_date}.pptx", mime=MIME_PPTX
+                )
+        
+        if st.button("📑 Générer PDF"):
+            # Le rapport PDF reprend le contenu préparé par le générateur PowerPoint
+            if pipeline.generator is None:
+                st.info("Génération PDF disponible avec les modules avancés")
+            else:
+                submit_export(
+                    "PDF", build_pdf_export, pipeline, parsed_data,
+                    file_name=f"rapport_telephonie_{export_date}.pdf", mime=MIME_PDF
+                )
+    
+    # Les exports tournent en arrière-plan : l'interface reste utilisable
+    render_export_progress()
+    render_export_downloads()
     
     # Tableaux de données
     st.subheader("Données Détaillées")
@@ -159,10 +619,13 @@ if uploaded_file is not None:
     tab1, tab2 = st.tabs(["📈 Données Mensuelles", "👥 Performance Agents"])
     
     with tab1:
-        st.dataframe(monthly_df, use_container_width=True)
+        st.dataframe(monthly_display, use_container_width=True)
     
     with tab2:
-        st.dataframe(agents_df, use_container_width=True)
+        st.dataframe(agents_display, use_container_width=True)
+    
+    if tracer is not None:
+        render_debug_panel(tracer)
 
 else:
     # Page d'accueil
@@ -207,14 +670,9 @@ else:
         'Appels_Traités': [550, 500, 620, 690, 650, 570]
     })
     
-    fig_demo = px.bar(
-        sample_data, 
-        x='Mois', 
-        y=['Appels_Reçus', 'Appels_Traités'],
-        title="Exemple de Visualisation",
-        barmode='group'
-    )
-    st.plotly_chart(fig_demo, use_container_width=True)
+    # Graphique natif Streamlit : évite de charger plotly sur la page d'accueil
+    st.caption("Exemple de Visualisation")
+    st.bar_chart(sample_data.set_index('Mois'), use_container_width=True)
 
 # Footer
 st.markdown("---")
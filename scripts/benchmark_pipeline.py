@@ -0,0 +1,276 @@
+"""Benchmark de bout en bout du pipeline : PDF en entrée, PPTX et XLSX en sortie
+
+Pour chaque taille de rapport demandée, un PDF synthétique est généré à partir
+des données d'exemple (``create_sample_data``), dont les sections mensuelles
+reprennent le format de ``test_parser``. Chaque itération enchaîne :
+
+- ``parse`` : extraction du PDF par ``TelephoneReportParser``
+- ``visualize`` : graphiques mensuels et agents
+- ``pptx`` : assemblage et sérialisation de la présentation
+- ``xlsx`` : export Excel en streaming
+
+Les itérations sont réparties sur ``--workers`` processus. Le script rapporte
+les latences p50/p95 par étape, le débit par cœur (rapports/s/worker) et la
+RSS maximale des workers. Les résultats sont enregistrés dans
+``benchmarks/results/<commit>.json`` pour comparer les commits entre eux.
+
+Usage :
+    python scripts/benchmark_pipeline.py [--size 12x20 --size 12x500]
+        [--repeat 10] [--workers 1] [--baseline <commit>]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+STAGES = ('parse', 'visualize', 'pptx', 'xlsx')
+
+MONTHS = ['Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin', 'Juillet',
+          'Août', 'Septembre', 'Octobre', 'Novembre', 'Décembre']
+
+
+def build_synthetic_data(months: int, agents: int, seed: int = 0) -> dict:
+    """Étend les données d'exemple à ``months`` mois et ``agents`` agents"""
+    from utils.report_generator import create_sample_data
+
+    sample = create_sample_data()
+    rng = np.random.default_rng(seed)
+
+    monthly = sample['monthly_data'].sample(months, replace=True, random_state=seed).reset_index(drop=True)
+    monthly['mois'] = [MONTHS[i % len(MONTHS)] for i in range(months)]
+    jitter = rng.uniform(0.9, 1.1, months)
+    monthly['appels_presentes'] = (monthly['appels_presentes'] * jitter).round().astype(int)
+    monthly['appels_traites'] = np.minimum(monthly['appels_traites'] * jitter, monthly['appels_presentes']).round().astype(int)
+
+    agents_df = sample['agents_data'].sample(agents, replace=True, random_state=seed).reset_index(drop=True)
+    agents_df['agent'] = [f"Agent {i + 1:04d}" for i in range(agents)]
+    jitter = rng.uniform(0.5, 1.5, agents)
+    agents_df['appels_presentes'] = (agents_df['appels_presentes'] * jitter).round().astype(int)
+    agents_df['appels_traites'] = np.minimum(agents_df['appels_traites'] * jitter, agents_df['appels_presentes']).round().astype(int)
+
+    return {'monthly_data': monthly, 'agents_data': agents_df}
+
+
+def write_synthetic_pdf(data: dict, path: str):
+    """Écrit un rapport PDF synthétique lisible par le parser"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table
+
+    from utils.pdf_parser import SAMPLE_MONTH_TEXT
+
+    style = getSampleStyleSheet()['Normal']
+    elements = []
+    for row in data['monthly_data'].itertuples(index=False):
+        minutes, seconds = divmod(int(row.duree_moyenne_conv_s), 60)
+        hours, minutes = divmod(minutes, 60)
+        section = SAMPLE_MONTH_TEXT.format(
+            mois=row.mois, appels_traites=row.appels_traites, appels_presentes=row.appels_presentes,
+            duree=f"{hours:02d}:{minutes:02d}:{seconds:02d}", nb_agents_max=row.nb_agents_max
+        )
+        elements.extend(Paragraph(line.strip(), style) for line in section.strip().splitlines())
+        elements.append(PageBreak())
+
+    agents = data['agents_data']
+    elements.append(Paragraph("Cloture", style))
+    elements.append(Table(
+        [['Agent', 'appels_presentes', 'appels_traites']]
+        + agents[['agent', 'appels_presentes', 'appels_traites']].astype(str).values.tolist(),
+        # Bordures nécessaires à la détection du tableau par pdfplumber
+        style=[('GRID', (0, 0), (-1, -1), 0.5, 'black')], repeatRows=1
+    ))
+    SimpleDocTemplate(path, pagesize=A4).build(elements)
+
+
+def run_iteration(pipeline, pdf_path: str) -> dict:
+    """Exécute le pipeline complet sur un PDF et retourne la durée de chaque étape"""
+    from utils.batch import coerce_numeric_columns
+    from utils.exporters import write_excel_streaming
+
+    timings = {}
+
+    start = time.perf_counter()
+    parsed_data = pipeline.parser.parse_pdf(pdf_path)
+    if not parsed_data.get('parsing_success'):
+        raise RuntimeError(f"Parsing impossible: {parsed_data.get('error')}")
+    # Conversion numérique partagée avec app.py et l'API
+    coerce_numeric_columns(parsed_data)
+    timings['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    figures = pipeline.visualizer.create_monthly_performance_dashboard(parsed_data['monthly_data'])
+    pipeline.visualizer.create_agents_performance_dashboard(parsed_data['agents_data'])
+    timings['visualize'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prs = pipeline.generator.create_presentation(parsed_data, figures)
+    pipeline.generator.write_presentation(prs, io.BytesIO())
+    timings['pptx'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frames = {key: parsed_data[key] for key in ('monthly_data', 'agents_data') if not parsed_data[key].empty}
+    with tempfile.TemporaryFile() as output:
+        write_excel_streaming(frames, output)
+    timings['xlsx'] = time.perf_counter() - start
+
+    timings['total'] = sum(timings[stage] for stage in STAGES)
+    timings['rows'] = {key: len(parsed_data[key]) for key in ('monthly_data', 'agents_data')}
+    return timings
+
+
+def run_worker(pdf_path: str, iterations: int, warmup: int) -> dict:
+    """Exécute les itérations d'un worker (après échauffement) et mesure sa RSS maximale"""
+    from utils import load_pipeline
+
+    pipeline = load_pipeline(strict=True)
+    for _ in range(warmup):
+        run_iteration(pipeline, pdf_path)
+    runs = [run_iteration(pipeline, pdf_path) for _ in range(iterations)]
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        max_rss //= 1024
+    return {'runs': runs, 'max_rss_mb': max_rss / 1024}
+
+
+def benchmark_size(months: int, agents: int, repeat: int, workers: int, warmup: int) -> dict:
+    """Mesure le pipeline pour une taille de rapport"""
+    data = build_synthetic_data(months, agents)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, f"rapport_{months}x{agents}.pdf")
+        write_synthetic_pdf(data, pdf_path)
+        pdf_size = os.path.getsize(pdf_path)
+
+        # Répartition des itérations entre les workers
+        shares = [repeat // workers + (i < repeat % workers) for i in range(workers)]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_worker, [pdf_path] * workers, shares, [warmup] * workers))
+        wall_seconds = time.perf_counter() - start
+        runs = [run for result in results for run in result['runs']]
+
+    # Durée utile : celle du worker le plus lent, échauffement et démarrage exclus
+    elapsed = max(sum(run['total'] for run in result['runs']) for result in results)
+    stages = {}
+    for stage in STAGES + ('total',):
+        values = np.array([run[stage] for run in runs]) * 1000
+        stages[stage] = {
+            'p50_ms': round(float(np.percentile(values, 50)), 2),
+            'p95_ms': round(float(np.percentile(values, 95)), 2),
+            'mean_ms': round(float(values.mean()), 2),
+        }
+
+    return {
+        'months': months,
+        'agents': agents,
+        'pdf_kb': round(pdf_size / 1024, 1),
+        'parsed_rows': runs[-1]['rows'],
+        'iterations': len(runs),
+        'workers': workers,
+        'wall_seconds': round(wall_seconds, 3),
+        'stages': stages,
+        'throughput_per_core': round(len(runs) / elapsed / workers, 3),
+        'peak_rss_mb': round(max(result['max_rss_mb'] for result in results), 1),
+    }
+
+
+def current_commit() -> str:
+    """Commit courant (suffixé de -dirty si l'arbre de travail est modifié)"""
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip()
+
+    commit = git('rev-parse', '--short', 'HEAD') or 'inconnu'
+    if git('status', '--porcelain', '--untracked-files=no'):
+        commit += '-dirty'
+    return commit
+
+
+def parse_size(value: str) -> tuple:
+    """Taille de rapport au format ``<mois>x<agents>``"""
+    try:
+        months, agents = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Taille invalide (attendu <mois>x<agents>): {value}")
+    return months, agents
+
+
+def print_results(results: dict, baseline: dict = None):
+    """Affiche les mesures, avec l'écart par rapport à un commit de référence"""
+    reference = {(size['months'], size['agents']): size for size in (baseline or {}).get('sizes', [])}
+
+    for size in results['sizes']:
+        print(f"\nRapport {size['months']} mois x {size['agents']} agents "
+              f"({size['pdf_kb']} Ko, {size['iterations']} itérations, {size['workers']} worker(s))")
+        print(f"{'Étape':<12}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+        base = reference.get((size['months'], size['agents']))
+        for stage, values in size['stages'].items():
+            line = f"{stage:<12}{values['p50_ms']:>12.1f}{values['p95_ms']:>12.1f}"
+            if base:
+                before = base['stages'][stage]['p50_ms']
+                line += f"   p50 {(values['p50_ms'] - before) / before * 100:+.1f}% vs {baseline['commit']}"
+            print(line)
+        print(f"Débit : {size['throughput_per_core']:.2f} rapports/s/cœur — "
+              f"RSS max : {size['peak_rss_mb']:.0f} Mo")
+        parsed = size['parsed_rows']
+        if (parsed['monthly_data'], parsed['agents_data']) != (size['months'], size['agents']):
+            print(f"⚠️ Lignes extraites : {parsed['monthly_data']} mois, {parsed['agents_data']} agents "
+                  f"(le parser ne lit que la première page du tableau des agents)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', dest='sizes', type=parse_size, action='append',
+                        help="Taille du rapport <mois>x<agents> (répétable, 12x20 et 12x500 par défaut)")
+    parser.add_argument('--repeat', type=int, default=10, help="Nombre d'itérations mesurées par taille")
+    parser.add_argument('--warmup', type=int, default=1, help="Itérations d'échauffement par worker")
+    parser.add_argument('--workers', type=int, default=1, help="Nombre de processus en parallèle")
+    parser.add_argument('--output', default=RESULTS_DIR, help="Répertoire des résultats")
+    parser.add_argument('--baseline', help="Commit de référence pour la comparaison")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT_DIR)
+    results = {
+        'commit': current_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'sizes': [
+            benchmark_size(months, agents, args.repeat, min(args.workers, args.repeat), args.warmup)
+            for months, agents in args.sizes or [(12, 20), (12, 500)]
+        ],
+    }
+
+    baseline = None
+    if args.baseline:
+        baseline_path = os.path.join(args.output, f"{args.baseline}.json")
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding='utf-8') as f:
+                baseline = json.load(f)
+        else:
+            print(f"⚠️ Aucun résultat pour le commit {args.baseline} dans {args.output}")
+
+    print_results(results, baseline)
+
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{results['commit']}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nRésultats enregistrés dans {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Vérifie la reprise du service d'ingestion après un arrêt brutal
+
+Trois rapports sont déposés dans un répertoire temporaire. Le premier
+passage est interrompu brutalement (exception hors du service, sans
+nettoyage) pendant le traitement du deuxième rapport ; un nouveau service
+chargé depuis le même checkpoint doit alors retraiter les rapports restés
+inachevés, et eux seuls. Une présentation en échec doit être enregistrée
+comme telle sans interrompre le passage.
+
+Le parsing et la génération sont remplacés par des versions minimales :
+seul le suivi d'état du service est vérifié.
+
+Usage :
+    python scripts/check_watcher_resume.py
+"""
+
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import batch  # noqa: E402
+from utils.watcher import IngestionService  # noqa: E402
+
+
+class Crash(BaseException):
+    """Arrêt brutal simulé (non intercepté par le service)"""
+
+
+def fake_parse(source, parser_options):
+    """Parsing minimal : le contenu du fichier devient le volume du mois"""
+    with open(source, 'rb') as f:
+        volume = len(f.read())
+    return {'parsing_success': True,
+            'monthly_data': pd.DataFrame({'mois': ['Janvier'], 'appels_presentes': [volume]}),
+            'agents_data': pd.DataFrame()}
+
+
+class CheckedService(IngestionService):
+    """Service dont la génération écrit un fichier vide, ou échoue sur demande"""
+
+    crash_on = None
+    fail_on = None
+
+    def _handle_report(self, path, digest, parsed_data):
+        if os.path.basename(path) == self.crash_on:
+            raise Crash(path)
+        return super()._handle_report(path, digest, parsed_data)
+
+    def _write_deck(self, parsed_data, deck_path):
+        if os.path.basename(deck_path) == self.fail_on:
+            raise OSError("disque plein")
+        open(deck_path, 'wb').close()
+
+
+def main():
+    batch._parse_in_worker = fake_parse
+
+    with tempfile.TemporaryDirectory() as root:
+        watch_dir, output_dir = os.path.join(root, 'pdf'), os.path.join(root, 'decks')
+        os.makedirs(watch_dir)
+        names = ['r0.pdf', 'r1.pdf', 'r2.pdf']
+        for i, name in enumerate(names):
+            with open(os.path.join(watch_dir, name), 'wb') as f:
+                f.write(b'%PDF' + b'x' * (i + 1))
+
+        # Un seul worker : les rapports sont restitués dans l'ordre de soumission
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            service = CheckedService(watch_dir, output_dir, settle_seconds=0)
+            service.crash_on = 'r1.pdf'
+            try:
+                service.process_pending(executor)
+                raise AssertionError("l'arrêt brutal n'a pas eu lieu")
+            except Crash:
+                pass
+
+            restarted = CheckedService(watch_dir, output_dir, settle_seconds=0)
+            statuses = {os.path.basename(p): r['status'] for p, r in restarted.state['files'].items()}
+            pending = [os.path.basename(p) for p in restarted._changed_files()]
+            print(f"Checkpoint après l'arrêt : {statuses}")
+            print(f"À retraiter au redémarrage : {pending}")
+            assert statuses['r0.pdf'] == 'traité'
+            assert pending == ['r1.pdf', 'r2.pdf'], pending
+
+            restarted.fail_on = 'r2.pptx'
+            counts = restarted.process_pending(executor)
+            statuses = {os.path.basename(p): r['status'] for p, r in restarted.state['files'].items()}
+            assert counts['présentations'] == 1 and counts['échecs'] == 1, counts
+            assert statuses == {'r0.pdf': 'traité', 'r1.pdf': 'traité', 'r2.pdf': 'échec'}, statuses
+            assert not os.path.exists(os.path.join(output_dir, 'r2.pptx.tmp'))
+            assert restarted._changed_files() == []
+
+    print("✅ Reprise après arrêt brutal et échec de génération vérifiés")
+
+
+if __name__ == "__main__":
+    main()
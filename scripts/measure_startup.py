@@ -0,0 +1,121 @@
+"""Mesure du temps de démarrage de la page d'accueil de app.py
+
+Chaque scénario est exécuté dans un interpréteur Python neuf pour mesurer un
+démarrage à froid. ``import app`` exécute le script Streamlit en mode « bare »
+(sans serveur ni fichier uploadé), c'est-à-dire la page d'accueil, sans le
+coût d'un harnais de test :
+
+- ``streamlit`` : import de streamlit seul, socle incompressible (streamlit
+  importe lui-même ``plotly.graph_objects`` pour son thème)
+- ``accueil`` : ``import app``
+- ``pile_complete`` : même exécution, précédée de l'import des modules lourds
+  (PDF, PowerPoint, plotly) qu'importait auparavant app.py au chargement
+
+L'écart entre ``accueil`` et ``pile_complete`` correspond au gain des imports
+différés ; l'écart avec ``streamlit`` au coût propre de app.py. Le script liste
+aussi les modules lourds chargés par app.py en plus de ceux de streamlit et,
+d'après ``python -X importtime``, les imports les plus coûteux déclenchés
+directement par app.py (y compris ceux des éléments ``st.*`` affichés).
+
+Usage :
+    python scripts/measure_startup.py [--repeat 5] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = [
+    'plotly.express',
+    'plotly.graph_objects',
+    'plotly.subplots',
+    'PyPDF2',
+    'pdfplumber',
+    'pptx',
+    'reportlab',
+    'openpyxl',
+]
+
+STARTUP_SNIPPET = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in {preload!r}:
+    importlib.import_module(name)
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'heavy_loaded': heavy}}))
+"""
+
+
+def run_scenario(module: str, preload: list, importtime: bool = False) -> dict:
+    """Importe ``module`` dans un processus neuf et retourne sa mesure
+
+    Avec ``importtime``, la sortie de ``-X importtime`` est jointe au résultat.
+    """
+    code = STARTUP_SNIPPET.format(heavy=HEAVY_MODULES, preload=preload, module=module)
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    completed = subprocess.run(command, cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    if importtime:
+        result['importtime'] = completed.stderr
+    return result
+
+
+def direct_imports(importtime_output: str, module: str) -> list:
+    """Imports directs de ``module`` avec leur durée cumulée en secondes, du plus coûteux au moins coûteux
+
+    ``-X importtime`` liste chaque module après ses propres imports, indentés
+    de deux espaces par niveau : les imports directs sont les lignes de
+    niveau 1 qui précèdent la ligne de ``module``.
+    """
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((depth, name.strip(), int(cumulative) / 1e6))
+
+    end = next(i for i, (depth, name, _) in enumerate(rows) if depth == 0 and name == module)
+    start = max((i for i, (depth, _, _) in enumerate(rows[:end]) if depth == 0), default=-1)
+    children = [(name, seconds) for depth, name, seconds in rows[start + 1:end] if depth == 1]
+    return [('(total)', rows[end][2])] + sorted(children, key=lambda child: child[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre d'exécutions par scénario")
+    parser.add_argument('--top', type=int, default=10, help="Nombre d'imports de app.py affichés")
+    args = parser.parse_args()
+
+    scenarios = {
+        'streamlit': ('streamlit', []),
+        'accueil': ('app', []),
+        'pile_complete': ('app', HEAVY_MODULES),
+    }
+
+    print(f"{'Scénario':<16}{'médiane (s)':>14}{'min (s)':>10}  modules lourds chargés")
+    loaded = {}
+    for name, (module, preload) in scenarios.items():
+        runs = [run_scenario(module, preload) for _ in range(args.repeat)]
+        timings = [run['seconds'] for run in runs]
+        loaded[name] = runs[-1]['heavy_loaded']
+        print(f"{name:<16}{statistics.median(timings):>14.3f}{min(timings):>10.3f}  {', '.join(loaded[name]) or 'aucun'}")
+
+    added = [module for module in loaded['accueil'] if module not in loaded['streamlit']]
+    print(f"\nModules lourds chargés par app.py en plus de streamlit : {', '.join(added) or 'aucun'}")
+
+    profile = run_scenario('app', [], importtime=True)
+    print("\nImports déclenchés par app.py (python -X importtime, durée cumulée) :")
+    for module, seconds in direct_imports(profile['importtime'], 'app')[:args.top + 1]:
+        print(f"  {seconds * 1000:>9.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""Pipeline d'analyse des rapports de téléphonie
+
+Le point d'entrée unique est :func:`load_pipeline`, qui résout le parser PDF,
+le visualiseur et le générateur PowerPoint depuis ce package. Les modules
+lourds ne sont importés qu'au chargement du pipeline.
+"""
+
+from .pipeline import Pipeline, PipelineLoadError, load_pipeline
+
+__all__ = ['Pipeline', 'PipelineLoadError', 'load_pipeline']
@@ -0,0 +1,407 @@
+"""API HTTP locale de génération de rapports
+
+Expose le pipeline sans l'interface Streamlit. Le PDF est envoyé brut dans
+le corps d'une requête POST :
+
+    curl --data-binary @rapport.pdf -H 'Content-Type: application/pdf' \\
+         http://127.0.0.1:8502/pptx -o rapport.pptx
+
+Routes :
+
+- ``POST /parse`` : données extraites (JSON)
+- ``POST /figures`` : graphiques mensuels (JSON Plotly)
+- ``POST /xlsx`` : tables du rapport (classeur Excel)
+- ``POST /pptx`` : présentation PowerPoint
+- ``GET /metrics`` : latences (p50/p95/p99) et compteurs par route
+- ``GET /health`` : état du service
+
+Le travail est exécuté par un pool de processus dont chaque worker charge
+le pipeline une fois au démarrage (parser, visualiseur, générateur et leurs
+caches restent chauds d'une requête à l'autre). Au-delà de ``workers +
+queue_size`` requêtes en cours, les nouvelles sont refusées (503 et
+``Retry-After``) plutôt que mises en attente sans limite.
+
+Usage :
+    python -m utils.api [--host 127.0.0.1] [--port 8502] [--workers 2] [--queue-size 8]
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple, Union
+
+# Routes de rendu : nom -> (type MIME, extension du fichier renvoyé)
+RENDER_ROUTES = {
+    'parse': ('application/json', '.json'),
+    'figures': ('application/json', '.json'),
+    'xlsx': ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", '.xlsx'),
+    'pptx': ("application/vnd.openxmlformats-officedocument.presentationml.presentation", '.pptx'),
+}
+
+# Taille maximale d'un PDF accepté (octets), comme pour l'upload Streamlit
+MAX_PDF_SIZE = 50 * 1024 * 1024
+
+# Nombre de latences conservées par route pour le calcul des percentiles
+LATENCY_WINDOW = 1000
+
+# Délai suggéré au client lorsque la file est pleine (secondes)
+RETRY_AFTER = 1
+
+# Taille des blocs lus dans un fichier de sortie pour la réponse HTTP
+RESPONSE_CHUNK_SIZE = 1024 * 1024
+
+# Pipeline du processus worker, chargé par _init_worker
+_WORKER_PIPELINE = None
+
+
+class ReportRejected(ValueError):
+    """PDF reçu mais rapport inexploitable (renvoyé en 422)"""
+
+
+def _init_worker(parser_options: Dict):
+    """Charge le pipeline complet dans le worker, une fois pour toutes les requêtes"""
+    global _WORKER_PIPELINE
+    from .pipeline import load_pipeline
+
+    _WORKER_PIPELINE = load_pipeline(strict=True, parser_options=parser_options)
+
+
+def _warm_up() -> bool:
+    """Tâche vide : force le démarrage d'un worker avant la première requête"""
+    return _WORKER_PIPELINE is not None
+
+
+def _frame_records(df) -> list:
+    """DataFrame -> liste d'enregistrements JSON (NaN -> null)"""
+    return json.loads(df.to_json(orient='records', force_ascii=False))
+
+
+def _write_temp_file(write, suffix: str) -> str:
+    """Écrit une sortie dans un fichier temporaire et retourne son chemin (supprimé en cas d'erreur)"""
+    fd, path = tempfile.mkstemp(prefix='rapport_api_', suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            write(output)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _render_in_worker(kind: str, data: bytes) -> Tuple[Union[bytes, str], Dict[str, float]]:
+    """Parse le PDF puis produit la sortie demandée ; retourne le corps et les durées par étape
+
+    Les classeurs et présentations sont écrits en flux dans un fichier
+    temporaire dont le chemin est retourné à la place du contenu : ils ne
+    sont ni copiés en mémoire ni transmis au processus principal par le pipe.
+    """
+    from .batch import coerce_numeric_columns
+    from .ingestion import PDFSource
+
+    pipeline = _WORKER_PIPELINE
+    timings = {}
+    start = time.perf_counter()
+    with PDFSource.open(data) as source:
+        parsed_data = pipeline.parser.parse_pdf(source)
+    if not parsed_data.get('parsing_success'):
+        raise ReportRejected(parsed_data.get('error') or "Rapport illisible")
+    coerce_numeric_columns(parsed_data)
+    timings['parse'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    if kind == 'parse':
+        body = json.dumps({
+            key: _frame_records(value) if hasattr(value, 'to_json') else value
+            for key, value in parsed_data.items()
+        }, ensure_ascii=False, default=str).encode('utf-8')
+    elif kind == 'xlsx':
+        from .exporters import EXPORT_SCHEMAS, write_excel_streaming
+
+        frames = {table: parsed_data[table] for table in EXPORT_SCHEMAS
+                  if table in parsed_data and not parsed_data[table].empty}
+        body = _write_temp_file(lambda output: write_excel_streaming(frames, output), '.xlsx')
+    else:
+        figures = pipeline.visualizer.create_monthly_performance_dashboard(parsed_data['monthly_data'])
+        if kind == 'figures':
+            import plotly.io as pio
+
+            body = ('{' + ','.join(
+                f"{json.dumps(name)}:{pio.to_json(figure, validate=False)}" for name, figure in figures.items()
+            ) + '}').encode('utf-8')
+        else:
+            prs = pipeline.generator.create_presentation(parsed_data, figures)
+            body = _write_temp_file(lambda output: pipeline.generator.write_presentation(prs, output), '.pptx')
+    timings['render'] = (time.perf_counter() - start) * 1000
+    return body, timings
+
+
+class LatencyMetrics:
+    """Latences et compteurs par route, sur une fenêtre glissante"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self.started_at = time.time()
+        self._latencies: Dict[str, deque] = {}
+        self._stages: Dict[str, deque] = {}
+        self._statuses: Dict[str, Dict[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, status: int, duration_ms: float, stages: Optional[Dict[str, float]] = None):
+        """Enregistre une requête terminée (ou refusée)"""
+        with self._lock:
+            counts = self._statuses.setdefault(route, {})
+            counts[status] = counts.get(status, 0) + 1
+            # Les refus (503) sont comptés sans fausser les latences de traitement
+            if status != 503:
+                self._latencies.setdefault(route, deque(maxlen=self.window)).append(duration_ms)
+            for stage, value in (stages or {}).items():
+                self._stages.setdefault(f"{route}.{stage}", deque(maxlen=self.window)).append(value)
+
+    @staticmethod
+    def _percentiles(values) -> Dict[str, float]:
+        ordered = sorted(values)
+        if not ordered:
+            return {}
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {
+            'count': len(ordered),
+            'p50_ms': round(pick(0.50), 1),
+            'p95_ms': round(pick(0.95), 1),
+            'p99_ms': round(pick(0.99), 1),
+            'max_ms': round(ordered[-1], 1),
+        }
+
+    def snapshot(self) -> Dict:
+        """État des métriques (sérialisable en JSON)"""
+        with self._lock:
+            return {
+                'uptime_s': round(time.time() - self.started_at, 1),
+                'routes': {
+                    route: {
+                        'statuses': {str(status): n for status, n in sorted(counts.items())},
+                        'latency': self._percentiles(self._latencies.get(route, ())),
+                    }
+                    for route, counts in self._statuses.items()
+                },
+                'stages': {stage: self._percentiles(values) for stage, values in self._stages.items()},
+            }
+
+
+class ReportService:
+    """Pool de workers chauds et contrôle de charge de l'API"""
+
+    def __init__(self, max_workers: int = 2, queue_size: int = 8, parser_options: Optional[Dict] = None):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.parser_options = parser_options or {}
+        self.metrics = LatencyMetrics()
+        # Requêtes en cours d'exécution ou en attente d'un worker
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+        self._in_flight = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._start_pool()
+
+    def _start_pool(self):
+        """Démarre le pool et attend que chaque worker ait chargé le pipeline"""
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker, initargs=(self.parser_options,)
+        )
+        for future in [self._executor.submit(_warm_up) for _ in range(self.max_workers)]:
+            future.result()
+
+    def try_acquire(self) -> bool:
+        """Réserve une place dans la file ; False si elle est pleine"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def render(self, kind: str, data: bytes) -> Tuple[Union[bytes, str], Dict[str, float]]:
+        """Exécute un rendu sur le pool (place réservée au préalable par try_acquire)
+
+        Retourne le corps de la réponse, ou le chemin du fichier temporaire
+        qui le contient (à supprimer par l'appelant).
+        """
+        executor = self._executor
+        try:
+            return executor.submit(_render_in_worker, kind, data).result()
+        except BrokenProcessPool:
+            # Worker tué (mémoire...) : le pool est recréé pour les requêtes suivantes
+            with self._lock:
+                if self._executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._start_pool()
+            raise
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'queue_size': self.queue_size,
+                'in_flight': self._in_flight,
+                'rejected': self._rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Routes de l'API (une requête par thread, le travail étant délégué au pool)"""
+
+    service: ReportService = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        route = self.path.split('?', 1)[0].strip('/')
+        if route == 'metrics':
+            self._send_json(200, {**self.service.metrics.snapshot(), **self.service.status()})
+        elif route == 'health':
+            self._send_json(200, {'status': 'ok', **self.service.status()})
+        else:
+            self._send_json(404, {'error': f"Route inconnue: /{route}"})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        route = self.path.split('?', 1)[0].strip('/')
+        status, stages = self._handle_render(route)
+        self.service.metrics.record(route if route in RENDER_ROUTES else 'unknown', status,
+                                    (time.perf_counter() - start) * 1000, stages)
+
+    def _handle_render(self, route: str) -> Tuple[int, Optional[Dict[str, float]]]:
+        """Traite une requête de rendu et retourne son statut HTTP et ses durées par étape"""
+        if route not in RENDER_ROUTES:
+            self._discard_body()
+            return self._send_json(404, {'error': f"Route inconnue: /{route}"}), None
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            return self._send_json(400, {'error': "Corps vide : envoyer le PDF brut"}), None
+        if length > MAX_PDF_SIZE:
+            self.close_connection = True
+            return self._send_json(413, {'error': f"PDF trop volumineux (max {MAX_PDF_SIZE} octets)"}), None
+
+        # Contrôle de charge avant la lecture du corps : un refus ne coûte pas le transfert
+        if not self.service.try_acquire():
+            self.close_connection = True
+            return self._send_json(503, {'error': "File pleine, réessayer plus tard"},
+                                   headers={'Retry-After': str(RETRY_AFTER)}), None
+        try:
+            data = self.rfile.read(length)
+            body, stages = self.service.render(route, data)
+        except ReportRejected as e:
+            return self._send_json(422, {'error': str(e)}), None
+        except Exception as e:
+            return self._send_json(500, {'error': str(e)}), None
+        finally:
+            self.service.release()
+
+        content_type, extension = RENDER_ROUTES[route]
+        headers = {
+            'Content-Disposition': f'attachment; filename="rapport{extension}"',
+            'Server-Timing': ', '.join(f"{name};dur={value:.1f}" for name, value in stages.items()),
+        }
+        if isinstance(body, str):
+            self._send_file(200, body, content_type, headers)
+        else:
+            self._send(200, body, content_type, headers)
+        return 200, stages
+
+    def _discard_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if 0 < length <= MAX_PDF_SIZE:
+            self.rfile.read(length)
+        elif length:
+            self.close_connection = True
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None) -> int:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send(status, body, 'application/json', headers)
+        return status
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, status: int, path: str, content_type: str, headers: Optional[Dict] = None):
+        """Envoie un fichier temporaire par blocs, puis le supprime"""
+        try:
+            with open(path, 'rb') as f:
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                shutil.copyfileobj(f, self.wfile, RESPONSE_CHUNK_SIZE)
+        finally:
+            os.remove(path)
+
+    def log_message(self, format, *args):
+        # Une ligne par requête, sans le détail de BaseHTTPRequestHandler
+        print(f"{self.address_string()} {format % args}", flush=True)
+
+
+def create_server(host: str = '127.0.0.1', port: int = 8502, service: Optional[ReportService] = None,
+                  **service_options) -> ThreadingHTTPServer:
+    """Crée le serveur HTTP (le pool de workers est démarré et chaud au retour)"""
+    handler = type('Handler', (ReportRequestHandler,), {'service': service or ReportService(**service_options)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    """Sert l'API HTTP de génération de rapports"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--host', default='127.0.0.1', help="Adresse d'écoute")
+    parser.add_argument('--port', type=int, default=8502, help="Port d'écoute")
+    parser.add_argument('--workers', type=int, default=2, help="Nombre de processus de rendu")
+    parser.add_argument('--queue-size', type=int, default=8,
+                        help="Requêtes en attente au-delà des workers avant refus (503)")
+    parser.add_argument('--memory-limit', type=float, help="Plafond mémoire du parsing en Mo")
+    parser.add_argument('--page-timeout', type=float, help="Budget de temps par page en secondes")
+    parser.add_argument('--layout-cache', help="Fichier des gabarits de mise en page")
+    args = parser.parse_args()
+
+    server = create_server(
+        args.host, args.port, max_workers=args.workers, queue_size=args.queue_size,
+        parser_options={'memory_limit_mb': args.memory_limit, 'page_timeout': args.page_timeout,
+                        'layout_cache_path': args.layout_cache},
+    )
+    print(f"🚀 API disponible sur http://{args.host}:{args.port} ({args.workers} workers)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
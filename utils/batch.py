@@ -0,0 +1,171 @@
+import hashlib
+import json
+from concurrent.futures import Executor, as_completed
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Colonnes extraites sous forme de texte et converties en nombres après parsing
+NUMERIC_COLUMNS = ('appels_traites', 'appels_presentes', 'duree_moyenne_conv_s', 'nb_agents_max')
+
+# Ordre chronologique des mois pour les agrégats multi-sites
+MONTH_ORDER = ['Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin', 'Juillet',
+               'Août', 'Septembre', 'Octobre', 'Novembre', 'Décembre']
+
+# Parser du processus worker, créé au premier rapport puis réutilisé
+_WORKER_PARSER = None
+
+
+def coerce_numeric_columns(parsed_data: Dict) -> Dict:
+    """Convertit en nombres les colonnes numériques extraites des tableaux (en place)"""
+    for key in ('monthly_data', 'agents_data'):
+        df = parsed_data.get(key)
+        if df is None:
+            continue
+        for column in NUMERIC_COLUMNS:
+            if column in df:
+                df[column] = pd.to_numeric(df[column], errors='coerce')
+    return parsed_data
+
+
+def parsed_data_hash(parsed_data: Dict) -> str:
+    """Empreinte des données extraites d'un rapport (tables et KPI)
+
+    Deux exports d'un même rapport dont seuls les octets du PDF diffèrent
+    (date de génération, polices...) ont la même empreinte.
+    """
+    digest = hashlib.sha256()
+    for key in ('monthly_data', 'agents_data'):
+        df = parsed_data.get(key)
+        if df is None:
+            continue
+        digest.update(key.encode())
+        digest.update(json.dumps([str(column) for column in df.columns]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(json.dumps(parsed_data.get('kpi_data', {}), sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _parse_in_worker(data, parser_options: Dict) -> Dict:
+    """Parse un rapport (chemin ou contenu) dans un processus du pool
+
+    Le parser est réutilisé d'un rapport à l'autre. Un chemin évite de
+    transmettre le contenu du PDF au worker.
+    """
+    global _WORKER_PARSER
+    from .ingestion import PDFSource
+    from .pdf_parser import TelephoneReportParser
+
+    if _WORKER_PARSER is None:
+        _WORKER_PARSER = TelephoneReportParser(**parser_options)
+
+    with PDFSource.open(data) as source:
+        parsed_data = _WORKER_PARSER.parse_pdf(source)
+    if parsed_data.get('parsing_success'):
+        coerce_numeric_columns(parsed_data)
+    return parsed_data
+
+
+def parse_reports_concurrently(executor: Executor, reports: Dict[str, Union[bytes, str]],
+                               parser_options: Optional[Dict] = None) -> Iterator[Tuple[str, Dict]]:
+    """Parse plusieurs rapports sur un pool et les restitue au fil de leur achèvement
+
+    ``reports`` associe un nom de site au contenu de son PDF (ou à son chemin). ``executor`` est
+    de préférence un ``ProcessPoolExecutor`` : le parsing est dominé par du
+    code Python et ne profite pas des threads. Un rapport en échec est
+    restitué avec ``parsing_success=False``, sans interrompre les autres.
+    """
+    futures = {
+        executor.submit(_parse_in_worker, data, parser_options or {}): site
+        for site, data in reports.items()
+    }
+    for future in as_completed(futures):
+        site = futures[future]
+        try:
+            yield site, future.result()
+        except Exception as e:
+            # Worker interrompu (mémoire...) : le site est signalé en échec
+            yield site, {'parsing_success': False, 'error': str(e)}
+
+
+def _stack(reports: Dict[str, Dict], key: str) -> pd.DataFrame:
+    """Concatène une table de tous les rapports, avec une colonne ``site``"""
+    frames = [
+        parsed_data[key].assign(site=site)
+        for site, parsed_data in reports.items()
+        if key in parsed_data and not parsed_data[key].empty
+    ]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def _seconds(values) -> pd.Series:
+    """Durées moyennes du cube arrondies en secondes entières (Int32)"""
+    return pd.Series(values, dtype='float64').round().astype('Int32')
+
+
+def consolidate_reports(reports: Dict[str, Dict]) -> Dict[str, pd.DataFrame]:
+    """Agrège les rapports de plusieurs sites
+
+    Les totaux sont lus sur le cube d'agrégats des rapports (``RollupCube``),
+    comme les KPIs d'un rapport unique : un mois hors calendrier ou une table
+    sans colonne ``mois`` forme sa propre ligne au lieu d'être écarté.
+
+    Retourne :
+
+    - ``monthly_data`` : volumes par mois, tous sites confondus, au schéma
+      d'un rapport unique (réutilisable par les graphiques et les exports),
+      la durée de conversation (secondes) étant pondérée par les appels traités
+    - ``monthly_by_site`` : données mensuelles de chaque site (colonne ``site``)
+    - ``sites`` : totaux, taux de résolution et nombre d'agents par site
+    - ``agents_data`` : agents de tous les sites, classés par appels traités
+    """
+    from .rollup import RollupCube
+
+    monthly = _stack(reports, 'monthly_data')
+    agents = _stack(reports, 'agents_data')
+
+    consolidated = {
+        'monthly_data': pd.DataFrame(),
+        'monthly_by_site': monthly,
+        'sites': pd.DataFrame({'site': list(reports)}),
+        'agents_data': agents,
+    }
+
+    if not monthly.empty and {'appels_presentes', 'appels_traites'} <= set(monthly.columns):
+        cube = RollupCube.from_reports(reports)
+
+        by_month = pd.DataFrame([cube.month(month) for month in cube.months])
+        consolidated['monthly_data'] = pd.DataFrame({
+            'mois': cube.months,
+            'appels_traites': by_month['appels_traites'],
+            'appels_presentes': by_month['appels_presentes'],
+            'duree_moyenne_conv_s': _seconds(by_month['duree_ponderee_s']),
+            'nb_agents_max': by_month['nb_agents_max'],
+            'nb_sites': by_month['nb_sites'],
+        })
+
+        # Sites sans données mensuelles : absents du tableau comparatif
+        site_names = [site for i, site in enumerate(cube.sites) if cube.by_site[i].any()]
+        by_site = pd.DataFrame([cube.site(site) for site in site_names])
+        sites = pd.DataFrame({
+            'site': site_names,
+            'appels_presentes': by_site['appels_presentes'],
+            'appels_traites': by_site['appels_traites'],
+            'nb_mois': by_site['nb_mois'],
+            'taux_resolution': by_site['taux_resolution'].round(1),
+            'duree_moyenne_conv_s': _seconds(by_site['duree_ponderee_s']),
+        })
+        if not agents.empty:
+            sites['nb_agents'] = by_site['nb_agents']
+        consolidated['sites'] = sites
+
+    if not agents.empty and {'appels_presentes', 'appels_traites'} <= set(agents.columns):
+        agents = agents.assign(
+            performance=(agents['appels_traites'] / agents['appels_presentes'].replace(0, np.nan) * 100).round(1)
+        )
+        consolidated['agents_data'] = agents.sort_values('appels_traites', ascending=False, ignore_index=True)
+
+    return consolidated
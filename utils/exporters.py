@@ -0,0 +1,292 @@
+import os
+import tempfile
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+# Nombre de lignes converties à la fois lors de l'écriture en streaming
+EXPORT_CHUNK_SIZE = 10000
+
+
+def write_excel_streaming(frames: Dict[str, pd.DataFrame], target,
+                          chunk_size: int = EXPORT_CHUNK_SIZE,
+                          progress: Optional[Callable] = None):
+    """Écrit les DataFrames dans un classeur XLSX ligne par ligne
+
+    Le classeur est ouvert en mode ``write_only`` d'openpyxl : les lignes sont
+    sérialisées au fil de l'eau dans des fichiers temporaires au lieu d'être
+    conservées sous forme d'objets cellule. Seul un bloc de ``chunk_size``
+    lignes est converti en mémoire à la fois, si bien que la consommation
+    mémoire reste constante quel que soit le nombre de lignes exportées.
+
+    ``target`` est un chemin ou un objet fichier ouvert en écriture binaire.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    total_rows = sum(len(df) for df in frames.values()) or 1
+    written_rows = 0
+
+    for sheet_name, df in frames.items():
+        # Excel limite les noms de feuille à 31 caractères
+        worksheet = workbook.create_sheet(title=sheet_name[:31])
+        worksheet.append([str(column) for column in df.columns])
+
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            # Les valeurs manquantes (NaN, NaT, NA) deviennent des cellules vides
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                worksheet.append(row)
+
+            written_rows += len(chunk)
+            if progress:
+                progress(0.9 * written_rows / total_rows, f"Feuille {sheet_name}")
+
+    if progress:
+        progress(0.95, "Compression du classeur")
+    workbook.save(target)
+
+
+def export_excel_to_tempfile(frames: Dict[str, pd.DataFrame],
+                             progress: Optional[Callable] = None) -> str:
+    """Écrit le classeur dans un fichier temporaire et retourne son chemin
+
+    Le fichier peut ensuite être servi directement depuis le disque ; il
+    appartient à l'appelant de le supprimer une fois téléchargé.
+    """
+    fd, path = tempfile.mkstemp(prefix='rapport_telephonie_', suffix='.xlsx')
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            write_excel_streaming(frames, output, progress=progress)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+# Schéma stable des tables exportées : colonne -> type pandas nullable.
+# Les colonnes absentes sont exportées vides et les colonnes inconnues
+# ignorées, afin que les traitements en aval puissent charger des mois de
+# rapports avec le même schéma.
+EXPORT_SCHEMAS = {
+    'monthly_data': {
+        'mois': 'string',
+        'appels_traites': 'Int32',
+        'appels_presentes': 'Int32',
+        'duree_moyenne_conv': 'Float64',
+        'nb_agents_max': 'Int32',
+        'duree_moyenne_conv_s': 'Int32',
+    },
+    'agents_data': {
+        'agent': 'string',
+        'appels_presentes': 'Int32',
+        'appels_traites': 'Int32',
+        'performance': 'Float64',
+    },
+    'resolution_data': {
+        'mois': 'Int32',
+        'n2': 'Int32',
+        'appels': 'Int32',
+        'resolus_n1': 'Int32',
+        'pourcentage': 'Float64',
+    },
+    'tickets_data': {
+        'jour': 'Int32',
+        **{f'mois_{month}': 'Int32' for month in range(1, 13)},
+    },
+}
+
+# Colonnes du schéma calculées à l'export : colonne -> (colonne source, facteur).
+# Les durées sont stockées en secondes ; les minutes restent exportées pour
+# les traitements en aval.
+DERIVED_COLUMNS = {
+    'duree_moyenne_conv': ('duree_moyenne_conv_s', 1 / 60),
+}
+
+# Correspondance type pandas -> type Arrow
+_ARROW_TYPES = {
+    'string': 'string',
+    'Int32': 'int32',
+    'Float64': 'float64',
+}
+
+# Formats d'export : nom -> (extension, type MIME)
+EXPORT_FORMATS = {
+    'xlsx': ('.xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'parquet': ('.parquet', "application/vnd.apache.parquet"),
+    'arrow': ('.arrow', "application/vnd.apache.arrow.file"),
+    'csv': ('.csv', "text/csv"),
+}
+
+
+def conform_to_schema(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """Aligne un DataFrame extrait sur le schéma d'export de la table"""
+    schema = EXPORT_SCHEMAS[table]
+    # Les en-têtes issus des tableaux PDF varient en casse ("Agent", "agent")
+    columns = {str(column).strip().lower(): column for column in df.columns}
+
+    conformed = {}
+    for column, dtype in schema.items():
+        if column in columns:
+            values = df[columns[column]]
+            if dtype != 'string':
+                values = pd.to_numeric(values, errors='coerce')
+                if dtype == 'Int32':
+                    values = values.round()
+            conformed[column] = values.astype(dtype)
+        elif column in DERIVED_COLUMNS and DERIVED_COLUMNS[column][0] in columns:
+            source, factor = DERIVED_COLUMNS[column]
+            values = pd.to_numeric(df[columns[source]], errors='coerce').astype('float64') * factor
+            conformed[column] = values.astype(dtype)
+        else:
+            conformed[column] = pd.Series(pd.NA, index=df.index, dtype=dtype)
+
+    return pd.DataFrame(conformed, index=df.index).reset_index(drop=True)
+
+
+def arrow_schema(table: str):
+    """Schéma Arrow correspondant à la table exportée"""
+    import pyarrow as pa
+
+    return pa.schema([
+        (column, getattr(pa, _ARROW_TYPES[dtype])())
+        for column, dtype in EXPORT_SCHEMAS[table].items()
+    ])
+
+
+def to_arrow_table(df: pd.DataFrame, table: str):
+    """Convertit un DataFrame en table Arrow au schéma stable"""
+    import pyarrow as pa
+
+    arrow_table = pa.Table.from_pandas(conform_to_schema(df, table), schema=arrow_schema(table),
+                                       preserve_index=False)
+    # Les métadonnées pandas dépendent de la version installée : on les retire
+    return arrow_table.replace_schema_metadata(None)
+
+
+def write_table(df: pd.DataFrame, table: str, fmt: str, target):
+    """Écrit une table dans le format demandé (parquet, arrow ou csv)
+
+    ``target`` est un chemin ou un objet fichier ouvert en écriture binaire.
+    """
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(to_arrow_table(df, table), target, compression='zstd')
+    elif fmt == 'arrow':
+        import pyarrow as pa
+        arrow_table = to_arrow_table(df, table)
+        with pa.OSFile(target, 'wb') if isinstance(target, str) else pa.PythonFile(target, mode='w') as sink:
+            with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
+    elif fmt == 'csv':
+        _write_csv(df, table, target)
+    else:
+        raise ValueError(f"Format d'export inconnu: {fmt}")
+
+
+def _write_csv(df: pd.DataFrame, table: str, target):
+    """Écrit une table en CSV, via le writer natif Arrow lorsqu'il est disponible"""
+    try:
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        # Sans pyarrow, repli sur le writer pandas
+        conform_to_schema(df, table).to_csv(target, index=False)
+        return
+
+    pa_csv.write_csv(to_arrow_table(df, table), target)
+
+
+def export_tables(parsed_data: Dict, fmt: str, target,
+                  progress: Optional[Callable] = None):
+    """Exporte les quatre tables du rapport dans une archive ZIP
+
+    Chaque table (``monthly_data``, ``agents_data``, ``resolution_data``,
+    ``tickets_data``) devient un fichier de l'archive, au schéma défini par
+    ``EXPORT_SCHEMAS``, y compris lorsqu'elle est vide.
+    """
+    import zipfile
+
+    extension = EXPORT_FORMATS[fmt][0]
+    # Parquet et Arrow sont déjà compressés : inutile de les recompresser
+    compression = zipfile.ZIP_DEFLATED if fmt == 'csv' else zipfile.ZIP_STORED
+
+    with zipfile.ZipFile(target, 'w', compression=compression) as archive:
+        for i, table in enumerate(EXPORT_SCHEMAS):
+            if progress:
+                progress(i / len(EXPORT_SCHEMAS), f"Table {table}")
+            df = parsed_data.get(table)
+            if df is None:
+                df = pd.DataFrame()
+            with archive.open(f"{table}{extension}", 'w', force_zip64=True) as member:
+                write_table(df, table, fmt, member)
+
+
+def export_all(parsed_data: Dict, output_dir: str, base_name: str,
+               formats=('xlsx', 'parquet', 'arrow', 'csv')) -> Dict[str, str]:
+    """Exporte un rapport parsé dans plusieurs formats (traitement par lots)
+
+    Retourne le chemin du fichier écrit pour chaque format : un classeur pour
+    ``xlsx``, une archive ZIP contenant une table par fichier pour les autres.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+
+    for fmt in formats:
+        if fmt == 'xlsx':
+            path = os.path.join(output_dir, f"{base_name}.xlsx")
+            frames = {table: parsed_data[table] for table in EXPORT_SCHEMAS
+                      if table in parsed_data and not parsed_data[table].empty}
+            write_excel_streaming(frames, path)
+        else:
+            path = os.path.join(output_dir, f"{base_name}_{fmt}.zip")
+            export_tables(parsed_data, fmt, path)
+        paths[fmt] = path
+
+    return paths
+
+
+def main():
+    """Exporte en lot des rapports PDF dans les formats demandés"""
+    import argparse
+
+    from utils import load_pipeline
+    from utils.ingestion import PDFSource
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('pdf_files', nargs='+', help="Rapports PDF à exporter")
+    parser.add_argument('--output', default='exports', help="Répertoire de sortie")
+    parser.add_argument('--format', dest='formats', action='append', choices=list(EXPORT_FORMATS),
+                        help="Format d'export (répétable, tous par défaut)")
+    parser.add_argument('--memory-limit', type=float,
+                        help="Plafond mémoire du parsing en Mo (libère les caches page par page)")
+    parser.add_argument('--page-timeout', type=float,
+                        help="Budget de temps par page en secondes (pages en dépassement ignorées)")
+    parser.add_argument('--layout-cache',
+                        help="Fichier des gabarits de mise en page (zones des tables apprises)")
+    args = parser.parse_args()
+
+    pipeline = load_pipeline(components=['parser'], strict=True, parser_options={
+        'memory_limit_mb': args.memory_limit,
+        'page_timeout': args.page_timeout,
+        'layout_cache_path': args.layout_cache,
+    })
+    for pdf_file in args.pdf_files:
+        # Le PDF est projeté en mémoire plutôt que relu par blocs
+        with PDFSource.from_path(pdf_file) as source:
+            parsed_data = pipeline.parser.parse_pdf(source)
+        if not parsed_data.get('parsing_success'):
+            print(f"❌ {pdf_file}: {parsed_data.get('error')}")
+            continue
+        for skipped in parsed_data.get('skipped_pages', []):
+            print(f"⚠️ {pdf_file}: page {skipped['page']} ignorée ({skipped['reason']})")
+
+        base_name = os.path.splitext(os.path.basename(pdf_file))[0]
+        paths = export_all(parsed_data, args.output, base_name,
+                           formats=args.formats or list(EXPORT_FORMATS))
+        for fmt, path in paths.items():
+            print(f"✅ {pdf_file} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import hashlib
+import io
+import mmap
+import os
+from typing import Optional
+
+
+class MemoryViewReader(io.RawIOBase):
+    """Flux binaire en lecture seule sur un ``memoryview``, sans copie du contenu
+
+    Seuls les blocs demandés par le lecteur (pdfminer lit par blocs de
+    quelques Ko) sont copiés, comme pour la lecture d'un fichier.
+    """
+
+    def __init__(self, view: memoryview):
+        super().__init__()
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Position négative: {offset}")
+        self._position = offset
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._position + size, len(self._view))
+        data = self._view[self._position:end].tobytes() if end > self._position else b''
+        self._position = max(self._position, end)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def close(self):
+        # Le memoryview appartient à la PDFSource : il n'est pas libéré ici
+        self._view = memoryview(b'')
+        super().close()
+
+
+class PDFSource:
+    """PDF chargé une seule fois en mémoire, partagé par le hachage, le cache et le parsing
+
+    Le contenu est exposé sous forme de ``memoryview`` : tampon de l'upload
+    Streamlit (``UploadedFile.getbuffer()``), octets fournis par l'appelant ou
+    fichier projeté en mémoire (``mmap``) lorsqu'il vient du disque. Chaque
+    consommateur lit ce même tampon, sans copie intermédiaire.
+
+    À utiliser comme gestionnaire de contexte : le tampon d'un upload ne peut
+    être modifié tant que la vue existe, et le mmap doit être fermé.
+    """
+
+    def __init__(self, view: memoryview, name: str = '', path: Optional[str] = None,
+                 mapping: Optional[mmap.mmap] = None):
+        self.view = view
+        self.name = name
+        self.path = path
+        self._mapping = mapping
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def from_upload(cls, uploaded_file) -> 'PDFSource':
+        """Source partageant le tampon d'un fichier uploadé (``UploadedFile``, ``BytesIO``)"""
+        return cls(uploaded_file.getbuffer(), name=getattr(uploaded_file, 'name', ''))
+
+    @classmethod
+    def from_path(cls, path: str) -> 'PDFSource':
+        """Source projetant un fichier du disque en mémoire"""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap refuse les fichiers vides
+                return cls(memoryview(b''), name=os.path.basename(path), path=path)
+            # Le mmap reste valide après la fermeture du descripteur
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapping), name=os.path.basename(path), path=path, mapping=mapping)
+
+    @classmethod
+    def open(cls, pdf_file) -> 'PDFSource':
+        """Source adaptée au type d'entrée : chemin, octets ou objet fichier"""
+        if isinstance(pdf_file, PDFSource):
+            return pdf_file
+        if isinstance(pdf_file, (str, os.PathLike)):
+            return cls.from_path(os.fspath(pdf_file))
+        if isinstance(pdf_file, (bytes, bytearray, memoryview)):
+            return cls(memoryview(pdf_file))
+        if hasattr(pdf_file, 'getbuffer'):
+            return cls.from_upload(pdf_file)
+        # Autre objet fichier : lecture unique de son contenu
+        return cls(memoryview(pdf_file.read()), name=getattr(pdf_file, 'name', ''))
+
+    @property
+    def size(self) -> int:
+        """Taille du PDF en octets"""
+        return self.view.nbytes
+
+    @property
+    def digest(self) -> str:
+        """Empreinte SHA-256 du contenu, calculée une fois directement sur le tampon"""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.view).hexdigest()
+        return self._digest
+
+    def stream(self) -> MemoryViewReader:
+        """Nouveau flux de lecture positionné au début du PDF"""
+        return MemoryViewReader(self.view)
+
+    def close(self):
+        """Libère la vue (et le tampon de l'upload) puis ferme le mmap éventuel"""
+        self.view.release()
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self) -> 'PDFSource':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
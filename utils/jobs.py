@@ -0,0 +1,158 @@
+import contextvars
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# États possibles d'un job d'export
+JOB_PENDING = 'en_attente'
+JOB_RUNNING = 'en_cours'
+JOB_DONE = 'terminé'
+JOB_FAILED = 'échec'
+
+
+class ExportJob:
+    """Job d'export exécuté en arrière-plan"""
+
+    def __init__(self, kind: str, file_name: str, mime: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.file_name = file_name
+        self.mime = mime
+        self.status = JOB_PENDING
+        self.progress = 0.0
+        self.message = "En attente d'un worker"
+        self.result = None
+        self.result_path: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """Indique si le job est terminé (succès ou échec)"""
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    def read_result(self) -> bytes:
+        """Retourne le contenu du résultat, lu depuis le disque s'il y a été écrit"""
+        if self.result_path is not None:
+            with open(self.result_path, 'rb') as f:
+                return f.read()
+        return self.result
+
+    def discard_result(self):
+        """Libère le résultat et supprime le fichier temporaire éventuel"""
+        if self.result_path is not None and os.path.exists(self.result_path):
+            os.remove(self.result_path)
+        self.result = None
+        self.result_path = None
+
+
+class ExportJobQueue:
+    """File de jobs d'export partagée par toutes les sessions
+
+    Les exports (PowerPoint, Excel...) sont exécutés sur un pool de threads
+    borné : le script Streamlit ne fait que soumettre un job et interroger son
+    état, sans bloquer l'interface. Les résultats sont conservés en mémoire
+    pour le téléchargement, dans la limite de ``max_results`` jobs et de
+    ``result_ttl`` secondes.
+    """
+
+    def __init__(self, max_workers: int = 4, max_results: int = 100, result_ttl: float = 3600):
+        self.max_results = max_results
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='export')
+        self._jobs: 'OrderedDict[str, ExportJob]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable, *args, file_name: str, mime: str, **kwargs) -> str:
+        """Soumet un export et retourne l'identifiant du job
+
+        ``func`` reçoit un argument ``progress(fraction, message)`` pour publier
+        son avancement et doit retourner le contenu du fichier à télécharger,
+        ou le chemin d'un fichier temporaire à servir depuis le disque (supprimé
+        à l'expiration du job).
+        """
+        job = ExportJob(kind, file_name, mime)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_expired()
+
+        # Le job hérite du contexte de l'appelant (traceur de la session notamment)
+        context = contextvars.copy_context()
+        self._executor.submit(context.run, self._run, job, func, args, kwargs)
+        return job.id
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """Retourne le job correspondant à l'identifiant (None si expiré)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def poll(self, job_ids: List[str]) -> List[ExportJob]:
+        """Retourne les jobs encore connus parmi les identifiants donnés"""
+        with self._lock:
+            return [self._jobs[job_id] for job_id in job_ids if job_id in self._jobs]
+
+    def stats(self) -> Dict[str, int]:
+        """Nombre de jobs par état"""
+        with self._lock:
+            counts = {JOB_PENDING: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self, wait: bool = True):
+        """Arrête le pool de workers et supprime les fichiers de résultat"""
+        self._executor.shutdown(wait=wait)
+        with self._lock:
+            for job in self._jobs.values():
+                job.discard_result()
+
+    def _run(self, job: ExportJob, func: Callable, args: tuple, kwargs: dict):
+        """Exécute un job dans un worker et enregistre son résultat"""
+        def progress(fraction: float, message: str = ''):
+            job.progress = max(0.0, min(1.0, fraction))
+            if message:
+                job.message = message
+
+        job.status = JOB_RUNNING
+        job.message = "Génération en cours"
+        try:
+            result = func(*args, progress=progress, **kwargs)
+        except Exception as e:
+            self._finish(job, JOB_FAILED, f"Erreur: {e}", error=str(e))
+        else:
+            self._finish(job, JOB_DONE, "Prêt au téléchargement", result=result)
+
+    def _finish(self, job: ExportJob, status: str, message: str, result=None, error: Optional[str] = None):
+        """Publie l'issue d'un job
+
+        ``finished_at`` est renseigné avant l'état final, sous le verrou :
+        ``_evict_expired`` ne voit jamais un job terminé sans date de fin.
+        """
+        with self._lock:
+            if isinstance(result, str):
+                job.result_path = result
+            else:
+                job.result = result
+            job.error = error
+            if status == JOB_DONE:
+                job.progress = 1.0
+            job.message = message
+            job.finished_at = time.time()
+            job.status = status
+
+    def _evict_expired(self):
+        """Supprime les jobs terminés expirés puis les plus anciens au-delà de la limite"""
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.is_finished and now - job.finished_at > self.result_ttl:
+                self._jobs.pop(job_id).discard_result()
+
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        while len(self._jobs) > self.max_results and finished:
+            self._jobs.pop(finished.pop(0)).discard_result()
@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+from typing import Optional, Tuple
+
+from .ingestion import MemoryViewReader, PDFSource
+from .tracing import process_rss
+
+# Extracteurs exécutés sur chaque page, dans l'ordre
+PAGE_EXTRACTORS = ('text', 'tables')
+
+# Délai maximal d'ouverture du PDF par un worker (secondes)
+WORKER_STARTUP_TIMEOUT = 60
+
+# Statuts renvoyés par PageWorker.run
+PAGE_OK = 'ok'
+PAGE_TIMEOUT = 'timeout'
+PAGE_ERROR = 'error'
+
+
+def _page_worker(source, conn):
+    """Processus d'extraction : ouvre le PDF puis traite les pages demandées par le parent"""
+    import pdfplumber
+
+    if isinstance(source, (bytes, memoryview)):
+        source = MemoryViewReader(memoryview(source))
+
+    with pdfplumber.open(source) as pdf:
+        conn.send((len(pdf.pages), process_rss()))
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+
+            page_index, extractor = request
+            page = pdf.pages[page_index]
+            try:
+                if extractor == 'text':
+                    value = page.extract_text() or ""
+                else:
+                    value = page.extract_tables()
+                conn.send((PAGE_OK, value, process_rss()))
+            except Exception as e:
+                conn.send((PAGE_ERROR, str(e), process_rss()))
+
+            # Dernier extracteur de la page : ses caches de mise en page sont libérés
+            if extractor == PAGE_EXTRACTORS[-1]:
+                page.close()
+
+
+def read_source(pdf_file):
+    """Source transmissible à un worker : chemin du fichier ou contenu en mémoire"""
+    if isinstance(pdf_file, PDFSource):
+        if pdf_file.path is not None:
+            return pdf_file.path
+        # Un worker créé par fork hérite du tampon : seul spawn impose une copie
+        if multiprocessing.get_start_method() == 'fork':
+            return pdf_file.view
+        return pdf_file.view.tobytes()
+    if isinstance(pdf_file, (str, os.PathLike)):
+        return os.fspath(pdf_file)
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+
+    # Objet fichier (dont UploadedFile de Streamlit) : lu sans déplacer la position
+    position = pdf_file.tell()
+    pdf_file.seek(0)
+    data = pdf_file.read()
+    pdf_file.seek(position)
+    return data
+
+
+class PageWorker:
+    """Processus d'extraction des pages, interrompu et relancé en cas de dépassement de délai
+
+    Une seule page est traitée à la fois : une page pathologique (milliers
+    d'objets vectoriels) ne bloque que son worker, qui est tué à l'expiration
+    du délai puis relancé pour les pages suivantes.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.page_count = 0
+        self.start_rss = 0
+        self._context = multiprocessing.get_context()
+        self._process = None
+        self._conn = None
+
+    def start(self):
+        """Démarre le worker et attend l'ouverture du PDF"""
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(target=_page_worker, args=(self.source, child_conn), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+        if not self._conn.poll(WORKER_STARTUP_TIMEOUT):
+            self.kill()
+            raise TimeoutError(f"Ouverture du PDF: délai de {WORKER_STARTUP_TIMEOUT}s dépassé")
+        try:
+            self.page_count, self.start_rss = self._conn.recv()
+        except EOFError:
+            self.kill()
+            raise RuntimeError("Le worker d'extraction s'est arrêté à l'ouverture du PDF")
+
+    def run(self, page_index: int, extractor: str, timeout: Optional[float]) -> Tuple[str, object, int]:
+        """Exécute un extracteur sur une page
+
+        Retourne ``(statut, valeur, RSS du worker)``. En cas de dépassement du
+        délai ou d'arrêt brutal, le worker est relancé et la valeur est None.
+        """
+        self._conn.send((page_index, extractor))
+        if timeout is not None and not self._conn.poll(max(timeout, 0)):
+            self.restart()
+            return PAGE_TIMEOUT, None, 0
+
+        try:
+            return self._conn.recv()
+        except EOFError:
+            # Worker tué par le système (mémoire) ou arrêt brutal de pdfminer
+            self.restart()
+            return PAGE_ERROR, "arrêt inattendu du worker", 0
+
+    def restart(self):
+        """Tue le worker courant et en démarre un nouveau"""
+        self.kill()
+        self.start()
+
+    def kill(self):
+        """Arrête immédiatement le worker"""
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self):
+        """Arrête proprement le worker"""
+        if self._process is not None and self._process.is_alive():
+            try:
+                self._conn.send(None)
+                self._process.join(timeout=5)
+            except (BrokenPipeError, OSError):
+                pass
+        self.kill()
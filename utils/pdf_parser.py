@@ -1,47 +1,142 @@
+import gc
+import hashlib
+import json
+import os
 import PyPDF2
 import re
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
 import pandas as pd
 import pdfplumber
 from typing import Dict, List, Tuple, Optional
 import numpy as np
 from datetime import datetime
 
+from .ingestion import PDFSource
+from .tracing import process_rss, traced
+
+# Marge (points) autour des zones de table apprises
+LAYOUT_MARGIN = 10
+
+# Durée au format H:MM:SS (heures sur un à trois chiffres)
+DURATION_PATTERN = re.compile(r'(?<![\d:])(\d{1,3}):([0-5]\d):([0-5]\d)(?![\d:])')
+
+# Poids des composantes heures, minutes, secondes
+DURATION_WEIGHTS = np.array([3600, 60, 1], dtype=np.int32)
+
+# Libellé normalisé d'un champ de durée -> colonne en secondes. Les autres
+# champs deviennent des colonnes ``duree_<libellé>_s``.
+DURATION_FIELDS = {
+    'duree_moyenne_de_conversation': 'duree_moyenne_conv_s',
+}
+
+# Colonne des durées sans libellé
+UNLABELLED_DURATION = 'duree_s'
+
+
+class MemoryLimitExceeded(MemoryError):
+    """Levée lorsque le parsing dépasse le plafond mémoire du parser"""
+    
+    def __init__(self, message: str, memory: Dict):
+        super().__init__(message)
+        self.memory = memory
+
+
 class TelephoneReportParser:
-    """Parser spécialisé pour les rapports de téléphonie"""
+    """Parser spécialisé pour les rapports de téléphonie
     
-    def __init__(self):
+    En mode ``memory_bounded``, le texte et les tables de chaque page sont
+    extraits en une passe, puis les caches de mise en page de la page
+    (caractères, objets, carte de texte) sont libérés : la mémoire ne croît
+    plus avec le nombre de pages. ``memory_limit_mb`` fixe un plafond de RSS
+    vérifié après chaque page ; le pic mesuré est reporté sous ``memory``
+    dans le résultat.
+    
+    Avec ``page_timeout`` (secondes par page) ou ``extractor_timeouts``
+    (secondes par extracteur : ``{'text': 5, 'tables': 20}``), les pages sont
+    extraites dans un processus worker tué à l'expiration du budget. La page
+    en cause est ignorée par toutes les sections et listée sous
+    ``skipped_pages`` ; ce mode libère toujours les caches des pages traitées.
+    
+    Avec ``use_layout_templates`` (ou ``layout_cache_path`` pour conserver
+    l'apprentissage entre les exécutions), les zones des tables de chaque
+    gabarit de page sont apprises au premier parsing, sous une empreinte de
+    mise en page. Les parsings suivants ne détectent les tables que dans ces
+    zones, et plus du tout sur les pages du gabarit qui n'en contiennent pas.
+    """
+    
+    def __init__(self, memory_bounded: bool = False, memory_limit_mb: Optional[float] = None,
+                 page_timeout: Optional[float] = None,
+                 extractor_timeouts: Optional[Dict[str, float]] = None,
+                 use_layout_templates: bool = False, layout_cache_path: Optional[str] = None):
+        self.memory_bounded = memory_bounded or memory_limit_mb is not None
+        self.memory_limit_mb = memory_limit_mb
+        self.page_timeout = page_timeout
+        self.extractor_timeouts = extractor_timeouts or {}
+        self.use_layout_templates = use_layout_templates or layout_cache_path is not None
+        self.layout_cache_path = layout_cache_path
+        # Empreinte de page -> zones des tables [x0, top, x1, bottom]
+        self.layout_templates: Dict[str, List[List[float]]] = self._load_layout_templates()
+        self.layout_hits = 0
+        self.layout_misses = 0
+        self._layout_lock = threading.Lock()
         self.months_fr = {
             'Janvier': 1, 'Février': 2, 'Mars': 3, 'Avril': 4,
             'Mai': 5, 'Juin': 6, 'Juillet': 7, 'Août': 8,
             'Septembre': 9, 'Octobre': 10, 'Novembre': 11, 'Décembre': 12
         }
     
+    @traced('parser')
     def parse_pdf(self, pdf_file) -> Dict:
         """Parse le PDF et extrait toutes les données structurées"""
         try:
-            with pdfplumber.open(pdf_file) as pdf:
-                text_content = self._extract_all_text(pdf)
-                tables_data = self._extract_tables(pdf)
-                
-                # Extraction des différents types de données
-                monthly_data = self._extract_monthly_data(text_content, tables_data)
-                agents_data = self._extract_agents_data(text_content, tables_data)
-                kpi_data = self._extract_kpi_data(text_content)
-                resolution_data = self._extract_resolution_data(text_content, tables_data)
-                tickets_data = self._extract_tickets_data(tables_data)
-                
-                return {
-                    'monthly_data': monthly_data,
-                    'agents_data': agents_data,
-                    'kpi_data': kpi_data,
-                    'resolution_data': resolution_data,
-                    'tickets_data': tickets_data,
-                    'parsing_success': True
-                }
+            extras = {}
+            if self.isolate_pages:
+                text_content, tables_data, extras = self._extract_pages_isolated(pdf_file)
+            else:
+                with self._open_pdf(pdf_file) as pdf:
+                    if self.memory_bounded:
+                        text_content, tables_data, extras['memory'] = self._extract_pages_bounded(pdf)
+                    else:
+                        text_content = self._extract_all_text(pdf)
+                        tables_data = self._extract_tables(pdf)
+            
+            # Extraction des différents types de données
+            monthly_data = self._extract_monthly_data(text_content, tables_data)
+            agents_data = self._extract_agents_data(text_content, tables_data)
+            kpi_data = self._extract_kpi_data(text_content)
+            resolution_data = self._extract_resolution_data(text_content, tables_data)
+            tickets_data = self._extract_tickets_data(tables_data)
+            
+            return {
+                'monthly_data': monthly_data,
+                'agents_data': agents_data,
+                'kpi_data': kpi_data,
+                'resolution_data': resolution_data,
+                'tickets_data': tickets_data,
+                'parsing_success': True,
+                **extras
+            }
+        except MemoryLimitExceeded as e:
+            print(f"Erreur lors du parsing: {e}")
+            return {'parsing_success': False, 'error': str(e), 'memory': e.memory}
         except Exception as e:
             print(f"Erreur lors du parsing: {e}")
             return {'parsing_success': False, 'error': str(e)}
     
+    @contextmanager
+    def _open_pdf(self, pdf_file):
+        """Ouvre le PDF ; une PDFSource est lue directement dans son tampon partagé"""
+        if isinstance(pdf_file, PDFSource):
+            with pdf_file.stream() as stream, pdfplumber.open(stream) as pdf:
+                yield pdf
+        else:
+            with pdfplumber.open(pdf_file) as pdf:
+                yield pdf
+    
+    @traced('parser')
     def _extract_all_text(self, pdf) -> str:
         """Extrait tout le texte du PDF"""
         full_text = ""
@@ -49,26 +144,227 @@ class TelephoneReportParser:
             full_text += page.extract_text() or ""
         return full_text
     
+    @traced('parser')
     def _extract_tables(self, pdf) -> List[List[List]]:
         """Extrait toutes les tables du PDF"""
         all_tables = []
         for page in pdf.pages:
-            tables = page.extract_tables()
+            tables = self._extract_page_tables(page)
             if tables:
                 all_tables.extend(tables)
         return all_tables
     
+    def _extract_page_tables(self, page, text: Optional[str] = None) -> List[List[List]]:
+        """Extrait les tables d'une page, dans les zones du gabarit lorsqu'il est connu"""
+        if not self.use_layout_templates:
+            return page.extract_tables()
+        
+        fingerprint = self._page_fingerprint(page, text)
+        regions = self.layout_templates.get(fingerprint)
+        if regions is not None:
+            tables = self._extract_tables_in_regions(page, regions)
+            if tables is not None:
+                self.layout_hits += 1
+                return tables
+        
+        # Gabarit inconnu ou zones obsolètes : détection sur la page entière
+        self.layout_misses += 1
+        found = page.find_tables()
+        self._learn_layout(fingerprint, [[round(value, 1) for value in table.bbox] for table in found])
+        return [table.extract() for table in found]
+    
+    def _page_fingerprint(self, page, text: Optional[str] = None) -> str:
+        """Empreinte du gabarit d'une page : format, titre et structure des lignes de texte
+        
+        Le titre (première ligne) est retenu sans ses chiffres ni son mois ;
+        chaque ligne est réduite à sa forme (mots et nombres), si bien que les
+        pages mensuelles d'un rapport, ou de deux rapports successifs,
+        partagent la même empreinte. Le nombre d'objets vectoriels (traits,
+        rectangles, courbes) est retenu en ordre de grandeur : une page
+        enrichie d'un graphique change de gabarit.
+        """
+        if text is None:
+            # La carte de texte est en cache si le texte de la page a déjà été extrait
+            text = page.extract_text() or ""
+        lines = text.split('\n')
+        title = re.sub(r'\d+', '#', lines[0].strip())
+        title = re.sub('|'.join(self.months_fr), 'M', title)
+        shapes = sorted({re.sub(r'\d+', '#', re.sub(r'[^\W\d_]+', 'a', line)).strip() for line in lines})
+        vectors = len(page.lines) + len(page.rects) + len(page.curves)
+        layout = f"{round(page.width)}x{round(page.height)}|{vectors.bit_length()}|{title}|{'/'.join(shapes)}"
+        return hashlib.sha1(layout.encode('utf-8')).hexdigest()[:16]
+    
+    def _extract_tables_in_regions(self, page, regions: List[List[float]]) -> Optional[List[List[List]]]:
+        """Extrait les tables des zones apprises (None si une zone n'en contient plus)
+        
+        Le bas de chaque zone est étendu jusqu'à la zone suivante ou au bas de
+        la page : le nombre de lignes d'une table varie d'un rapport à l'autre.
+        """
+        tables = []
+        for x0, top, x1, bottom in regions:
+            below = [other[1] for other in regions if other[1] > bottom and other[0] < x1 and other[2] > x0]
+            crop_box = (
+                max(page.bbox[0], x0 - LAYOUT_MARGIN),
+                max(page.bbox[1], top - LAYOUT_MARGIN),
+                min(page.bbox[2], x1 + LAYOUT_MARGIN),
+                min(below) if below else page.bbox[3],
+            )
+            region_tables = page.crop(crop_box).extract_tables()
+            if not region_tables:
+                return None
+            tables.extend(region_tables)
+        return tables
+    
+    def _learn_layout(self, fingerprint: str, regions: List[List[float]]):
+        """Enregistre les zones des tables d'un gabarit et les sauvegarde si besoin"""
+        with self._layout_lock:
+            if self.layout_templates.get(fingerprint) == regions:
+                return
+            self.layout_templates[fingerprint] = regions
+            if self.layout_cache_path:
+                # Écriture atomique : le fichier peut être partagé entre processus
+                temp_path = f"{self.layout_cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.layout_templates, f, indent=1)
+                os.replace(temp_path, self.layout_cache_path)
+    
+    def _load_layout_templates(self) -> Dict[str, List[List[float]]]:
+        """Charge les gabarits appris lors des exécutions précédentes"""
+        if not self.layout_cache_path or not os.path.exists(self.layout_cache_path):
+            return {}
+        try:
+            with open(self.layout_cache_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Gabarits de mise en page ignorés ({self.layout_cache_path}): {e}")
+            return {}
+    
+    @traced('parser')
+    def _extract_pages_bounded(self, pdf) -> Tuple[str, List[List[List]], Dict]:
+        """Extrait texte et tables page par page en libérant les caches de chaque page
+        
+        Retourne le texte, les tables et le relevé mémoire (RSS initiale, pic,
+        plafond, pages traitées). Lève :class:`MemoryLimitExceeded` si la RSS
+        dépasse encore le plafond après libération des caches.
+        """
+        limit = self.memory_limit_mb * 1024 * 1024 if self.memory_limit_mb else None
+        start_rss = peak_rss = process_rss()
+        text_parts = []
+        all_tables = []
+        
+        for page_count, page in enumerate(pdf.pages, 1):
+            try:
+                page_text = page.extract_text() or ""
+                text_parts.append(page_text)
+                tables = self._extract_page_tables(page, page_text)
+                if tables:
+                    all_tables.extend(tables)
+            finally:
+                # Caractères, objets et carte de texte de la page ne sont plus utiles
+                page.close()
+            
+            rss = process_rss()
+            if limit and rss > limit:
+                # Les cycles d'objets pdfminer peuvent retenir la mémoire libérée
+                gc.collect()
+                rss = process_rss()
+            peak_rss = max(peak_rss, rss)
+            
+            if limit and rss > limit:
+                memory = self._memory_report(start_rss, peak_rss, page_count)
+                raise MemoryLimitExceeded(
+                    f"Plafond mémoire de {self.memory_limit_mb:.0f} Mo dépassé à la page "
+                    f"{page_count} ({rss / 1024 / 1024:.0f} Mo)", memory
+                )
+        
+        return "".join(text_parts), all_tables, self._memory_report(start_rss, peak_rss, len(pdf.pages))
+    
+    @property
+    def isolate_pages(self) -> bool:
+        """Indique si les pages sont extraites dans un worker soumis à un budget de temps"""
+        return self.page_timeout is not None or bool(self.extractor_timeouts)
+    
+    @traced('parser')
+    def _extract_pages_isolated(self, pdf_file) -> Tuple[str, List[List[List]], Dict]:
+        """Extrait texte et tables page par page dans un worker tué en cas de dépassement
+        
+        Chaque extracteur dispose de son budget (``extractor_timeouts``), borné
+        par ce qui reste du budget de la page (``page_timeout``). Une page en
+        dépassement ou en erreur est écartée en entier : son texte n'alimente
+        aucune section. Retourne le texte, les tables et les informations
+        ``skipped_pages`` et ``memory`` (RSS du worker).
+        """
+        from .page_isolation import PAGE_EXTRACTORS, PAGE_OK, PAGE_TIMEOUT, PageWorker, read_source
+        
+        limit = self.memory_limit_mb * 1024 * 1024 if self.memory_limit_mb else None
+        worker = PageWorker(read_source(pdf_file))
+        worker.start()
+        start_rss = peak_rss = worker.start_rss
+        text_parts = []
+        all_tables = []
+        skipped_pages = []
+        
+        try:
+            for page_index in range(worker.page_count):
+                deadline = time.monotonic() + self.page_timeout if self.page_timeout is not None else None
+                values = {}
+                
+                for extractor in PAGE_EXTRACTORS:
+                    timeout = self.extractor_timeouts.get(extractor)
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        timeout = remaining if timeout is None else min(timeout, remaining)
+                    
+                    if timeout is not None and timeout <= 0:
+                        # Budget de la page épuisé par les extracteurs précédents
+                        status, value, rss = PAGE_TIMEOUT, None, 0
+                    else:
+                        status, value, rss = worker.run(page_index, extractor, timeout)
+                    peak_rss = max(peak_rss, rss)
+                    
+                    if status != PAGE_OK:
+                        skipped_pages.append({
+                            'page': page_index + 1,
+                            'extractor': extractor,
+                            'reason': "délai dépassé" if status == PAGE_TIMEOUT else value,
+                        })
+                        values = None
+                        break
+                    values[extractor] = value
+                
+                if limit and peak_rss > limit:
+                    memory = self._memory_report(start_rss, peak_rss, page_index + 1)
+                    raise MemoryLimitExceeded(
+                        f"Plafond mémoire de {self.memory_limit_mb:.0f} Mo dépassé par le worker à la page "
+                        f"{page_index + 1} ({peak_rss / 1024 / 1024:.0f} Mo)", memory
+                    )
+                
+                if values is not None:
+                    text_parts.append(values['text'])
+                    all_tables.extend(values['tables'] or [])
+        finally:
+            worker.close()
+        
+        extras = {
+            'skipped_pages': skipped_pages,
+            'memory': self._memory_report(start_rss, peak_rss, worker.page_count),
+        }
+        return "".join(text_parts), all_tables, extras
+    
+    def _memory_report(self, start_rss: int, peak_rss: int, pages: int) -> Dict:
+        """Relevé mémoire du parsing en Mo"""
+        return {
+            'pages': pages,
+            'start_rss_mb': round(start_rss / 1024 / 1024, 1),
+            'peak_rss_mb': round(peak_rss / 1024 / 1024, 1),
+            'limit_mb': self.memory_limit_mb,
+        }
+    
+    @traced('parser')
     def _extract_monthly_data(self, text: str, tables: List) -> pd.DataFrame:
         """Extrait les données mensuelles d'activité"""
         monthly_data = []
         
-        # Pattern pour capturer les données mensuelles
-        patterns = {
-            'appels_traites': r'Appels Traités vs Présentés.*?(\d+).*?(\d+)',
-            'duree_conversation': r'Durée Moyenne de Conversation.*?(\d+):(\d+):(\d+)',
-            'nb_agents': r'Nombre d\'Agents Max.*?(\d+)'
-        }
-        
         # Recherche des sections mensuelles
         month_sections = re.findall(r'(Janvier|Février|Mars|Avril|Mai|Juin|Juillet|Août|Septembre|Octobre|Novembre|Décembre)\s+2025\s+Agents(.*?)(?=(?:Janvier|Février|Mars|Avril|Mai|Juin|Juillet|Août|Septembre|Octobre|Novembre|Décembre)\s+2025\s+Agents|Cloture|$)', 
                                    text, re.DOTALL)
@@ -82,23 +378,90 @@ class TelephoneReportParser:
                 month_data['appels_traites'] = int(appels_match.group(1))
                 month_data['appels_presentes'] = int(appels_match.group(2))
             
-            # Extraction durée conversation
-            duree_match = re.search(r'(\d+):(\d+):(\d+)', section_text)
-            if duree_match:
-                minutes = int(duree_match.group(2))
-                seconds = int(duree_match.group(3))
-                month_data['duree_moyenne_conv'] = round(minutes + seconds/60, 2)
-            
             # Extraction nombre d'agents
             agents_match = re.search(r'Nombre d\'Agents Max.*?(\d+)', section_text)
             if agents_match:
                 month_data['nb_agents_max'] = int(agents_match.group(1))
             
-            if len(month_data) > 1:  # Si on a trouvé des données
-                monthly_data.append(month_data)
+            monthly_data.append(month_data)
+        
+        if not monthly_data:
+            return pd.DataFrame()
         
-        return pd.DataFrame(monthly_data) if monthly_data else pd.DataFrame()
+        # Durées de toutes les sections, converties d'un bloc en secondes
+        durations = self._extract_durations([section_text for _, section_text in month_sections])
+        df = pd.DataFrame(monthly_data)
+        for column, seconds in durations.items():
+            df[column] = seconds
+        
+        # Si on a trouvé des données
+        df = df[df.drop(columns='mois').notna().any(axis=1)].reset_index(drop=True)
+        if df.empty:
+            return pd.DataFrame()
+        
+        leading = [column for column in ('mois', 'appels_traites', 'appels_presentes',
+                                         'duree_moyenne_conv_s', 'nb_agents_max') if column in df]
+        return df[leading + [column for column in df.columns if column not in leading]]
     
+    def _extract_durations(self, sections: List[str]) -> Dict[str, pd.api.extensions.ExtensionArray]:
+        """Extrait tous les champs de durée des sections, en secondes (Int32, une valeur par section)
+        
+        Les correspondances de toutes les sections sont collectées, puis
+        converties en secondes en une seule opération NumPy, heures comprises.
+        Chaque durée est rattachée au libellé qui la précède. Dans une section
+        sans durée de conversation libellée, la première durée sans libellé en
+        tient lieu, comme le faisaient les anciens rapports ; les durées
+        libellées autrement (attente...) ne sont jamais reprises.
+        """
+        rows, labels, fields = [], [], []
+        for row, section in enumerate(sections):
+            previous_end = 0
+            for match in DURATION_PATTERN.finditer(section):
+                rows.append(row)
+                labels.append(self._duration_column(section[previous_end:match.start()]))
+                fields.extend(match.groups())
+                previous_end = match.end()
+        if not rows:
+            return {}
+        
+        rows = np.array(rows, dtype=np.intp)
+        labels = np.array(labels, dtype=object)
+        seconds = np.array(fields).astype(np.int32).reshape(-1, 3) @ DURATION_WEIGHTS
+        
+        # Sections sans durée de conversation libellée : leur première durée
+        # sans libellé devient la durée de conversation (déplacée, pas copiée)
+        conversation = 'duree_moyenne_conv_s'
+        unlabelled = np.flatnonzero(labels == UNLABELLED_DURATION)
+        _, first = np.unique(rows[unlabelled], return_index=True)
+        fallback = unlabelled[first]
+        fallback = fallback[~np.isin(rows[fallback], rows[labels == conversation])]
+        labels[fallback] = conversation
+        
+        durations = {}
+        for column in dict.fromkeys(labels):
+            selected = labels == column
+            # Pour un libellé répété dans une section, la première occurrence l'emporte
+            section_rows, first = np.unique(rows[selected], return_index=True)
+            values = np.zeros(len(sections), dtype=np.int32)
+            missing = np.ones(len(sections), dtype=bool)
+            values[section_rows] = seconds[selected][first]
+            missing[section_rows] = False
+            durations[column] = pd.arrays.IntegerArray(values, missing)
+        return durations
+    
+    def _duration_column(self, preceding_text: str) -> str:
+        """Colonne d'une durée d'après son libellé (dernière ligne de texte qui la précède)"""
+        lines = [line for line in preceding_text.splitlines() if line.strip()]
+        if not lines or not re.search(r'[^\W\d_]', lines[-1]):
+            # Valeur sans libellé (précédée d'une autre valeur)
+            return UNLABELLED_DURATION
+        label = unicodedata.normalize('NFKD', lines[-1]).encode('ascii', 'ignore').decode().lower()
+        slug = re.sub(r'[^a-z0-9]+', '_', label).strip('_')
+        if slug in DURATION_FIELDS:
+            return DURATION_FIELDS[slug]
+        return f"{slug}_s" if slug.startswith('duree') else f"duree_{slug}_s"
+    
+    @traced('parser')
     def _extract_agents_data(self, text: str, tables: List) -> pd.DataFrame:
         """Extrait les données individuelles des agents"""
         agents_data = []
@@ -139,6 +502,7 @@ class TelephoneReportParser:
         
         return agents
     
+    @traced('parser')
     def _extract_agents_from_text(self, text: str) -> List[Dict]:
         """Extraction des agents depuis le texte brut"""
         agents = []
@@ -169,6 +533,7 @@ class TelephoneReportParser:
         
         return agents
     
+    @traced('parser')
     def _extract_kpi_data(self, text: str) -> Dict:
         """Extrait les KPI globaux"""
         kpi = {}
@@ -186,6 +551,7 @@ class TelephoneReportParser:
         
         return kpi
     
+    @traced('parser')
     def _extract_resolution_data(self, text: str, tables: List) -> pd.DataFrame:
         """Extrait les données de résolution des appels"""
         resolution_data = []
@@ -213,6 +579,7 @@ class TelephoneReportParser:
         
         return pd.DataFrame(resolution_data) if resolution_data else pd.DataFrame()
     
+    @traced('parser')
     def _extract_tickets_data(self, tables: List) -> pd.DataFrame:
         """Extrait les données des tickets N2"""
         tickets_data = []
@@ -245,15 +612,20 @@ class TelephoneReportParser:
         return pd.DataFrame(tickets_data) if tickets_data else pd.DataFrame()
     
     def get_summary_statistics(self, parsed_data: Dict) -> Dict:
-        """Calcule des statistiques de résumé"""
+        """Calcule des statistiques de résumé (lues sur le cube d'agrégats du rapport)"""
+        from .rollup import rollup_for
+        
         stats = {}
+        rollup = rollup_for(parsed_data)
+        totals = rollup.totals()
         
         if 'monthly_data' in parsed_data and not parsed_data['monthly_data'].empty:
             monthly_df = parsed_data['monthly_data']
             
-            stats['total_appels_presentes'] = monthly_df['appels_presentes'].sum() if 'appels_presentes' in monthly_df else 0
-            stats['total_appels_traites'] = monthly_df['appels_traites'].sum() if 'appels_traites' in monthly_df else 0
-            stats['duree_moyenne_globale'] = monthly_df['duree_moyenne_conv'].mean() if 'duree_moyenne_conv' in monthly_df else 0
+            stats['total_appels_presentes'] = totals['appels_presentes'] if 'appels_presentes' in monthly_df else 0
+            stats['total_appels_traites'] = totals['appels_traites'] if 'appels_traites' in monthly_df else 0
+            # Durées stockées en secondes, présentées en minutes
+            stats['duree_moyenne_globale'] = totals['duree_moyenne_conv_s'] / 60 if 'duree_moyenne_conv_s' in monthly_df else 0
             stats['taux_resolution_calcule'] = (stats['total_appels_traites'] / stats['total_appels_presentes'] * 100) if stats['total_appels_presentes'] > 0 else 0
         
         if 'agents_data' in parsed_data and not parsed_data['agents_data'].empty:
@@ -261,24 +633,29 @@ class TelephoneReportParser:
             stats['nombre_agents_actifs'] = len(agents_df)
             
             if 'appels_presentes' in agents_df:
-                stats['agent_le_plus_actif'] = agents_df.loc[agents_df['appels_presentes'].idxmax(), 'agent'] if not agents_df.empty else 'N/A'
+                # Classement sur les valeurs numériques, indépendant de l'index du DataFrame
+                stats['agent_le_plus_actif'] = rollup.top_agent('appels_presentes') or 'N/A'
         
         return stats
 
+# Section mensuelle au format des rapports (données simulées, benchmarks)
+SAMPLE_MONTH_TEXT = """
+    {mois} 2025 Agents
+    Appels Traités vs Présentés
+    {appels_traites} ▼ {appels_presentes}
+    Durée Moyenne de Conversation
+    {duree}
+    Nombre d'Agents Max
+    {nb_agents_max}
+    """
+
 def test_parser():
     """Fonction de test du parser"""
     parser = TelephoneReportParser()
     
     # Test avec données simulées
-    sample_text = """
-    Janvier 2025 Agents
-    Appels Traités vs Présentés
-    570 ▼ 594
-    Durée Moyenne de Conversation
-    00:05:51
-    Nombre d'Agents Max
-    3
-    """
+    sample_text = SAMPLE_MONTH_TEXT.format(mois='Janvier', appels_traites=570, appels_presentes=594,
+                                           duree='00:05:51', nb_agents_max=3)
     
     # Simulation d'extraction
     result = parser._extract_monthly_data(sample_text, [])
@@ -0,0 +1,389 @@
+import io
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfdoc, pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import (Image, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table,
+                                TableStyle)
+
+from .recommendations import RecommendationEngine
+from .report_generator import CHART_SLOTS, PowerPointReportGenerator
+
+# Polices Vera fournies avec reportlab : contrairement aux polices PDF
+# standard, elles couvrent les caractères « ≤ » et « • » des textes d'analyse
+PDF_FONT = 'Vera'
+PDF_FONT_BOLD = 'VeraBd'
+_FONTS_LOCK = threading.Lock()
+
+
+def _register_fonts():
+    """Enregistre les polices du rapport une seule fois par processus"""
+    with _FONTS_LOCK:
+        if PDF_FONT in pdfmetrics.getRegisteredFontNames():
+            return
+        pdfmetrics.registerFont(TTFont(PDF_FONT, 'Vera.ttf'))
+        pdfmetrics.registerFont(TTFont(PDF_FONT_BOLD, 'VeraBd.ttf'))
+        pdfmetrics.registerFontFamily(PDF_FONT, normal=PDF_FONT, bold=PDF_FONT_BOLD)
+
+
+class _WrittenObject(pdfdoc.PDFObject):
+    """Objet PDF déjà écrit dans la sortie
+
+    Remplace l'objet dans la table du document pour libérer son contenu ; les
+    dimensions sont conservées pour qu'une image redessinée soit réutilisée.
+    """
+
+    def __init__(self, obj):
+        self.width = getattr(obj, 'width', None)
+        self.height = getattr(obj, 'height', None)
+
+
+class _StreamingPDFDocument(pdfdoc.PDFDocument):
+    """Document reportlab qui écrit chaque page dans la sortie dès qu'elle est terminée
+
+    reportlab conserve normalement tous les objets jusqu'à l'enregistrement.
+    Ici, à la fin de chaque page, la page, son flux de contenu et les images
+    qu'elle a introduites sont écrits puis libérés. Seuls les objets globaux
+    (catalogue, arbre des pages, polices, informations), qui évoluent jusqu'à
+    la dernière page, sont écrits à l'enregistrement avec la table des
+    références croisées : celle-ci donne la position de chaque objet, quel
+    que soit son ordre dans le fichier.
+    """
+
+    # Objets complets dès la fin de leur page
+    STREAMED_TYPES = (pdfdoc.PDFPage, pdfdoc.PDFStream, pdfdoc.PDFImageXObject)
+
+    def __init__(self, output, **kwargs):
+        super().__init__(**kwargs)
+        self._output = output
+        self._offset = 0
+        self._scanned = 0
+        self._write(pdfdoc.PDFFile(self._pdfVersion).format(self))
+
+    def addPage(self, page):
+        name = self.thisPageName()
+        super().addPage(page)
+        self._write_finished_objects()
+        # L'arbre des pages ne garde qu'une référence vers la page écrite
+        self.Pages.pages[-1] = pdfdoc.PDFObjectReference(name)
+
+    def format(self):
+        """Écrit les objets restants, la table des références croisées et le trailer
+
+        Appelée par ``GetPDFData`` à l'enregistrement ; tout a déjà été écrit
+        dans la sortie, il ne reste rien à retourner.
+        """
+        catalog = self.Reference(self.Catalog)
+        info = self.Reference(self.info)
+        # De nouveaux objets peuvent être enregistrés pendant l'écriture
+        number = 1
+        while number <= self.objectcounter:
+            name = self.numberToId[number]
+            if name not in self.idToOffset:
+                self._write_object(name)
+            number += 1
+
+        ids = [self.numberToId[number] for number in range(1, self.objectcounter + 1)]
+        xref = pdfdoc.PDFCrossReferenceTable()
+        xref.addsection(0, ids)
+        xref_offset = self._offset
+        self._write(xref.format(self))
+        trailer = pdfdoc.PDFTrailer(startxref=xref_offset, Size=len(ids) + 1,
+                                    Root=catalog, Info=info, ID=self.ID())
+        self._write(trailer.format(self))
+        return b''
+
+    def _write_finished_objects(self):
+        """Écrit les pages, flux et images enregistrés depuis la page précédente"""
+        while self._scanned < self.objectcounter:
+            self._scanned += 1
+            name = self.numberToId[self._scanned]
+            if isinstance(self.idToObject[name], self.STREAMED_TYPES):
+                self._write_object(name)
+
+    def _write_object(self, name: str):
+        """Écrit un objet à la position courante et libère son contenu"""
+        obj = self.idToObject[name]
+        data = pdfdoc.PDFIndirectObject(name, obj).format(self)
+        self.idToOffset[name] = self._offset
+        self._write(data)
+        self.idToObject[name] = _WrittenObject(obj)
+
+    def _write(self, data: bytes):
+        self._output.write(data)
+        self._offset += len(data)
+
+
+class _StreamingCanvas(Canvas):
+    """Canevas dont les pages sont écrites dans la sortie au fur et à mesure
+
+    ``output`` doit être un objet fichier ouvert en écriture binaire.
+    """
+
+    def __init__(self, output, **kwargs):
+        super().__init__(output, **kwargs)
+        self._doc = _StreamingPDFDocument(
+            output, compression=self._pageCompression, invariant=self._doc.invariant,
+            pdfVersion=self._doc._pdfVersion, lang=kwargs.get('lang')
+        )
+        # Le préambule référence la police initiale : à enregistrer dans le nouveau document
+        self._make_preamble()
+
+
+class PDFReportGenerator:
+    """Générateur de rapports PDF en lecture seule, sans suite bureautique
+
+    Consomme les mêmes ``parsed_data`` et figures que
+    ``PowerPointReportGenerator.create_presentation`` et reprend son contenu
+    (KPIs, textes d'analyse, tableaux formatés, graphiques), une section par
+    page au format paysage.
+    """
+
+    def __init__(self, max_workers: int = 4, recommendation_engine: Optional[RecommendationEngine] = None):
+        # Le contenu est préparé par le générateur PowerPoint : les deux formats restent identiques
+        self.content_builder = PowerPointReportGenerator(
+            max_workers=max_workers, recommendation_engine=recommendation_engine
+        )
+        self.colors = {
+            name: colors.Color(*(channel / 255 for channel in rgb))
+            for name, rgb in self.content_builder.colors.items()
+        }
+        _register_fonts()
+        self.styles = self._build_styles()
+
+    def write_pdf(self, parsed_data: Dict, figures: Dict, output):
+        """Écrit le rapport PDF dans un chemin ou un objet fichier ouvert en écriture binaire
+
+        Chaque page est compressée et écrite dans la sortie dès qu'elle est
+        dessinée, puis libérée : la mémoire ne dépend pas du nombre de pages.
+        Les graphiques sont insérés en PNG à la taille de leur zone.
+        """
+        if isinstance(output, (str, os.PathLike)):
+            with open(output, 'wb') as f:
+                return self.write_pdf(parsed_data, figures, f)
+
+        content = self.content_builder._prepare_slide_content(parsed_data, figures)
+
+        doc = SimpleDocTemplate(
+            output, pagesize=landscape(A4), pageCompression=1,
+            leftMargin=2 * cm, rightMargin=2 * cm, topMargin=1.5 * cm, bottomMargin=1.5 * cm,
+            title="Rapport de Performance Téléphonie", author="Analyse Automatisée"
+        )
+
+        story = []
+        for section in (
+            self._title_page(content),
+            self._executive_summary_page(content),
+            self._monthly_analysis_page(content, figures),
+            self._agents_performance_page(content),
+            self._kpi_trends_page(parsed_data, content),
+            self._resolution_analysis_page(content),
+            self._recommendations_page(content),
+        ):
+            story.extend(section)
+            story.append(PageBreak())
+        story.pop()
+
+        doc.build(story, onFirstPage=self._draw_footer, onLaterPages=self._draw_footer,
+                  canvasmaker=_StreamingCanvas)
+
+    def get_pdf_bytes(self, parsed_data: Dict, figures: Dict) -> bytes:
+        """Retourne le rapport PDF sous forme de bytes pour téléchargement"""
+        buffer = io.BytesIO()
+        self.write_pdf(parsed_data, figures, buffer)
+        return buffer.getvalue()
+
+    def save_pdf(self, parsed_data: Dict, figures: Dict, filename: str = None,
+                 directory: Optional[str] = None) -> str:
+        """Sauvegarde le rapport PDF et retourne le chemin"""
+        if not filename:
+            filename = f"rapport_telephonie_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+        filepath = os.path.join(directory or tempfile.gettempdir(), filename)
+        self.write_pdf(parsed_data, figures, filepath)
+        return filepath
+
+    def _build_styles(self) -> Dict[str, ParagraphStyle]:
+        """Styles de paragraphe du rapport"""
+        base = getSampleStyleSheet()
+        return {
+            'cover': ParagraphStyle('cover', parent=base['Title'], fontName=PDF_FONT_BOLD,
+                                    fontSize=30, leading=36, textColor=self.colors['primary']),
+            'subtitle': ParagraphStyle('subtitle', parent=base['Normal'], fontName=PDF_FONT,
+                                       fontSize=16, leading=22, alignment=TA_CENTER,
+                                       textColor=self.colors['dark']),
+            'title': ParagraphStyle('title', parent=base['Heading1'], fontName=PDF_FONT_BOLD,
+                                    fontSize=22, leading=28, textColor=self.colors['primary']),
+            'heading': ParagraphStyle('heading', parent=base['Heading3'], fontName=PDF_FONT_BOLD,
+                                      fontSize=13, leading=18, textColor=self.colors['dark']),
+            'body': ParagraphStyle('body', parent=base['Normal'], fontName=PDF_FONT,
+                                   fontSize=11, leading=16),
+            'bullet': ParagraphStyle('bullet', parent=base['Normal'], fontName=PDF_FONT,
+                                     fontSize=11, leading=16, leftIndent=18, bulletIndent=6,
+                                     bulletFontName=PDF_FONT),
+            'kpi_value': ParagraphStyle('kpi_value', parent=base['Normal'], fontName=PDF_FONT_BOLD,
+                                        fontSize=18, leading=24, alignment=TA_CENTER),
+            'kpi_label': ParagraphStyle('kpi_label', parent=base['Normal'], fontName=PDF_FONT,
+                                        fontSize=10, leading=13, alignment=TA_CENTER,
+                                        textColor=self.colors['dark']),
+        }
+
+    def _draw_footer(self, canvas, doc):
+        """Pied de page : numéro de page"""
+        canvas.saveState()
+        canvas.setFont(PDF_FONT, 8)
+        canvas.setFillColor(self.colors['dark'])
+        canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, 0.8 * cm, f"Page {doc.page}")
+        canvas.restoreState()
+
+    def _bullets(self, lines: List[str]) -> List[Paragraph]:
+        """Liste à puces"""
+        return [Paragraph(self._escape(line), self.styles['bullet'], bulletText='•') for line in lines]
+
+    def _escape(self, text: str) -> str:
+        """Échappe le texte pour le mini-langage de balisage des paragraphes reportlab"""
+        return str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+    def _title_page(self, content: Dict) -> List:
+        """Page de titre"""
+        return [
+            Spacer(1, 5 * cm),
+            Paragraph("Rapport de Performance Téléphonie", self.styles['cover']),
+            Spacer(1, 0.8 * cm),
+            Paragraph(self._escape(content['period']), self.styles['subtitle']),
+            Paragraph("Analyse Automatisée", self.styles['subtitle']),
+            Spacer(1, 3 * cm),
+            Paragraph(f"Généré le: {pd.Timestamp.now().strftime('%d/%m/%Y')}", self.styles['kpi_label']),
+        ]
+
+    def _executive_summary_page(self, content: Dict) -> List:
+        """Résumé exécutif : boîtes KPI et points clés"""
+        values = self.content_builder._format_kpi_values(content['kpis'])
+        kpi_items = [
+            ("Volume Total", 'total_volume', self.colors['primary']),
+            ("Taux Résolution", 'taux_resolution', self.colors['secondary']),
+            ("Durée Moyenne", 'duree_moyenne', self.colors['warning']),
+            ("Agents Actifs", 'nb_agents', self.colors['accent'])
+        ]
+
+        cells = []
+        style = [('BACKGROUND', (0, 0), (-1, -1), self.colors['light']),
+                 ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                 ('TOPPADDING', (0, 0), (-1, -1), 10),
+                 ('BOTTOMPADDING', (0, 0), (-1, -1), 10)]
+        for i, (label, key, color) in enumerate(kpi_items):
+            value_style = ParagraphStyle(f'kpi_{key}', parent=self.styles['kpi_value'], textColor=color)
+            cells.append([Paragraph(values[key], value_style), Paragraph(label, self.styles['kpi_label'])])
+            style.append(('BOX', (i, 0), (i, 0), 2, color))
+        kpi_table = Table([cells], colWidths=[5.5 * cm] * len(cells), hAlign='LEFT')
+        kpi_table.setStyle(TableStyle(style))
+
+        return [
+            Paragraph("Résumé Exécutif", self.styles['title']),
+            Spacer(1, 0.5 * cm),
+            kpi_table,
+            Spacer(1, 1 * cm),
+            Paragraph("Points Clés:", self.styles['heading']),
+            *self._bullets(content['key_points']),
+        ]
+
+    def _monthly_analysis_page(self, content: Dict, figures: Dict) -> List:
+        """Analyse mensuelle : graphique principal et tableau"""
+        flowables = [Paragraph("Analyse Mensuelle des Performances", self.styles['title'])]
+
+        if 'volume_calls' in figures:
+            image = content.get('chart_volume_calls')
+            if image:
+                width, height = CHART_SLOTS['volume_calls']
+                # Zone réduite pour laisser la place au tableau sur la même page
+                flowables.append(Image(io.BytesIO(image), width=width * 0.8 * 72, height=height * 0.8 * 72))
+            else:
+                flowables.append(Paragraph(
+                    "Graphique des performances mensuelles "
+                    "(visualisation interactive disponible dans l'application)",
+                    self.styles['subtitle']
+                ))
+            flowables.append(Spacer(1, 0.5 * cm))
+
+        if content['monthly_table'] is not None:
+            flowables.append(self._data_table(content['monthly_table'], font_size=8))
+        return flowables
+
+    def _agents_performance_page(self, content: Dict) -> List:
+        """Performance des agents : top performer et tableau (réparti sur plusieurs pages si besoin)"""
+        flowables = [Paragraph("Performance Individuelle des Agents", self.styles['title'])]
+
+        if content['top_agent'] is not None:
+            top_style = ParagraphStyle('top', parent=self.styles['heading'], textColor=self.colors['secondary'])
+            flowables.append(Paragraph(f"Top Performer : {self._escape(content['top_agent'])}", top_style))
+            flowables.append(Spacer(1, 0.3 * cm))
+
+        if content['agents_table'] is not None:
+            flowables.append(self._data_table(content['agents_table']))
+        return flowables
+
+    def _kpi_trends_page(self, parsed_data: Dict, content: Dict) -> List:
+        """Grille des indicateurs clés"""
+        flowables = [Paragraph("Indicateurs Clés et Tendances", self.styles['title'])]
+
+        monthly_data = parsed_data.get('monthly_data', pd.DataFrame())
+        if not monthly_data.empty:
+            values = self.content_builder._format_kpi_grid_values(content['kpis'])
+            flowables.append(Paragraph("INDICATEURS CLÉS DE PERFORMANCE", self.styles['heading']))
+            flowables.extend(self._bullets([
+                f"Volume Total Traité: {values['total_volume']} appels",
+                f"Taux de Résolution: {values['taux_resolution']}%",
+                f"Durée Moyenne: {values['duree_moyenne']} minutes",
+                f"Période Analysée: {values['periode_couverte']} mois",
+                f"Agents Actifs: {values['nb_agents']} agents",
+            ]))
+        return flowables
+
+    def _resolution_analysis_page(self, content: Dict) -> List:
+        """Analyse de la résolution"""
+        flowables = [Paragraph("Analyse de la Résolution", self.styles['title'])]
+
+        resolution = content['resolution']
+        if resolution is not None:
+            flowables.append(Paragraph(f"Taux de Résolution Global: {resolution['taux_global']:.1f}%",
+                                       self.styles['heading']))
+            flowables.extend(self._bullets(resolution['evolution']))
+        return flowables
+
+    def _recommendations_page(self, content: Dict) -> List:
+        """Recommandations"""
+        return [
+            Paragraph("Recommandations", self.styles['title']),
+            Paragraph("Actions Recommandées:", self.styles['heading']),
+            *self._bullets(content['recommendations']),
+        ]
+
+    def _data_table(self, table: Dict, font_size: int = 9) -> Table:
+        """Tableau reportlab à partir d'un tableau préparé (en-tête répété à chaque page)"""
+        data = [table['header']] + table['cells'].tolist()
+        pdf_table = Table(data, repeatRows=1, hAlign='LEFT')
+
+        style = [
+            ('FONTNAME', (0, 0), (-1, -1), PDF_FONT),
+            ('FONTNAME', (0, 0), (-1, 0), PDF_FONT_BOLD),
+            ('FONTSIZE', (0, 0), (-1, -1), font_size),
+            ('BACKGROUND', (0, 0), (-1, 0), self.colors['primary']),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.colors['light']]),
+            ('GRID', (0, 0), (-1, -1), 0.25, self.colors['dark']),
+        ]
+        for col_idx, numeric in enumerate(table['numeric']):
+            if numeric:
+                style.append(('ALIGN', (col_idx, 0), (col_idx, -1), 'RIGHT'))
+        pdf_table.setStyle(TableStyle(style))
+        return pdf_table
@@ -0,0 +1,78 @@
+import importlib
+from typing import Dict, List, Optional
+
+# Composants du pipeline : nom -> (module du package, classe)
+PIPELINE_COMPONENTS = {
+    'parser': ('utils.pdf_parser', 'TelephoneReportParser'),
+    'visualizer': ('utils.visualizations', 'TelephoneReportVisualizer'),
+    'generator': ('utils.report_generator', 'PowerPointReportGenerator'),
+}
+
+
+class PipelineLoadError(ImportError):
+    """Levée en mode strict lorsqu'un composant du pipeline ne peut être chargé"""
+
+
+class Pipeline:
+    """Composants chargés du pipeline et état de leur chargement"""
+
+    def __init__(self):
+        self.parser = None
+        self.visualizer = None
+        self.generator = None
+        # Nom du composant -> message d'erreur (None si chargé)
+        self.errors: Dict[str, Optional[str]] = {}
+
+    @property
+    def loaded(self) -> List[str]:
+        """Composants chargés avec succès"""
+        return [name for name, error in self.errors.items() if error is None]
+
+    @property
+    def missing(self) -> List[str]:
+        """Composants dont le chargement a échoué"""
+        return [name for name, error in self.errors.items() if error is not None]
+
+    @property
+    def is_complete(self) -> bool:
+        """Indique si tous les composants demandés sont disponibles"""
+        return not self.missing
+
+    def status_report(self) -> Dict[str, str]:
+        """Retourne l'état lisible de chaque composant"""
+        return {
+            name: 'chargé' if error is None else f'indisponible ({error})'
+            for name, error in self.errors.items()
+        }
+
+
+def load_pipeline(components: Optional[List[str]] = None, strict: bool = False,
+                  parser_options: Optional[Dict] = None) -> Pipeline:
+    """Charge le parser, le visualiseur et le générateur depuis le package utils
+
+    Chaque composant est importé indépendamment : l'absence de python-pptx
+    n'empêche pas le parser de fonctionner. L'état de chaque composant est
+    consigné dans ``Pipeline.errors``. En mode ``strict``, un composant
+    manquant lève :class:`PipelineLoadError` au lieu de basculer en fallback.
+    ``parser_options`` est transmis au constructeur du parser.
+    """
+    pipeline = Pipeline()
+
+    for name in components or list(PIPELINE_COMPONENTS):
+        if name not in PIPELINE_COMPONENTS:
+            raise ValueError(f"Composant inconnu: {name}")
+
+        module_name, class_name = PIPELINE_COMPONENTS[name]
+        try:
+            module = importlib.import_module(module_name)
+            options = (parser_options or {}) if name == 'parser' else {}
+            setattr(pipeline, name, getattr(module, class_name)(**options))
+            pipeline.errors[name] = None
+        except ImportError as e:
+            pipeline.errors[name] = str(e)
+
+    if strict and pipeline.missing:
+        details = ', '.join(f"{name}: {pipeline.errors[name]}" for name in pipeline.missing)
+        raise PipelineLoadError(f"Pipeline incomplet ({details})")
+
+    return pipeline
@@ -0,0 +1,261 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Indicateurs du vecteur de métriques : nom -> nombre de décimales conservées.
+# Les valeurs sont arrondies à leur précision d'affichage avant l'évaluation :
+# seuils et textes portent ainsi sur la même valeur, et des rapports presque
+# identiques partagent la même entrée du cache.
+METRICS = {
+    'total_volume': 0,
+    'taux_resolution': 1,
+    'duree_moyenne': 1,
+    'volume_trend': 1,
+    'taux_global': 1,
+    'best_month_rate': 1,
+    'worst_month_rate': 1,
+    'resolution_trend': 3,
+    'duree_conv': 3,
+    'variation_agents': 3,
+    'cv_agents': 3,
+}
+
+# Sections de texte produites par le moteur
+SECTIONS = ('key_points', 'resolution_evolution', 'recommendations')
+
+
+def _rule(section: str, metric: str, text: str, gt=None, ge=None, lt=None, le=None) -> Dict:
+    """Déclare une règle : ``text`` est produit lorsque l'indicateur respecte les bornes"""
+    return {'section': section, 'metric': metric, 'text': text,
+            'gt': gt, 'ge': ge, 'lt': lt, 'le': le}
+
+
+# Règles de génération, dans l'ordre d'affichage de chaque section. Une règle
+# sans borne s'applique dès que l'indicateur est défini.
+DEFAULT_RULES = [
+    # Points clés du résumé exécutif
+    _rule('key_points', 'total_volume',
+          "Volume total de {total_volume:,.0f} appels traités sur la période", gt=0),
+    _rule('key_points', 'taux_resolution',
+          "Excellent taux de résolution de {taux_resolution:.1f}% (objectif dépassé)", ge=95),
+    _rule('key_points', 'taux_resolution',
+          "Bon taux de résolution de {taux_resolution:.1f}% (proche de l'objectif)", ge=90, lt=95),
+    _rule('key_points', 'taux_resolution',
+          "Taux de résolution de {taux_resolution:.1f}% nécessite une attention", lt=90),
+    _rule('key_points', 'duree_moyenne',
+          "Durée moyenne de conversation optimale (≤5 min)", le=5),
+    _rule('key_points', 'duree_moyenne',
+          "Durée moyenne de {duree_moyenne:.1f} min peut être optimisée", gt=5),
+    _rule('key_points', 'volume_trend',
+          "Tendance positive du volume d'appels (+{volume_trend:.1f}%)", gt=5),
+    _rule('key_points', 'volume_trend',
+          "Tendance négative du volume d'appels ({volume_trend:.1f}%)", lt=-5),
+    _rule('key_points', 'volume_trend',
+          "Volume d'appels stable sur la période", ge=-5, le=5),
+
+    # Évolution de la résolution
+    _rule('resolution_evolution', 'best_month_rate',
+          "Meilleur mois: {best_month} ({best_month_rate:.1f}%)"),
+    _rule('resolution_evolution', 'worst_month_rate',
+          "Mois le plus difficile: {worst_month} ({worst_month_rate:.1f}%)"),
+    _rule('resolution_evolution', 'resolution_trend',
+          "Tendance d'amélioration continue", gt=1),
+    _rule('resolution_evolution', 'resolution_trend',
+          "Attention: tendance de dégradation", lt=-1),
+    _rule('resolution_evolution', 'resolution_trend',
+          "Performance stable", ge=-1, le=1),
+
+    # Recommandations
+    _rule('recommendations', 'taux_global',
+          "Améliorer le taux de résolution par formation complémentaire", lt=90),
+    _rule('recommendations', 'taux_global',
+          "Analyser les causes de non-résolution des appels", lt=90),
+    _rule('recommendations', 'taux_global',
+          "Optimiser les processus pour maintenir l'excellence", gt=98),
+    _rule('recommendations', 'duree_conv',
+          "Réduire la durée moyenne par optimisation des scripts", gt=6),
+    _rule('recommendations', 'duree_conv',
+          "Former les agents aux techniques de communication efficace", gt=6),
+    _rule('recommendations', 'duree_conv',
+          "Vérifier la qualité du service malgré la rapidité", lt=3),
+    _rule('recommendations', 'variation_agents',
+          "Stabiliser l'effectif pour une meilleure prévisibilité", gt=1),
+    _rule('recommendations', 'cv_agents',
+          "Équilibrer la charge de travail entre agents", gt=0.5),
+    _rule('recommendations', 'cv_agents',
+          "Identifier et partager les bonnes pratiques", gt=0.5),
+]
+
+# Recommandations générales lorsqu'aucune règle spécifique ne s'applique
+FALLBACK_RECOMMENDATIONS = [
+    "Maintenir le niveau de performance actuel",
+    "Continuer le monitoring régulier des indicateurs",
+    "Planifier des sessions de formation continue",
+]
+
+
+def metric_value(metrics: Dict, name: str) -> float:
+    """Valeur d'un indicateur du vecteur de métriques (NaN si non calculable)"""
+    return metrics['values'][list(METRICS).index(name)]
+
+
+def calculate_trend(series) -> float:
+    """Évolution (%) de la moyenne de la seconde moitié de la série par rapport à la première"""
+    values = np.asarray(series, dtype='float64')
+    if len(values) < 2:
+        return 0
+
+    first_half = values[:len(values)//2].mean()
+    second_half = values[len(values)//2:].mean()
+
+    if first_half == 0:
+        return 0
+
+    return ((second_half - first_half) / first_half) * 100
+
+
+def _column(df: pd.DataFrame, column: str) -> Optional[np.ndarray]:
+    """Colonne numérique sous forme de tableau NumPy (None si absente)"""
+    if column not in df:
+        return None
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def compute_metrics(monthly_data: pd.DataFrame, agents_data: pd.DataFrame,
+                    kpis: Optional[Dict] = None) -> Dict:
+    """Calcule le vecteur de métriques d'un rapport
+
+    Chaque colonne utile est convertie une seule fois en tableau NumPy.
+    ``kpis`` (résultat de ``_calculate_executive_kpis``) évite de recalculer
+    les volumes et taux déjà connus. Les indicateurs non calculables valent
+    NaN ; les libellés de mois sont rangés sous ``labels``.
+    """
+    values = dict.fromkeys(METRICS, np.nan)
+    labels = {'best_month': '', 'worst_month': ''}
+
+    traites = presentes = None
+    if not monthly_data.empty:
+        traites = _column(monthly_data, 'appels_traites')
+        presentes = _column(monthly_data, 'appels_presentes')
+        duree = _column(monthly_data, 'duree_moyenne_conv_s')
+
+        if traites is not None and len(traites) > 1:
+            values['volume_trend'] = calculate_trend(traites)
+
+        if traites is not None and presentes is not None:
+            values['taux_global'] = np.nansum(traites) / np.nansum(presentes) * 100
+
+            if len(traites) > 1:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    taux_mensuel = traites / presentes * 100
+                if 'mois' in monthly_data and not np.isnan(taux_mensuel).all():
+                    best, worst = np.nanargmax(taux_mensuel), np.nanargmin(taux_mensuel)
+                    values['best_month_rate'] = taux_mensuel[best]
+                    values['worst_month_rate'] = taux_mensuel[worst]
+                    labels = {'best_month': str(monthly_data['mois'].iloc[best]),
+                              'worst_month': str(monthly_data['mois'].iloc[worst])}
+                if len(taux_mensuel) > 2:
+                    values['resolution_trend'] = calculate_trend(taux_mensuel)
+
+        if duree is not None:
+            # Secondes stockées, minutes dans les textes
+            values['duree_conv'] = np.nanmean(duree) / 60 if not np.isnan(duree).all() else np.nan
+        nb_agents = _column(monthly_data, 'nb_agents_max')
+        if nb_agents is not None and np.count_nonzero(~np.isnan(nb_agents)) > 1:
+            values['variation_agents'] = np.nanstd(nb_agents, ddof=1)
+
+    if kpis is None:
+        kpis = {}
+        if traites is not None or presentes is not None:
+            total_volume = np.nansum(presentes) if presentes is not None else 0
+            total_traites = np.nansum(traites) if traites is not None else 0
+            kpis = {
+                'total_volume': total_volume,
+                'taux_resolution': total_traites / total_volume * 100 if total_volume > 0 else 0,
+                'duree_moyenne': values['duree_conv'] if not np.isnan(values['duree_conv']) else 0,
+            }
+    values['total_volume'] = kpis.get('total_volume', 0)
+    values['taux_resolution'] = kpis.get('taux_resolution', 0)
+    values['duree_moyenne'] = kpis.get('duree_moyenne', 0)
+
+    agents_traites = None if agents_data.empty else _column(agents_data, 'appels_traites')
+    if agents_traites is not None and len(agents_traites) > 1:
+        values['cv_agents'] = np.nanstd(agents_traites, ddof=1) / np.nanmean(agents_traites)
+
+    vector = np.array([round(float(values[name]), decimals) for name, decimals in METRICS.items()])
+    return {'values': vector, 'labels': labels}
+
+
+class RecommendationEngine:
+    """Moteur de règles pour les points clés, l'évolution de la résolution et les recommandations
+
+    Toutes les règles sont évaluées en une passe vectorisée sur le vecteur de
+    métriques. Les textes générés sont mis en cache par vecteur de métriques
+    (LRU de ``cache_size`` entrées) : un traitement par lots de rapports
+    similaires réutilise les textes déjà produits.
+    """
+
+    def __init__(self, rules: Optional[List[Dict]] = None, cache_size: int = 1024):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[tuple, Dict[str, List[str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Bornes des règles sous forme de tableaux, une ligne par règle
+        metric_index = {name: i for i, name in enumerate(METRICS)}
+        self._metric_idx = np.array([metric_index[rule['metric']] for rule in self.rules], dtype=np.intp)
+
+        def bounds(strict: str, loose: str, default: float):
+            threshold = [rule[strict] if rule[strict] is not None else rule[loose] for rule in self.rules]
+            return (np.array([default if t is None else t for t in threshold], dtype='float64'),
+                    np.array([rule[strict] is not None for rule in self.rules]))
+
+        self._lower, self._lower_strict = bounds('gt', 'ge', -np.inf)
+        self._upper, self._upper_strict = bounds('lt', 'le', np.inf)
+
+    def evaluate(self, metrics: Dict) -> Dict[str, List[str]]:
+        """Retourne les textes de chaque section pour un vecteur de métriques"""
+        key = (metrics['values'].tobytes(), tuple(sorted(metrics['labels'].items())))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return {section: list(lines) for section, lines in self._cache[key].items()}
+
+        texts = self._generate(metrics)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = texts
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return {section: list(lines) for section, lines in texts.items()}
+
+    def _generate(self, metrics: Dict) -> Dict[str, List[str]]:
+        """Évalue toutes les règles en une passe puis formate les textes retenus"""
+        values = metrics['values'][self._metric_idx]
+        with np.errstate(invalid='ignore'):
+            fired = (
+                ~np.isnan(values)
+                & np.where(self._lower_strict, values > self._lower, values >= self._lower)
+                & np.where(self._upper_strict, values < self._upper, values <= self._upper)
+            )
+
+        fields = dict(zip(METRICS, metrics['values'].tolist()), **metrics['labels'])
+        texts = {section: [] for section in SECTIONS}
+        for i in np.flatnonzero(fired):
+            rule = self.rules[i]
+            texts[rule['section']].append(rule['text'].format(**fields))
+
+        if not texts['recommendations']:
+            texts['recommendations'] = list(FALLBACK_RECOMMENDATIONS)
+        return texts
+
+
+# Moteur partagé par les générateurs du processus (cache commun)
+DEFAULT_ENGINE = RecommendationEngine()
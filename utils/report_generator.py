@@ -0,0 +1,1346 @@
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.enum.text import PP_ALIGN
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import io
+import base64
+import copy
+import hashlib
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import tempfile
+import os
+
+from .recommendations import DEFAULT_ENGINE, RecommendationEngine, compute_metrics, metric_value
+from .rollup import RollupCube, rollup_for
+from .staffing import ANSWER_TIME_TARGET, MAX_AGENTS, SERVICE_LEVEL_TARGET, staffing_table
+from .tracing import traced
+
+# Decks maîtres chargés une fois par processus, conservés sous forme de bytes
+# (clé : chemin du template et date de modification, ou None pour le deck intégré)
+_MASTER_TEMPLATES: Dict[tuple, bytes] = {}
+_MASTER_TEMPLATES_LOCK = threading.Lock()
+
+# Graphiques insérés dans le deck : nom de la figure -> taille de la zone (pouces)
+CHART_SLOTS = {
+    'volume_calls': (8, 4),
+    'staffing': (8, 3.4),
+}
+
+# Résolution de rendu des graphiques en image
+CHART_DPI = 120
+
+# Images préparées pour l'insertion (redimensionnées et réencodées), partagées
+# par toutes les présentations du processus. Clé : empreinte SHA-1 de l'image
+# source, taille cible en pixels et qualité ; LRU limitée à IMAGE_CACHE_SIZE.
+_PREPARED_IMAGES: 'OrderedDict[tuple, bytes]' = OrderedDict()
+_PREPARED_IMAGES_LOCK = threading.Lock()
+IMAGE_CACHE_SIZE = 256
+
+# Hauteur d'une ligne des tableaux natifs ; un tableau dont les lignes ne
+# tiennent pas dans sa zone se poursuit sur des slides de continuation
+TABLE_ROW_HEIGHT = Inches(0.3)
+
+# Colonnes du tableau des agents : colonne -> (en-tête, décimales ou None pour du texte)
+AGENTS_TABLE_COLUMNS = {
+    'agent': ('Agent', None),
+    'appels_presentes': ('Appels présentés', 0),
+    'appels_traites': ('Appels traités', 0),
+    'performance': ('Performance (%)', 1),
+}
+
+# Colonnes du tableau de dimensionnement : colonne -> (libellé, décimales)
+STAFFING_TABLE_COLUMNS = {
+    'trafic_erlangs': ('Trafic (Erlangs)', 2),
+    'agents_requis': ('Agents requis', 0),
+    'nb_agents_max': ('Agents constatés', 0),
+    'niveau_service': ('Niveau de service (%)', 1),
+    'occupation_requise': ('Occupation requise (%)', 1),
+}
+
+# Taille des blocs produits lors de l'écriture en flux d'une présentation
+PPTX_CHUNK_SIZE = 1024 * 1024
+
+
+_chart_rendering_warned = threading.Event()
+
+
+def _warn_chart_rendering_unavailable(error: Exception):
+    """Signale une seule fois par processus l'échec du rendu PNG des graphiques"""
+    if not _chart_rendering_warned.is_set():
+        _chart_rendering_warned.set()
+        print(f"⚠️ Rendu des graphiques impossible, zones texte à la place "
+              f"(installez kaleido et Chrome : plotly_get_chrome) : {error}", flush=True)
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Fichier en écriture seule qui transmet les blocs écrits à une file bornée
+    
+    La file étant bornée, l'écriture de la présentation avance au rythme du
+    consommateur : seuls quelques blocs sont en mémoire à un instant donné.
+    """
+    
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event,
+                 chunk_size: int = PPTX_CHUNK_SIZE):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._chunk_size = chunk_size
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        # Écriture partielle au-delà d'un bloc : BufferedWriter renvoie la suite
+        data = bytes(memoryview(data)[:self._chunk_size])
+        self.put(data)
+        return len(data)
+    
+    def put(self, item):
+        """Dépose un élément dans la file, sauf si le consommateur a abandonné le flux"""
+        while True:
+            if self._cancelled.is_set():
+                raise OSError("Flux de sortie fermé par le consommateur")
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+class _TemplateValues(dict):
+    """Valeurs de remplissage laissant intacts les champs non fournis (ex. {item})"""
+    
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+class PowerPointReportGenerator:
+    """Générateur de rapports PowerPoint automatisés"""
+    
+    def __init__(self, use_template: bool = False, template_path: Optional[str] = None,
+                 max_workers: int = 4, recommendation_engine: Optional[RecommendationEngine] = None,
+                 image_dpi: int = 150, image_quality: int = 85):
+        # Nombre de threads pour préparer le contenu des slides (1 = séquentiel)
+        self.max_workers = max_workers
+        # Moteur de règles des textes d'analyse (cache partagé par défaut)
+        self.recommendation_engine = recommendation_engine or DEFAULT_ENGINE
+        # Images insérées : résolution cible dans la slide et qualité JPEG
+        self.image_dpi = image_dpi
+        self.image_quality = image_quality
+        # En mode template, chaque rapport est un clone du deck maître dont on
+        # remplit les zones nommées au lieu de recréer toutes les formes
+        self.use_template = use_template or template_path is not None
+        self.template_path = template_path
+        self.colors = {
+            'primary': RGBColor(52, 152, 219),      # Bleu
+            'secondary': RGBColor(46, 204, 113),     # Vert
+            'accent': RGBColor(231, 76, 60),         # Rouge
+            'warning': RGBColor(243, 156, 18),       # Orange
+            'dark': RGBColor(52, 73, 94),            # Gris foncé
+            'light': RGBColor(236, 240, 241)         # Gris clair
+        }
+        
+    @traced('generator')
+    def create_presentation(self, parsed_data: Dict, figures: Dict) -> Presentation:
+        """Crée une présentation PowerPoint complète
+        
+        Le travail coûteux (rendu des graphiques, KPIs, analyses textuelles)
+        est d'abord exécuté en parallèle par ``_prepare_slide_content`` ;
+        l'assemblage python-pptx qui suit est une étape séquentielle peu
+        coûteuse qui garantit l'ordre des slides.
+        """
+        content = self._prepare_slide_content(parsed_data, figures)
+        
+        if self.use_template:
+            return self._create_presentation_from_template(parsed_data, figures, content)
+        return self._assemble_presentation(parsed_data, figures, content)
+    
+    @traced('generator')
+    def create_agent_presentations(self, parsed_data: Dict, figures: Dict, output_dir: str,
+                                   agents: Optional[List[str]] = None) -> Dict:
+        """Génère le rapport du site et une présentation par agent dans ``output_dir``
+        
+        Le contenu commun (KPIs, tendances, graphiques, tableaux) est calculé une
+        seule fois et les slides communes sont assemblées une seule fois dans un
+        deck de base. Chaque deck agent est un clone de ce deck dont seule la
+        fiche agent est remplie ; les clones sont produits en parallèle
+        (``max_workers`` threads). ``agents`` restreint la génération à
+        certains agents.
+        
+        Retourne ``{'site': chemin, 'agents': {agent: chemin}}``.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        content = self._prepare_slide_content(parsed_data, figures)
+        
+        if self.use_template:
+            site_prs = self._create_presentation_from_template(parsed_data, figures, content)
+        else:
+            site_prs = self._assemble_presentation(parsed_data, figures, content)
+        site_path = self.save_presentation(site_prs, "rapport_site.pptx", output_dir)
+        
+        records = self._build_agent_records(parsed_data.get('agents_data', pd.DataFrame()))
+        if agents is not None:
+            selected = set(agents)
+            records = [record for record in records if record['agent'] in selected]
+        if not records:
+            return {'site': site_path, 'agents': {}}
+        
+        base_deck = self._build_agent_base_deck(parsed_data, figures, content)
+        file_names = self._agent_file_names([record['agent'] for record in records])
+        
+        def render(record: Dict, file_name: str) -> str:
+            prs = Presentation(io.BytesIO(base_deck))
+            for shape in prs.slides[1].shapes:
+                if shape.has_text_frame:
+                    self._fill_template_text(shape, record)
+            return self.save_presentation(prs, file_name, output_dir)
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            paths = list(executor.map(render, records, file_names))
+        
+        return {'site': site_path, 'agents': {record['agent']: path for record, path in zip(records, paths)}}
+    
+    def _assemble_presentation(self, parsed_data: Dict, figures: Dict, content: Dict) -> Presentation:
+        """Assemble les slides du rapport à partir du contenu préparé"""
+        prs = Presentation()
+        
+        # Slide 1: Page de titre
+        self._create_title_slide(prs, parsed_data, content)
+        
+        # Slide 2: Résumé exécutif
+        self._create_executive_summary_slide(prs, parsed_data, content)
+        
+        # Slide 3: Analyse mensuelle
+        self._create_monthly_analysis_slide(prs, parsed_data, figures, content)
+        
+        # Slide 4: Performance des agents
+        self._create_agents_performance_slide(prs, parsed_data, figures, content)
+        
+        # Slide 5: Tendances et KPIs
+        self._create_kpi_trends_slide(prs, parsed_data, figures, content)
+        
+        # Slide 6: Dimensionnement des effectifs (si volumes et durées sont connus)
+        if content['staffing'] is not None:
+            self._create_staffing_slide(prs, parsed_data, figures, content)
+        
+        # Slide 7: Analyse de la résolution
+        self._create_resolution_analysis_slide(prs, parsed_data, content)
+        
+        # Slide 8: Recommandations
+        self._create_recommendations_slide(prs, parsed_data, content)
+        
+        return prs
+    
+    def _build_agent_base_deck(self, parsed_data: Dict, figures: Dict, content: Dict) -> bytes:
+        """Deck commun des présentations agent, fiche agent en slide 2 (champs ``{nom}``)"""
+        prs = Presentation()
+        self._create_title_slide(prs, parsed_data, content)
+        self._add_agent_slide(prs)
+        self._create_executive_summary_slide(prs, parsed_data, content)
+        self._create_monthly_analysis_slide(prs, parsed_data, figures, content)
+        self._create_kpi_trends_slide(prs, parsed_data, figures, content)
+        self._create_resolution_analysis_slide(prs, parsed_data, content)
+        self._create_recommendations_slide(prs, parsed_data, content)
+        
+        buffer = io.BytesIO()
+        self.write_presentation(prs, buffer)
+        return buffer.getvalue()
+    
+    def _add_agent_slide(self, prs: Presentation):
+        """Ajoute la fiche agent : indicateurs de l'agent et comparaison avec le site"""
+        slide = self._add_blank_title_slide(prs, "Fiche Agent : {agent}")
+        
+        items = [
+            ("Appels Présentés", "{appels_presentes}", self.colors['primary']),
+            ("Appels Traités", "{appels_traites}", self.colors['secondary']),
+            ("Taux de Traitement", "{taux_traitement}%", self.colors['warning']),
+            ("Classement", "{rang} / {nb_agents}", self.colors['accent'])
+        ]
+        for i, (label, value, color) in enumerate(items):
+            self._add_metric_box(slide, i, label, value, color)
+        
+        comparison_box = slide.shapes.add_textbox(Inches(1), Inches(3.5), Inches(8), Inches(3))
+        tf = comparison_box.text_frame
+        tf.text = "Comparaison avec le site:"
+        for line in (
+            "Moyenne du site : {moyenne_traites} appels traités par agent",
+            "Écart à la moyenne : {ecart_moyenne}%",
+            "Taux de traitement du site : {taux_site}%",
+        ):
+            p = tf.add_paragraph()
+            p.text = f"• {line}"
+            p.level = 1
+            p.font.size = Pt(12)
+        return slide
+    
+    def _build_agent_records(self, agents_data: pd.DataFrame) -> List[Dict[str, str]]:
+        """Valeurs formatées de la fiche de chaque agent, calculées pour tous les agents à la fois"""
+        if agents_data.empty or 'agent' not in agents_data:
+            return []
+        
+        def numeric(column: str) -> pd.Series:
+            if column not in agents_data:
+                return pd.Series(np.nan, index=agents_data.index)
+            return pd.to_numeric(agents_data[column], errors='coerce').astype('float64')
+        
+        presentes = numeric('appels_presentes')
+        traites = numeric('appels_traites')
+        taux = (traites / presentes.where(presentes > 0)) * 100
+        moyenne = traites.mean()
+        ecart = (traites / moyenne - 1) * 100 if moyenne else pd.Series(np.nan, index=agents_data.index)
+        total_presentes = presentes.sum()
+        taux_site = traites.sum() / total_presentes * 100 if total_presentes else np.nan
+        
+        sign = np.where(ecart > 0, '+', '')
+        frame = pd.DataFrame({
+            'agent': agents_data['agent'].astype(str).to_numpy(dtype=object),
+            'appels_presentes': self._format_french_numbers(presentes),
+            'appels_traites': self._format_french_numbers(traites),
+            'taux_traitement': self._format_french_numbers(taux, 1),
+            'rang': self._format_french_numbers(traites.rank(ascending=False, method='min')),
+            'ecart_moyenne': sign + self._format_french_numbers(ecart, 1),
+        })
+        frame['nb_agents'] = str(len(agents_data))
+        frame['moyenne_traites'] = self._format_french_numbers([moyenne], 1)[0]
+        frame['taux_site'] = self._format_french_numbers([taux_site], 1)[0]
+        return frame.to_dict('records')
+    
+    def _agent_file_names(self, agents: List[str]) -> List[str]:
+        """Noms de fichier des decks agent, sans caractère spécial ni doublon"""
+        file_names, used = [], set()
+        for agent in agents:
+            slug = re.sub(r'[^\w-]+', '_', agent).strip('_') or 'agent'
+            file_name, suffix = f"rapport_agent_{slug}.pptx", 2
+            while file_name in used:
+                file_name = f"rapport_agent_{slug}_{suffix}.pptx"
+                suffix += 1
+            used.add(file_name)
+            file_names.append(file_name)
+        return file_names
+    
+    @traced('generator')
+    def _prepare_slide_content(self, parsed_data: Dict, figures: Dict) -> Dict:
+        """Calcule le contenu de toutes les slides, en parallèle si ``max_workers`` > 1
+        
+        Les tâches sont indépendantes et leurs résultats sont rangés par clé :
+        l'ordre d'achèvement n'a aucune influence sur la présentation produite.
+        """
+        monthly_data = parsed_data.get('monthly_data', pd.DataFrame())
+        agents_data = parsed_data.get('agents_data', pd.DataFrame())
+        rollup = rollup_for(parsed_data)
+        kpis = self._calculate_executive_kpis(monthly_data, agents_data, rollup)
+        
+        # Textes d'analyse : une évaluation des règles, mise en cache par métriques
+        metrics = compute_metrics(monthly_data, agents_data, kpis)
+        texts = self.recommendation_engine.evaluate(metrics)
+        
+        tasks = {
+            'monthly_table': (self._build_monthly_table, monthly_data),
+            'top_agent': (self._find_top_agent, agents_data, rollup),
+            'agents_table': (self._build_agents_table, agents_data),
+            'staffing': (self._prepare_staffing_content, monthly_data),
+        }
+        for name, (width, height) in CHART_SLOTS.items():
+            if name in figures:
+                tasks[f'chart_{name}'] = (self._render_chart_image, figures[name], width, height)
+        
+        if self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {key: executor.submit(func, *args) for key, (func, *args) in tasks.items()}
+                content = {key: future.result() for key, future in futures.items()}
+        else:
+            content = {key: func(*args) for key, (func, *args) in tasks.items()}
+        
+        content['kpis'] = kpis
+        content['period'] = self._format_period(monthly_data)
+        content['key_points'] = texts['key_points']
+        content['recommendations'] = texts['recommendations']
+        content['resolution'] = self._prepare_resolution_content(metrics, texts)
+        return content
+    
+    def _render_chart_image(self, figure: go.Figure, width: float, height: float) -> Optional[bytes]:
+        """Rend une figure Plotly en PNG à la taille de sa zone (None si impossible)"""
+        try:
+            return pio.to_image(figure, format='png',
+                                width=int(width * CHART_DPI), height=int(height * CHART_DPI))
+        except Exception as e:
+            # Le rendu statique nécessite kaleido (et Chrome) : repli sur une zone texte
+            _warn_chart_rendering_unavailable(e)
+            return None
+    
+    def _format_period(self, monthly_data: pd.DataFrame) -> str:
+        """Période couverte par le rapport"""
+        if not monthly_data.empty and 'mois' in monthly_data:
+            first_month = monthly_data['mois'].iloc[0]
+            last_month = monthly_data['mois'].iloc[-1]
+            return f"Période: {first_month} - {last_month} 2025"
+        return "Période: 2025"
+    
+    def _find_top_agent(self, agents_data: pd.DataFrame, rollup: Optional[RollupCube] = None) -> Optional[str]:
+        """Agent ayant traité le plus d'appels"""
+        if agents_data.empty or 'appels_traites' not in agents_data or 'agent' not in agents_data:
+            return None
+        rollup = rollup or RollupCube.from_parsed({'agents_data': agents_data})
+        return rollup.top_agent('appels_traites')
+    
+    def _build_agents_table(self, agents_data: pd.DataFrame) -> Optional[Dict]:
+        """Tableau des agents : une ligne par agent, colonnes formatées d'un bloc"""
+        if agents_data.empty or 'agent' not in agents_data:
+            return None
+        
+        header, columns, numeric = [], [], []
+        for column, (label, decimals) in AGENTS_TABLE_COLUMNS.items():
+            if column not in agents_data:
+                continue
+            header.append(label)
+            if decimals is None:
+                columns.append(agents_data[column].astype(str).to_numpy(dtype=object))
+            else:
+                columns.append(self._format_french_numbers(agents_data[column], decimals))
+            numeric.append(decimals is not None)
+        
+        return {'header': header, 'cells': np.column_stack(columns), 'numeric': numeric}
+    
+    def _prepare_staffing_content(self, monthly_data: pd.DataFrame) -> Optional[Dict]:
+        """Effectif requis par mois (Erlang C) : tableau et constats (None sans volumes ni durées)"""
+        staffing = staffing_table(monthly_data)
+        if staffing.empty:
+            return None
+        unreachable = staffing['objectif_inatteignable'].to_numpy(dtype=bool)
+        if staffing['agents_requis'].isna().all() and not unreachable.any():
+            return None
+        
+        columns = [(column, label, decimals) for column, (label, decimals) in STAFFING_TABLE_COLUMNS.items()
+                   if column in staffing]
+        months = staffing['mois'].astype(str).tolist()
+        # Une ligne par mois : les longs historiques se poursuivent sur des slides de continuation
+        values = np.column_stack([self._format_french_numbers(staffing[column], decimals)
+                                  for column, _, decimals in columns])
+        # Objectif inatteignable : effectif requis au-delà de la borne de recherche
+        values[unreachable, [column for column, _, _ in columns].index('agents_requis')] = \
+            f"> {self._format_french_numbers([MAX_AGENTS])[0]}"
+        
+        summary = [
+            f"Objectif : {SERVICE_LEVEL_TARGET * 100:.0f} % des appels décrochés en moins de {ANSWER_TIME_TARGET} s",
+        ]
+        if staffing['agents_requis'].notna().any():
+            peak = staffing['agents_requis'].idxmax()
+            summary.append(f"Besoin maximal : {staffing.at[peak, 'agents_requis']:.0f} agents ({months[peak]})")
+        if unreachable.any():
+            summary.append(f"Objectif inatteignable avec {MAX_AGENTS} agents : "
+                           f"{', '.join(np.array(months, dtype=object)[unreachable])}")
+        if 'ecart_agents' in staffing:
+            understaffed = staffing.loc[staffing['ecart_agents'] < 0, 'mois'].astype(str).tolist()
+            if understaffed:
+                summary.append(f"Sous-effectif sur {len(understaffed)} mois : {', '.join(understaffed)}")
+            elif staffing['ecart_agents'].notna().any() and not unreachable.any():
+                summary.append("Effectif constaté suffisant sur tous les mois renseignés")
+        
+        return {
+            'table': {
+                'header': ['Mois'] + [label for _, label, _ in columns],
+                'cells': np.column_stack([np.array(months, dtype=object), values]),
+                'numeric': [False] + [True] * len(columns),
+            },
+            'summary': summary,
+        }
+    
+    def _prepare_resolution_content(self, metrics: Dict, texts: Dict) -> Optional[Dict]:
+        """Taux de résolution global et évolution mensuelle"""
+        taux_global = metric_value(metrics, 'taux_global')
+        if np.isnan(taux_global):
+            return None
+        return {'taux_global': taux_global, 'evolution': texts['resolution_evolution']}
+    
+    def _create_presentation_from_template(self, parsed_data: Dict, figures: Dict,
+                                           content: Optional[Dict] = None) -> Presentation:
+        """Crée la présentation en clonant le deck maître et en remplissant ses zones nommées"""
+        content = content or self._prepare_slide_content(parsed_data, figures)
+        prs = Presentation(io.BytesIO(self.get_master_template_bytes()))
+        shapes = {
+            shape.name: shape
+            for slide in prs.slides for shape in slide.shapes
+            if shape.name.startswith('tpl_')
+        }
+        
+        monthly_data = parsed_data.get('monthly_data', pd.DataFrame())
+        kpis = content['kpis']
+        
+        # Slide 1: période et date de génération
+        self._fill_template_text(shapes.get('tpl_period'), {'period': content['period']})
+        self._fill_template_text(shapes.get('tpl_generated_on'), {
+            'generated_on': pd.Timestamp.now().strftime('%d/%m/%Y')
+        })
+        
+        # Slide 2: KPIs et points clés
+        for name, value in self._format_kpi_values(kpis).items():
+            self._fill_template_text(shapes.get(f'tpl_kpi_{name}'), {'value': value})
+        self._fill_template_list(shapes.get('tpl_key_points'), content['key_points'])
+        
+        # Slide 3: graphique et tableau mensuels
+        chart_shape = shapes.get('tpl_chart_volume_calls')
+        if 'volume_calls' not in figures:
+            self._remove_template_shape(chart_shape)
+        elif content.get('chart_volume_calls') and chart_shape is not None:
+            self.add_image(chart_shape.part.slide, content['chart_volume_calls'],
+                           chart_shape.left, chart_shape.top, chart_shape.width, chart_shape.height)
+            self._remove_template_shape(chart_shape)
+        self._replace_template_table(prs, shapes.get('tpl_monthly_table'), content['monthly_table'],
+                                     "Analyse Mensuelle des Performances", Pt(9))
+        
+        # Slide 4: top performer et liste des agents
+        if content['top_agent'] is not None:
+            self._fill_template_text(shapes.get('tpl_top_performer'), {'top_agent': content['top_agent']})
+        else:
+            self._remove_template_shape(shapes.get('tpl_top_performer'))
+        self._replace_template_table(prs, shapes.get('tpl_agents_table'), content['agents_table'],
+                                     "Performance Individuelle des Agents")
+        
+        # Slide 5: grille de KPIs
+        if not monthly_data.empty:
+            self._fill_template_text(shapes.get('tpl_kpi_grid'), self._format_kpi_grid_values(kpis))
+        else:
+            self._remove_template_shape(shapes.get('tpl_kpi_grid'))
+        
+        # Slide 6: dimensionnement (supprimée sans volumes ni durées, comme en mode assemblé)
+        staffing = content['staffing']
+        chart_shape = shapes.get('tpl_chart_staffing')
+        if staffing is None:
+            self._remove_template_slide(prs, shapes.get('tpl_staffing_summary'))
+        else:
+            if 'staffing' not in figures:
+                self._remove_template_shape(chart_shape)
+            elif content.get('chart_staffing') and chart_shape is not None:
+                self.add_image(chart_shape.part.slide, content['chart_staffing'],
+                               chart_shape.left, chart_shape.top, chart_shape.width, chart_shape.height)
+                self._remove_template_shape(chart_shape)
+            self._fill_template_list(shapes.get('tpl_staffing_summary'), staffing['summary'])
+            self._replace_template_table(prs, shapes.get('tpl_staffing_table'), staffing['table'],
+                                         "Dimensionnement des Effectifs", Pt(9))
+        
+        # Slide 7: résolution
+        resolution_shape = shapes.get('tpl_resolution_body')
+        resolution = content['resolution']
+        if resolution is not None:
+            self._fill_template_text(resolution_shape, {'taux_global': f"{resolution['taux_global']:.1f}"})
+            self._fill_template_list(resolution_shape, resolution['evolution'])
+        elif resolution_shape is not None:
+            resolution_shape.text_frame.clear()
+        
+        # Slide 8: recommandations
+        self._fill_template_list(shapes.get('tpl_recommendations'), content['recommendations'])
+        
+        return prs
+    
+    def get_master_template_bytes(self) -> bytes:
+        """Retourne le deck maître sous forme de bytes, chargé une seule fois par processus"""
+        if self.template_path:
+            key = (os.path.abspath(self.template_path), os.path.getmtime(self.template_path))
+        else:
+            key = None
+        
+        with _MASTER_TEMPLATES_LOCK:
+            if key not in _MASTER_TEMPLATES:
+                if self.template_path:
+                    with open(self.template_path, 'rb') as f:
+                        _MASTER_TEMPLATES[key] = f.read()
+                else:
+                    buffer = io.BytesIO()
+                    self.build_master_template().save(buffer)
+                    _MASTER_TEMPLATES[key] = buffer.getvalue()
+            return _MASTER_TEMPLATES[key]
+    
+    def build_master_template(self) -> Presentation:
+        """Construit le deck maître : formes statiques et zones nommées ``tpl_*``
+        
+        Les zones contiennent des champs ``{nom}`` remplacés à chaque rapport.
+        Pour les listes, le dernier paragraphe de la zone sert de modèle et
+        est dupliqué pour chaque élément. Le deck peut être enregistré puis
+        retouché dans PowerPoint et passé via ``template_path``, tant que les
+        noms de zones sont conservés.
+        """
+        prs = Presentation()
+        
+        # Slide 1: Page de titre
+        slide = prs.slides.add_slide(prs.slide_layouts[0])
+        slide.shapes.title.text = "Rapport de Performance Téléphonie"
+        slide.shapes.title.text_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        subtitle = slide.placeholders[1]
+        subtitle.text = "{period}\nAnalyse Automatisée"
+        subtitle.name = 'tpl_period'
+        date_shape = slide.shapes.add_textbox(Inches(7), Inches(6), Inches(2.5), Inches(0.5))
+        date_shape.name = 'tpl_generated_on'
+        date_shape.text_frame.text = "Généré le: {generated_on}"
+        date_shape.text_frame.paragraphs[0].font.size = Pt(10)
+        date_shape.text_frame.paragraphs[0].font.color.rgb = self.colors['dark']
+        
+        # Slide 2: Résumé exécutif
+        slide = self._add_template_title_slide(prs, "Résumé Exécutif")
+        self._add_kpi_boxes(slide, {}, template=True)
+        key_points = slide.shapes.add_textbox(Inches(1), Inches(3.5), Inches(8), Inches(3))
+        key_points.name = 'tpl_key_points'
+        key_points.text_frame.text = "Points Clés:"
+        self._add_template_list_item(key_points, font_size=Pt(12))
+        
+        # Slide 3: Analyse mensuelle
+        slide = self._add_blank_title_slide(prs, "Analyse Mensuelle des Performances")
+        self._add_chart_to_slide(slide, None, Inches(1), Inches(1.5), Inches(8), Inches(4))
+        slide.shapes[-1].name = 'tpl_chart_volume_calls'
+        # Les zones de tableau ne servent qu'à positionner le tableau natif
+        table_box = slide.shapes.add_textbox(Inches(1), Inches(6), Inches(8), Inches(1.5))
+        table_box.name = 'tpl_monthly_table'
+        
+        # Slide 4: Performance des agents
+        slide = self._add_blank_title_slide(prs, "Performance Individuelle des Agents")
+        highlight_box = slide.shapes.add_textbox(Inches(6), Inches(1.5), Inches(3), Inches(1.5))
+        highlight_box.name = 'tpl_top_performer'
+        hf = highlight_box.text_frame
+        hf.text = "Top Performer\n{top_agent}"
+        hf.paragraphs[0].font.size = Pt(16)
+        hf.paragraphs[0].font.bold = True
+        hf.paragraphs[0].font.color.rgb = self.colors['secondary']
+        agents_box = slide.shapes.add_textbox(Inches(1), Inches(3), Inches(8), Inches(3))
+        agents_box.name = 'tpl_agents_table'
+        
+        # Slide 5: Tendances et KPIs
+        slide = self._add_blank_title_slide(prs, "Indicateurs Clés et Tendances")
+        self._create_kpi_grid(slide, {}, template=True)
+        
+        # Slide 6: Dimensionnement des effectifs
+        slide = self._add_blank_title_slide(prs, "Dimensionnement des Effectifs")
+        self._add_chart_to_slide(slide, None, Inches(1), Inches(1.3), Inches(8), Inches(3.4))
+        slide.shapes[-1].name = 'tpl_chart_staffing'
+        summary = slide.shapes.add_textbox(Inches(1), Inches(4.8), Inches(8), Inches(0.8))
+        summary.name = 'tpl_staffing_summary'
+        summary.text_frame.text = "Dimensionnement (Erlang C):"
+        self._add_template_list_item(summary, font_size=Pt(11))
+        table_box = slide.shapes.add_textbox(Inches(1), Inches(5.7), Inches(8), Inches(1.8))
+        table_box.name = 'tpl_staffing_table'
+        
+        # Slide 7: Analyse de la résolution
+        slide = self._add_template_title_slide(prs, "Analyse de la Résolution")
+        body = slide.placeholders[1]
+        body.name = 'tpl_resolution_body'
+        body.text_frame.text = "Taux de Résolution Global: {taux_global}%"
+        self._add_template_list_item(body)
+        
+        # Slide 8: Recommandations
+        slide = self._add_template_title_slide(prs, "Recommandations")
+        body = slide.placeholders[1]
+        body.name = 'tpl_recommendations'
+        body.text_frame.text = "Actions Recommandées:"
+        self._add_template_list_item(body, font_size=Pt(12))
+        
+        # Les dispositions inutilisées alourdissent chaque clone : on les retire
+        used_layouts = {slide.slide_layout.part.partname for slide in prs.slides}
+        for layout in list(prs.slide_layouts):
+            if layout.part.partname not in used_layouts:
+                prs.slide_layouts.remove(layout)
+        
+        return prs
+    
+    def save_master_template(self, path: str):
+        """Enregistre le deck maître intégré pour personnalisation dans PowerPoint"""
+        self.build_master_template().save(path)
+    
+    def _add_template_title_slide(self, prs: Presentation, title_text: str):
+        """Ajoute une slide titre + contenu au deck maître"""
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = title_text
+        slide.shapes.title.text_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        return slide
+    
+    def _add_blank_title_slide(self, prs: Presentation, title_text: str, layout=None):
+        """Ajoute une slide vierge avec zone de titre"""
+        slide = prs.slides.add_slide(layout or prs.slide_layouts[6])
+        title_frame = slide.shapes.add_textbox(Inches(1), Inches(0.5), Inches(8), Inches(0.8)).text_frame
+        title_frame.text = title_text
+        title_frame.paragraphs[0].font.size = Pt(24)
+        title_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        title_frame.paragraphs[0].font.bold = True
+        return slide
+    
+    def _add_template_list_item(self, shape, font_size=None):
+        """Ajoute le paragraphe modèle « • {item} » d'une liste du deck maître"""
+        p = shape.text_frame.add_paragraph()
+        p.text = "• {item}"
+        p.level = 1
+        if font_size:
+            p.font.size = font_size
+    
+    def _fill_template_text(self, shape, values: Dict):
+        """Remplace les champs {nom} des runs d'une zone du template"""
+        if shape is None:
+            return
+        for paragraph in shape.text_frame.paragraphs:
+            for run in paragraph.runs:
+                if '{' in run.text:
+                    run.text = run.text.format_map(_TemplateValues(values))
+    
+    def _fill_template_list(self, shape, items: List[str]):
+        """Duplique le paragraphe modèle (dernier paragraphe) pour chaque élément"""
+        if shape is None:
+            return
+        item_p = shape.text_frame.paragraphs[-1]._p
+        for item in items:
+            new_p = copy.deepcopy(item_p)
+            item_p.addprevious(new_p)
+            for text in new_p.iter('{http://schemas.openxmlformats.org/drawingml/2006/main}t'):
+                if '{item}' in text.text:
+                    text.text = text.text.replace('{item}', str(item))
+        item_p.getparent().remove(item_p)
+    
+    def _replace_template_table(self, prs: Presentation, shape, table: Optional[Dict],
+                                continuation_title: str, font_size=Pt(10)):
+        """Remplace une zone de tableau du template par le tableau natif de même géométrie"""
+        if shape is None:
+            return
+        if table is not None:
+            self._add_table(prs, shape.part.slide, table, shape.left, shape.top, shape.width,
+                            shape.height, continuation_title, font_size)
+        self._remove_template_shape(shape)
+    
+    def _remove_template_shape(self, shape):
+        """Supprime une zone du template sans donnée à afficher"""
+        if shape is not None:
+            element = shape._element
+            element.getparent().remove(element)
+    
+    def _remove_template_slide(self, prs: Presentation, shape):
+        """Supprime du deck la slide du template qui porte la zone ``shape``"""
+        if shape is None:
+            return
+        slide_ids = prs.slides._sldIdLst
+        for slide_id in slide_ids:
+            if prs.slides.get(slide_id.id) is shape.part.slide:
+                # La relation supprimée, la slide n'est plus écrite à l'enregistrement
+                prs.part.drop_rel(slide_id.rId)
+                slide_ids.remove(slide_id)
+                return
+    
+    def _format_kpi_values(self, kpis: Dict) -> Dict[str, str]:
+        """Formate les valeurs des boîtes KPI du résumé exécutif"""
+        return {
+            'total_volume': f"{kpis.get('total_volume', 0):,.0f}",
+            'taux_resolution': f"{kpis.get('taux_resolution', 0):.1f}%",
+            'duree_moyenne': f"{kpis.get('duree_moyenne', 0):.1f} min",
+            'nb_agents': f"{kpis.get('nb_agents', 0)}"
+        }
+    
+    def _format_kpi_grid_values(self, kpis: Dict) -> Dict[str, str]:
+        """Formate les valeurs de la grille de KPIs"""
+        return {
+            'total_volume': f"{kpis.get('total_volume', 0):,}",
+            'taux_resolution': f"{kpis.get('taux_resolution', 0):.1f}",
+            'duree_moyenne': f"{kpis.get('duree_moyenne', 0):.1f}",
+            'periode_couverte': f"{kpis.get('periode_couverte', 0)}",
+            'nb_agents': f"{kpis.get('nb_agents', 0)}"
+        }
+    
+    def _build_monthly_table(self, data: pd.DataFrame) -> Optional[Dict]:
+        """Tableau mensuel : une ligne par mois, une colonne par indicateur"""
+        metrics = [(column, label) for column, label in
+                   (('appels_traites', 'Appels Traités'), ('appels_presentes', 'Appels Présentés'))
+                   if column in data]
+        if data.empty or not metrics:
+            return None
+        
+        if 'mois' in data:
+            months = data['mois'].astype(str).tolist()
+        else:
+            months = [str(i) for i in range(1, len(data) + 1)]
+        
+        values = [self._format_french_numbers(data[column]) for column, _ in metrics]
+        return {
+            'header': ['Mois'] + [label for _, label in metrics],
+            'cells': np.column_stack([np.array(months, dtype=object), *values]),
+            'numeric': [False] + [True] * len(metrics),
+        }
+    
+    def _format_french_numbers(self, values, decimals: int = 0) -> np.ndarray:
+        """Formate une série de nombres à la française (« 1 234,5 »), colonne entière à la fois"""
+        numbers = pd.to_numeric(pd.Series(values), errors='coerce').astype('float64').reset_index(drop=True)
+        scale = 10 ** decimals
+        scaled = (numbers.fillna(0).abs() * scale).round().astype('int64')
+        
+        # Séparateur de milliers : espace insécable
+        text = (scaled // scale).astype(str).str.replace(r'\B(?=(\d{3})+(?!\d))', '\u00a0', regex=True)
+        if decimals:
+            text = text + ',' + (scaled % scale).astype(str).str.zfill(decimals)
+        text = text.where(~((numbers < 0) & (scaled > 0)), '-' + text)
+        return text.where(numbers.notna(), 'N/A').to_numpy(dtype=object)
+    
+    @traced('generator')
+    def _create_title_slide(self, prs: Presentation, data: Dict, content: Optional[Dict] = None):
+        """Crée la slide de titre"""
+        content = content or self._prepare_slide_content(data, {})
+        title_slide_layout = prs.slide_layouts[0]
+        slide = prs.slides.add_slide(title_slide_layout)
+        
+        title = slide.shapes.title
+        subtitle = slide.placeholders[1]
+        
+        title.text = "Rapport de Performance Téléphonie"
+        title.text_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        
+        subtitle.text = f"{content['period']}\nAnalyse Automatisée"
+        
+        # Ajouter la date de génération
+        date_shape = slide.shapes.add_textbox(
+            Inches(7), Inches(6), Inches(2.5), Inches(0.5)
+        )
+        date_frame = date_shape.text_frame
+        date_frame.text = f"Généré le: {pd.Timestamp.now().strftime('%d/%m/%Y')}"
+        date_frame.paragraphs[0].font.size = Pt(10)
+        date_frame.paragraphs[0].font.color.rgb = self.colors['dark']
+    
+    @traced('generator')
+    def _create_executive_summary_slide(self, prs: Presentation, data: Dict, content: Optional[Dict] = None):
+        """Crée le résumé exécutif"""
+        content = content or self._prepare_slide_content(data, {})
+        bullet_slide_layout = prs.slide_layouts[1]
+        slide = prs.slides.add_slide(bullet_slide_layout)
+        
+        title = slide.shapes.title
+        title.text = "Résumé Exécutif"
+        title.text_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        
+        # Créer les zones de texte pour les KPIs
+        self._add_kpi_boxes(slide, content['kpis'])
+        
+        # Points clés
+        content_box = slide.shapes.add_textbox(
+            Inches(1), Inches(3.5), Inches(8), Inches(3)
+        )
+        
+        tf = content_box.text_frame
+        tf.text = "Points Clés:"
+        
+        for point in content['key_points']:
+            p = tf.add_paragraph()
+            p.text = f"• {point}"
+            p.level = 1
+            p.font.size = Pt(12)
+    
+    @traced('generator')
+    def _create_monthly_analysis_slide(self, prs: Presentation, data: Dict, figures: Dict,
+                                       content: Optional[Dict] = None):
+        """Crée l'analyse mensuelle"""
+        content = content or self._prepare_slide_content(data, figures)
+        blank_slide_layout = prs.slide_layouts[6]
+        slide = prs.slides.add_slide(blank_slide_layout)
+        
+        # Titre
+        title_shape = slide.shapes.add_textbox(
+            Inches(1), Inches(0.5), Inches(8), Inches(0.8)
+        )
+        title_frame = title_shape.text_frame
+        title_frame.text = "Analyse Mensuelle des Performances"
+        title_frame.paragraphs[0].font.size = Pt(24)
+        title_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        title_frame.paragraphs[0].font.bold = True
+        
+        # Graphique principal (si disponible)
+        if 'volume_calls' in figures:
+            self._add_chart_to_slide(slide, figures['volume_calls'], 
+                                   Inches(1), Inches(1.5), Inches(8), Inches(4),
+                                   image=content.get('chart_volume_calls'))
+        
+        # Tableau de données
+        if content['monthly_table'] is not None:
+            self._add_table(prs, slide, content['monthly_table'],
+                            Inches(1), Inches(6), Inches(8), Inches(1.5),
+                            "Analyse Mensuelle des Performances", Pt(9))
+    
+    @traced('generator')
+    def _create_agents_performance_slide(self, prs: Presentation, data: Dict, figures: Dict,
+                                         content: Optional[Dict] = None):
+        """Crée l'analyse des agents"""
+        content = content or self._prepare_slide_content(data, figures)
+        blank_slide_layout = prs.slide_layouts[6]
+        slide = prs.slides.add_slide(blank_slide_layout)
+        
+        # Titre
+        title_shape = slide.shapes.add_textbox(
+            Inches(1), Inches(0.5), Inches(8), Inches(0.8)
+        )
+        title_frame = title_shape.text_frame
+        title_frame.text = "Performance Individuelle des Agents"
+        title_frame.paragraphs[0].font.size = Pt(24)
+        title_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        title_frame.paragraphs[0].font.bold = True
+        
+        # Top performer
+        top_agent = content['top_agent']
+        if top_agent is not None:
+            highlight_box = slide.shapes.add_textbox(
+                Inches(6), Inches(1.5), Inches(3), Inches(1.5)
+            )
+            hf = highlight_box.text_frame
+            hf.text = f"Top Performer\n{top_agent}"
+            hf.paragraphs[0].font.size = Pt(16)
+            hf.paragraphs[0].font.bold = True
+            hf.paragraphs[0].font.color.rgb = self.colors['secondary']
+        
+        # Tableau des agents
+        if content['agents_table'] is not None:
+            self._add_table(prs, slide, content['agents_table'],
+                            Inches(1), Inches(3), Inches(8), Inches(3),
+                            "Performance Individuelle des Agents")
+    
+    @traced('generator')
+    def _create_kpi_trends_slide(self, prs: Presentation, data: Dict, figures: Dict,
+                                 content: Optional[Dict] = None):
+        """Crée l'analyse des tendances et KPIs"""
+        content = content or self._prepare_slide_content(data, figures)
+        blank_slide_layout = prs.slide_layouts[6]
+        slide = prs.slides.add_slide(blank_slide_layout)
+        
+        # Titre
+        title_shape = slide.shapes.add_textbox(
+            Inches(1), Inches(0.5), Inches(8), Inches(0.8)
+        )
+        title_frame = title_shape.text_frame
+        title_frame.text = "Indicateurs Clés et Tendances"
+        title_frame.paragraphs[0].font.size = Pt(24)
+        title_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        title_frame.paragraphs[0].font.bold = True
+        
+        # KPIs en colonnes
+        monthly_data = data.get('monthly_data', pd.DataFrame())
+        if not monthly_data.empty:
+            self._create_kpi_grid(slide, content['kpis'])
+    
+    @traced('generator')
+    def _create_staffing_slide(self, prs: Presentation, data: Dict, figures: Dict,
+                               content: Optional[Dict] = None):
+        """Crée le dimensionnement des effectifs : besoin Erlang C comparé à l'effectif constaté"""
+        content = content or self._prepare_slide_content(data, figures)
+        staffing = content['staffing']
+        slide = self._add_blank_title_slide(prs, "Dimensionnement des Effectifs")
+        
+        if 'staffing' in figures:
+            self._add_chart_to_slide(slide, figures['staffing'],
+                                     Inches(1), Inches(1.3), Inches(8), Inches(3.4),
+                                     image=content.get('chart_staffing'))
+        
+        summary_box = slide.shapes.add_textbox(Inches(1), Inches(4.8), Inches(8), Inches(0.8))
+        tf = summary_box.text_frame
+        tf.text = "Dimensionnement (Erlang C):"
+        for line in staffing['summary']:
+            p = tf.add_paragraph()
+            p.text = f"• {line}"
+            p.level = 1
+            p.font.size = Pt(11)
+        
+        self._add_table(prs, slide, staffing['table'],
+                        Inches(1), Inches(5.7), Inches(8), Inches(1.8),
+                        "Dimensionnement des Effectifs", Pt(9))
+    
+    @traced('generator')
+    def _create_resolution_analysis_slide(self, prs: Presentation, data: Dict, content: Optional[Dict] = None):
+        """Analyse de la résolution des appels"""
+        content = content or self._prepare_slide_content(data, {})
+        bullet_slide_layout = prs.slide_layouts[1]
+        slide = prs.slides.add_slide(bullet_slide_layout)
+        
+        title = slide.shapes.title
+        title.text = "Analyse de la Résolution"
+        title.text_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        
+        body = slide.placeholders[1]
+        tf = body.text_frame
+        
+        # Métriques de résolution
+        resolution = content['resolution']
+        if resolution is not None:
+            tf.text = f"Taux de Résolution Global: {resolution['taux_global']:.1f}%"
+            
+            # Analyse par période
+            for point in resolution['evolution']:
+                p = tf.add_paragraph()
+                p.text = f"• {point}"
+                p.level = 1
+    
+    @traced('generator')
+    def _create_recommendations_slide(self, prs: Presentation, data: Dict, content: Optional[Dict] = None):
+        """Crée les recommandations"""
+        content = content or self._prepare_slide_content(data, {})
+        bullet_slide_layout = prs.slide_layouts[1]
+        slide = prs.slides.add_slide(bullet_slide_layout)
+        
+        title = slide.shapes.title
+        title.text = "Recommandations"
+        title.text_frame.paragraphs[0].font.color.rgb = self.colors['primary']
+        
+        body = slide.placeholders[1]
+        tf = body.text_frame
+        
+        tf.text = "Actions Recommandées:"
+        
+        for rec in content['recommendations']:
+            p = tf.add_paragraph()
+            p.text = f"• {rec}"
+            p.level = 1
+            p.font.size = Pt(12)
+    
+    def _calculate_executive_kpis(self, monthly_data: pd.DataFrame, agents_data: pd.DataFrame,
+                                  rollup: Optional[RollupCube] = None) -> Dict:
+        """Calcule les KPIs pour le résumé exécutif (lus sur le cube d'agrégats)"""
+        kpis = {}
+        if rollup is None:
+            rollup = RollupCube.from_parsed({'monthly_data': monthly_data, 'agents_data': agents_data})
+        totals = rollup.totals()
+        
+        if not monthly_data.empty:
+            kpis['total_volume'] = totals['appels_presentes']
+            kpis['total_traites'] = totals['appels_traites']
+            kpis['taux_resolution'] = (kpis['total_traites'] / kpis['total_volume'] * 100) if kpis['total_volume'] > 0 else 0
+            # Durées stockées en secondes, présentées en minutes
+            kpis['duree_moyenne'] = totals['duree_moyenne_conv_s'] / 60 if 'duree_moyenne_conv_s' in monthly_data else 0
+            kpis['periode_couverte'] = len(monthly_data)
+        
+        if not agents_data.empty:
+            kpis['nb_agents'] = len(agents_data)
+            kpis['agent_top'] = rollup.top_agent('appels_traites') if 'agent' in agents_data and 'appels_traites' in agents_data else 'N/A'
+        
+        return kpis
+    
+    def _add_kpi_boxes(self, slide, kpis: Dict, template: bool = False):
+        """Ajoute les boîtes KPI à la slide (zones nommées ``{value}`` pour le deck maître)"""
+        values = self._format_kpi_values(kpis)
+        kpi_items = [
+            ("Volume Total", 'total_volume', self.colors['primary']),
+            ("Taux Résolution", 'taux_resolution', self.colors['secondary']),
+            ("Durée Moyenne", 'duree_moyenne', self.colors['warning']),
+            ("Agents Actifs", 'nb_agents', self.colors['accent'])
+        ]
+        
+        for i, (label, key, color) in enumerate(kpi_items):
+            if template:
+                value_box = self._add_metric_box(slide, i, label, "{value}", color)
+                value_box.name = f'tpl_kpi_{key}'
+            else:
+                self._add_metric_box(slide, i, label, values[key], color)
+    
+    def _add_metric_box(self, slide, position: int, label: str, value: str, color):
+        """Ajoute une boîte indicateur (valeur et label) en position ``position`` de la rangée
+        
+        Retourne la zone de texte de la valeur.
+        """
+        box_width = Inches(1.8)
+        box_height = Inches(1.2)
+        start_x = Inches(1)
+        start_y = Inches(1.5)
+        spacing = Inches(0.2)
+        x_pos = start_x + position * (box_width + spacing)
+        
+        # Boîte de fond
+        shape = slide.shapes.add_shape(
+            MSO_SHAPE.RECTANGLE, x_pos, start_y, box_width, box_height
+        )
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = self.colors['light']
+        shape.line.color.rgb = color
+        shape.line.width = Pt(2)
+        
+        # Texte de la valeur
+        value_box = slide.shapes.add_textbox(
+            x_pos, start_y + Inches(0.1), box_width, Inches(0.6)
+        )
+        vf = value_box.text_frame
+        vf.text = value
+        vf.paragraphs[0].alignment = PP_ALIGN.CENTER
+        vf.paragraphs[0].font.size = Pt(18)
+        vf.paragraphs[0].font.bold = True
+        vf.paragraphs[0].font.color.rgb = color
+        
+        # Texte du label
+        label_box = slide.shapes.add_textbox(
+            x_pos, start_y + Inches(0.7), box_width, Inches(0.4)
+        )
+        lf = label_box.text_frame
+        lf.text = label
+        lf.paragraphs[0].alignment = PP_ALIGN.CENTER
+        lf.paragraphs[0].font.size = Pt(10)
+        lf.paragraphs[0].font.color.rgb = self.colors['dark']
+        return value_box
+    
+    def _add_chart_to_slide(self, slide, figure: go.Figure, left, top, width, height,
+                            image: Optional[bytes] = None):
+        """Ajoute un graphique Plotly à la slide, sous forme d'image si elle a pu être rendue"""
+        if image:
+            self.add_image(slide, image, left, top, width, height)
+            return
+        
+        # Sans rendu statique disponible, on crée un placeholder
+        chart_box = slide.shapes.add_textbox(left, top, width, height)
+        cf = chart_box.text_frame
+        cf.text = "Graphique des performances mensuelles\n(Visualisation interactive disponible dans l'application)"
+        cf.paragraphs[0].alignment = PP_ALIGN.CENTER
+        cf.paragraphs[0].font.size = Pt(14)
+        cf.paragraphs[0].font.color.rgb = self.colors['dark']
+    
+    def add_image(self, slide, image: bytes, left, top, width, height):
+        """Insère une image dans la slide après l'avoir ajustée à la taille de sa zone
+        
+        L'image est réduite à la taille en pixels de la zone (``image_dpi``) et
+        réencodée (JPEG de qualité ``image_quality``, ou PNG si elle comporte
+        de la transparence). Le résultat est mis en cache par empreinte : une
+        même image (logo, graphique) n'est traitée qu'une fois et produit
+        toujours les mêmes octets, que python-pptx stocke une seule fois par
+        présentation quel que soit le nombre de slides qui l'utilisent.
+        """
+        prepared = self._prepare_image(image, width, height)
+        return slide.shapes.add_picture(io.BytesIO(prepared), left, top, width, height)
+    
+    def _prepare_image(self, image: bytes, width, height) -> bytes:
+        """Redimensionne et réencode une image pour une zone de ``width`` x ``height`` EMU"""
+        target = (max(1, round(width / 914400 * self.image_dpi)),
+                  max(1, round(height / 914400 * self.image_dpi)))
+        key = (hashlib.sha1(image).hexdigest(), target, self.image_quality)
+        
+        with _PREPARED_IMAGES_LOCK:
+            if key in _PREPARED_IMAGES:
+                _PREPARED_IMAGES.move_to_end(key)
+                return _PREPARED_IMAGES[key]
+        
+        prepared = self._encode_image(image, target)
+        
+        with _PREPARED_IMAGES_LOCK:
+            _PREPARED_IMAGES[key] = prepared
+            while len(_PREPARED_IMAGES) > IMAGE_CACHE_SIZE:
+                _PREPARED_IMAGES.popitem(last=False)
+        return prepared
+    
+    def _encode_image(self, image: bytes, target: tuple) -> bytes:
+        """Réduit l'image à la taille cible si elle est plus grande, puis la réencode
+        
+        L'image d'origine est conservée si le réencodage ne la rend pas plus légère.
+        """
+        from PIL import Image
+        
+        with Image.open(io.BytesIO(image)) as source:
+            img = source.convert('RGBA') if source.mode in ('RGBA', 'LA', 'P') else source.convert('RGB')
+        
+        resized = img.width > target[0] or img.height > target[1]
+        if resized:
+            # La zone étire l'image : inutile de conserver plus de pixels qu'elle n'en affiche
+            img = img.resize((min(img.width, target[0]), min(img.height, target[1])), Image.LANCZOS)
+        
+        output = io.BytesIO()
+        if img.mode == 'RGBA' and img.getextrema()[3][0] < 255:
+            img.save(output, format='PNG', optimize=True)
+        else:
+            img.convert('RGB').save(output, format='JPEG', quality=self.image_quality, optimize=True)
+        
+        encoded = output.getvalue()
+        if not resized and len(encoded) >= len(image):
+            return image
+        return encoded
+    
+    def _add_table(self, prs: Presentation, slide, table: Dict, left, top, width, height,
+                   continuation_title: str, font_size=Pt(10)):
+        """Ajoute un tableau natif, poursuivi sur des slides de continuation si besoin
+        
+        ``table`` contient l'en-tête, les cellules déjà formatées (tableau NumPy
+        lignes x colonnes) et les colonnes numériques à aligner à droite. Les
+        lignes qui ne tiennent pas dans la zone sont placées sur des slides
+        « (suite) » insérées juste après ``slide``, en-tête répété.
+        """
+        cells = table['cells']
+        rows_per_slide = max(1, int(height / TABLE_ROW_HEIGHT) - 1)
+        self._add_table_shape(slide, table['header'], cells[:rows_per_slide], table['numeric'],
+                              left, top, width, font_size)
+        
+        # Slides de continuation : zone pleine hauteur sous le titre
+        continuation_top = Inches(1.5)
+        continuation_rows = max(1, int((prs.slide_height - continuation_top - Inches(0.5)) / TABLE_ROW_HEIGHT) - 1)
+        for start in range(rows_per_slide, len(cells), continuation_rows):
+            slide = self._add_continuation_slide(prs, slide, f"{continuation_title} (suite)")
+            self._add_table_shape(slide, table['header'], cells[start:start + continuation_rows],
+                                  table['numeric'], left, continuation_top, width, font_size)
+    
+    def _add_table_shape(self, slide, header: List[str], cells: np.ndarray, numeric: List[bool],
+                         left, top, width, font_size):
+        """Crée la forme tableau et la remplit colonne par colonne"""
+        n_rows, n_cols = cells.shape[0] + 1, len(header)
+        shape = slide.shapes.add_table(n_rows, n_cols, left, top, width, TABLE_ROW_HEIGHT * n_rows)
+        table = shape.table
+        
+        for col_idx in range(n_cols):
+            column = [header[col_idx], *cells[:, col_idx]]
+            alignment = PP_ALIGN.RIGHT if numeric[col_idx] else PP_ALIGN.LEFT
+            for row_idx, text in enumerate(column):
+                paragraph = table.cell(row_idx, col_idx).text_frame.paragraphs[0]
+                paragraph.text = text
+                paragraph.font.size = font_size
+                paragraph.alignment = alignment
+        return shape
+    
+    def _add_continuation_slide(self, prs: Presentation, previous_slide, title_text: str):
+        """Insère une slide de continuation juste après ``previous_slide``"""
+        slide = self._add_blank_title_slide(prs, title_text, layout=previous_slide.slide_layout)
+        
+        # add_slide ajoute en fin de deck : on replace la slide à la bonne position
+        slide_ids = prs.slides._sldIdLst
+        slide_id = slide_ids[-1]
+        slide_ids.remove(slide_id)
+        slide_ids.insert(prs.slides.index(previous_slide) + 1, slide_id)
+        return slide
+    
+    def _create_kpi_grid(self, slide, kpis: Dict, template: bool = False):
+        """Crée une grille de KPIs (champs ``{nom}`` conservés pour le deck maître)"""
+        # Version simplifiée - utilise des zones de texte
+        y_pos = Inches(2)
+        
+        if template:
+            values = {key: '{' + key + '}' for key in self._format_kpi_grid_values({})}
+        else:
+            values = self._format_kpi_grid_values(kpis)
+        
+        kpi_text = f"""INDICATEURS CLÉS DE PERFORMANCE
+        
+• Volume Total Traité: {values['total_volume']} appels
+• Taux de Résolution: {values['taux_resolution']}%
+• Durée Moyenne: {values['duree_moyenne']} minutes
+• Période Analysée: {values['periode_couverte']} mois
+• Agents Actifs: {values['nb_agents']} agents
+        """
+        
+        grid_box = slide.shapes.add_textbox(Inches(1), y_pos, Inches(8), Inches(3))
+        if template:
+            grid_box.name = 'tpl_kpi_grid'
+        gf = grid_box.text_frame
+        gf.text = kpi_text
+        gf.paragraphs[0].font.size = Pt(14)
+        gf.paragraphs[0].font.bold = True
+        gf.paragraphs[0].font.color.rgb = self.colors['primary']
+        
+        # Ajouter des puces pour les autres paragraphes
+        for i in range(1, len(gf.paragraphs)):
+            gf.paragraphs[i].font.size = Pt(12)
+    
+    def save_presentation(self, prs: Presentation, filename: str = None,
+                          directory: Optional[str] = None) -> str:
+        """Sauvegarde la présentation et retourne le chemin
+        
+        Sans ``directory``, le fichier est écrit dans le répertoire temporaire
+        (déploiement web) ; il appartient alors à l'appelant de le supprimer.
+        """
+        if not filename:
+            filename = f"rapport_telephonie_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.pptx"
+        
+        filepath = os.path.join(directory or tempfile.gettempdir(), filename)
+        
+        self.write_presentation(prs, filepath)
+        return filepath
+    
+    @traced('generator')
+    def write_presentation(self, prs: Presentation, output):
+        """Écrit la présentation directement dans un chemin ou un objet fichier
+        
+        ``output`` peut être un fichier, une socket ou le corps d'une réponse
+        HTTP ouvert en écriture binaire ; il n'a pas besoin d'être seekable.
+        Chaque partie du paquet est compressée et écrite au fil de l'eau, sans
+        copie complète du fichier en mémoire ni fichier temporaire.
+        """
+        prs.save(output)
+    
+    def iter_presentation(self, prs: Presentation, chunk_size: int = PPTX_CHUNK_SIZE):
+        """Produit le fichier de la présentation par blocs d'environ ``chunk_size`` octets
+        
+        Destiné aux réponses HTTP en flux (itérable WSGI, ``StreamingResponse``...) :
+        l'écriture a lieu dans un thread et se met en pause tant que les blocs
+        précédents n'ont pas été consommés. Si l'itération est interrompue
+        (client déconnecté), l'écriture est abandonnée.
+        """
+        chunks = queue.Queue(maxsize=4)
+        cancelled = threading.Event()
+        writer = _ChunkWriter(chunks, cancelled, chunk_size)
+        
+        def produce():
+            try:
+                with io.BufferedWriter(writer, buffer_size=chunk_size) as output:
+                    self.write_presentation(prs, output)
+            except Exception as e:
+                if not cancelled.is_set():
+                    writer.put(e)
+            else:
+                writer.put(None)
+        
+        producer = threading.Thread(target=produce, name='pptx-writer', daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = chunks.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            producer.join()
+    
+    def get_presentation_bytes(self, prs: Presentation) -> bytes:
+        """Retourne la présentation sous forme de bytes pour téléchargement
+        
+        Le fichier complet est conservé en mémoire : pour les présentations
+        volumineuses, préférer ``write_presentation`` ou ``iter_presentation``.
+        """
+        temp_buffer = io.BytesIO()
+        self.write_presentation(prs, temp_buffer)
+        # getvalue() partage le buffer interne sans le copier
+        return temp_buffer.getvalue()
+
+# Fonctions utilitaires
+def create_sample_data() -> Dict:
+    """Données d'exemple au format du parser"""
+    return {
+        'monthly_data': pd.DataFrame({
+            'mois': ['Janvier', 'Février', 'Mars', 'Avril'],
+            'appels_presentes': [594, 554, 584, 641],
+            'appels_traites': [570, 543, 550, 626],
+            'duree_moyenne_conv_s': [331, 304, 308, 316],
+            'nb_agents_max': [3, 3, 2, 2]
+        }),
+        'agents_data': pd.DataFrame({
+            'agent': ['Fabienne Cocquart', 'Philippe Kubler'],
+            'appels_presentes': [594, 570],
+            'appels_traites': [570, 543]
+        })
+    }
+
+def create_sample_presentation() -> Presentation:
+    """Crée une présentation d'exemple"""
+    generator = PowerPointReportGenerator()
+    return generator.create_presentation(create_sample_data(), {})
+
+def format_number_french(number: float) -> str:
+    """Formate un nombre selon les conventions françaises"""
+    return f"{number:,.0f}".replace(',', ' ')
+
+def calculate_performance_score(taux_resolution: float, duree_moyenne: float, volume: int) -> float:
+    """Calcule un score de performance global"""
+    # Score basé sur différents critères (0-100)
+    score_resolution = min(taux_resolution, 100)
+    score_efficacite = max(0, 100 - (duree_moyenne - 3) * 10)  # Optimal à 3min
+    score_volume = min(volume / 10, 100)  # Score relatif au volume
+    
+    # Moyenne pondérée
+    score_global = (score_resolution * 0.5 + score_efficacite * 0.3 + score_volume * 0.2)
+    return max(0, min(100, score_global))
+
+if __name__ == "__main__":
+    # Test de création d'une présentation
+    sample_prs = create_sample_presentation()
+    print("Présentation d'exemple créée avec succès")
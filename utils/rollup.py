@@ -0,0 +1,243 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .batch import MONTH_ORDER, parsed_data_hash
+
+# Mesures additives du cube mensuel (site x mois x mesure). Les moyennes et
+# taux sont dérivés à la lecture de sommes, si bien que toute marge s'obtient
+# par une simple somme sur un axe.
+MONTH_MEASURES = (
+    'appels_presentes',
+    'appels_traites',
+    'duree_somme',          # somme des durées moyennes mensuelles renseignées (secondes)
+    'duree_mois',           # nombre de mois dont la durée est renseignée
+    'duree_ponderee',       # durée moyenne x appels traités
+    'traites_avec_duree',   # appels traités des mois dont la durée est renseignée
+    'nb_agents_max',
+    'agents_mois',          # nombre de mois dont l'effectif est renseigné
+    'nb_mois',
+)
+
+# Mesures du cube des agents (site x agent x mesure)
+AGENT_MEASURES = ('appels_presentes', 'appels_traites')
+
+_M = {name: i for i, name in enumerate(MONTH_MEASURES)}
+_A = {name: i for i, name in enumerate(AGENT_MEASURES)}
+
+# Lignes d'une table mensuelle sans colonne 'mois' : cumulées dans ce mois
+# plutôt qu'ignorées, pour que les totaux restent ceux de la table
+UNKNOWN_MONTH = 'Mois inconnu'
+
+# Cubes déjà construits, par empreinte des tables mensuelle et agents (LRU
+# partagée par tout le processus, limitée à CUBE_CACHE_SIZE cubes)
+_CUBES: 'OrderedDict[str, RollupCube]' = OrderedDict()
+_CUBES_LOCK = threading.Lock()
+CUBE_CACHE_SIZE = 64
+
+
+def _numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Colonne convertie en flottants (NaN si absente ou non numérique)"""
+    if column not in df:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+def _ratio(numerator: float, denominator: float, scale: float = 1.0) -> float:
+    return numerator / denominator * scale if denominator > 0 else np.nan
+
+
+def _month_labels(monthly: pd.DataFrame) -> List[str]:
+    """Mois de chaque ligne d'une table mensuelle (UNKNOWN_MONTH sans colonne 'mois')"""
+    if 'mois' in monthly:
+        return [str(month) for month in monthly['mois']]
+    return [UNKNOWN_MONTH] * len(monthly)
+
+
+class RollupCube:
+    """Agrégats matérialisés d'un ou plusieurs rapports
+
+    Deux tableaux NumPy sont construits une fois par jeu de données :
+    ``monthly`` (site x mois x mesure) et ``agent_values`` (site x agent x mesure),
+    avec leurs marges (par mois, par site, par agent, total) et le classement
+    des agents. Chaque tranche demandée par l'application ou les
+    présentations est ensuite une lecture d'index, sans group-by pandas.
+
+    Les rapports ne détaillent pas les agents par mois : le volume d'un
+    agent est celui de la période couverte par son site.
+    """
+
+    def __init__(self, sites: List[str], months: List[str], agents: List[str],
+                 monthly: np.ndarray, agents_cube: np.ndarray, agents_present: np.ndarray):
+        self.sites = sites
+        self.months = months
+        self.agents = agents
+        self.monthly = monthly
+        self.agent_values = agents_cube
+        self._site_index = {site: i for i, site in enumerate(sites)}
+        self._month_index = {month: i for i, month in enumerate(months)}
+        self._agent_index = {agent: i for i, agent in enumerate(agents)}
+
+        # Marges mises en cache
+        self.by_month = monthly.sum(axis=0)
+        self.by_site = monthly.sum(axis=1)
+        self.total = self.by_month.sum(axis=0)
+        self.by_agent = agents_cube.sum(axis=0)
+        self.agents_by_site = agents_present.sum(axis=1)
+
+        # Un cube est partagé par le cache de rollup_for : ses tableaux sont en lecture seule
+        for array in (self.monthly, self.agent_values, self.by_month, self.by_site,
+                      self.total, self.by_agent, self.agents_by_site):
+            array.flags.writeable = False
+
+        # Classements décroissants (tri stable : à égalité, le premier agent du rapport)
+        self._rankings = {
+            measure: np.argsort(-self.by_agent[:, i], kind='stable')
+            for measure, i in _A.items()
+        }
+
+    @classmethod
+    def from_parsed(cls, parsed_data: Dict, site: str = '') -> 'RollupCube':
+        """Cube d'un rapport unique (un seul site)"""
+        return cls.from_reports({site: parsed_data})
+
+    @classmethod
+    def from_reports(cls, reports: Dict[str, Dict]) -> 'RollupCube':
+        """Cube de plusieurs rapports (un par site)"""
+        sites = list(reports)
+        frames = {site: (parsed_data.get('monthly_data', pd.DataFrame()),
+                         parsed_data.get('agents_data', pd.DataFrame()))
+                  for site, parsed_data in reports.items()}
+
+        # Mois dans l'ordre chronologique, libellés inconnus à la suite dans leur ordre d'apparition
+        seen = list(dict.fromkeys(
+            month for monthly, _ in frames.values() for month in _month_labels(monthly)
+        ))
+        months = [month for month in MONTH_ORDER if month in seen] + [month for month in seen if month not in MONTH_ORDER]
+        agents = list(dict.fromkeys(
+            str(agent) for _, agents_df in frames.values() if 'agent' in agents_df for agent in agents_df['agent']
+        ))
+        month_index = {month: i for i, month in enumerate(months)}
+        agent_index = {agent: i for i, agent in enumerate(agents)}
+
+        monthly_cube = np.zeros((len(sites), len(months), len(MONTH_MEASURES)))
+        agents_cube = np.zeros((len(sites), len(agents), len(AGENT_MEASURES)))
+        agents_present = np.zeros((len(sites), len(agents)), dtype=bool)
+
+        for s, (monthly, agents_df) in enumerate(frames.values()):
+            if not monthly.empty:
+                rows = np.array([month_index[month] for month in _month_labels(monthly)], dtype=np.intp)
+                presentes = _numeric(monthly, 'appels_presentes')
+                traites = _numeric(monthly, 'appels_traites')
+                duree = _numeric(monthly, 'duree_moyenne_conv_s')
+                nb_agents = _numeric(monthly, 'nb_agents_max')
+                has_duree = ~np.isnan(duree)
+                values = np.column_stack([
+                    np.nan_to_num(presentes),
+                    np.nan_to_num(traites),
+                    np.nan_to_num(duree),
+                    has_duree,
+                    np.nan_to_num(duree * traites),
+                    np.where(has_duree, np.nan_to_num(traites), 0),
+                    np.nan_to_num(nb_agents),
+                    ~np.isnan(nb_agents),
+                    np.ones(len(monthly)),
+                ])
+                # np.add.at : un mois présent deux fois dans un rapport est cumulé
+                np.add.at(monthly_cube[s], rows, values)
+
+            if not agents_df.empty and 'agent' in agents_df:
+                rows = np.array([agent_index[str(agent)] for agent in agents_df['agent']], dtype=np.intp)
+                values = np.column_stack([np.nan_to_num(_numeric(agents_df, m)) for m in AGENT_MEASURES])
+                np.add.at(agents_cube[s], rows, values)
+                agents_present[s, rows] = True
+
+        return cls(sites, months, agents, monthly_cube, agents_cube, agents_present)
+
+    @staticmethod
+    def _derive(vector: np.ndarray) -> Dict[str, float]:
+        """Indicateurs d'une tranche du cube mensuel à partir de ses sommes"""
+        return {
+            # Volumes : sommes de comptes, exactes en flottants
+            'appels_presentes': int(vector[_M['appels_presentes']]),
+            'appels_traites': int(vector[_M['appels_traites']]),
+            'taux_resolution': _ratio(vector[_M['appels_traites']], vector[_M['appels_presentes']], 100),
+            # Moyenne des durées mensuelles en secondes, comme dans les rapports
+            'duree_moyenne_conv_s': _ratio(vector[_M['duree_somme']], vector[_M['duree_mois']]),
+            'duree_ponderee_s': _ratio(vector[_M['duree_ponderee']], vector[_M['traites_avec_duree']]),
+            'nb_agents_max': vector[_M['nb_agents_max']] if vector[_M['agents_mois']] > 0 else np.nan,
+            'nb_mois': int(vector[_M['nb_mois']]),
+        }
+
+    @property
+    def n_agents(self) -> int:
+        """Nombre d'agents distincts"""
+        return len(self.agents)
+
+    def totals(self) -> Dict[str, float]:
+        """Indicateurs de l'ensemble des sites et des mois"""
+        return {**self._derive(self.total), 'nb_agents': self.n_agents, 'nb_sites': len(self.sites)}
+
+    def month(self, month: str, site: Optional[str] = None) -> Dict[str, float]:
+        """Indicateurs d'un mois, tous sites confondus ou pour un site"""
+        i = self._month_index[month]
+        vector = self.by_month[i] if site is None else self.monthly[self._site_index[site], i]
+        indicators = self._derive(vector)
+        # Sur un mois, chaque ligne agrégée est celle d'un site
+        indicators['nb_sites'] = indicators.pop('nb_mois')
+        return indicators
+
+    def site(self, site: str) -> Dict[str, float]:
+        """Indicateurs d'un site sur toute la période"""
+        s = self._site_index[site]
+        return {**self._derive(self.by_site[s]), 'nb_agents': int(self.agents_by_site[s])}
+
+    def agent(self, agent: str, site: Optional[str] = None) -> Dict[str, float]:
+        """Volumes et performance d'un agent, tous sites confondus ou pour un site"""
+        i = self._agent_index[agent]
+        vector = self.by_agent[i] if site is None else self.agent_values[self._site_index[site], i]
+        presentes, traites = vector[_A['appels_presentes']], vector[_A['appels_traites']]
+        return {
+            'appels_presentes': int(presentes),
+            'appels_traites': int(traites),
+            'performance': _ratio(traites, presentes, 100),
+        }
+
+    def monthly_series(self, measure: str, site: Optional[str] = None) -> np.ndarray:
+        """Série mensuelle d'une mesure additive (vue en lecture sur le cube, dans l'ordre de ``months``)"""
+        source = self.by_month if site is None else self.monthly[self._site_index[site]]
+        return source[:, _M[measure]]
+
+    def top_agents(self, n: Optional[int] = None, measure: str = 'appels_traites') -> List[str]:
+        """Agents classés par volume décroissant (les ``n`` premiers)"""
+        return [self.agents[i] for i in self._rankings[measure][:n]]
+
+    def top_agent(self, measure: str = 'appels_traites') -> Optional[str]:
+        """Agent au plus fort volume (None sans agent)"""
+        return self.agents[self._rankings[measure][0]] if self.agents else None
+
+
+def rollup_for(parsed_data: Dict) -> RollupCube:
+    """Cube d'un rapport parsé, construit une fois par contenu de tables
+
+    Les cubes sont conservés dans un cache du module, indexé par l'empreinte
+    des tables mensuelle et agents : ``parsed_data`` n'est pas modifié, et
+    des tables remplacées ou modifiées donnent un nouveau cube.
+    """
+    key = parsed_data_hash({name: parsed_data[name] for name in ('monthly_data', 'agents_data')
+                            if name in parsed_data})
+    with _CUBES_LOCK:
+        cube = _CUBES.get(key)
+        if cube is not None:
+            _CUBES.move_to_end(key)
+            return cube
+
+    cube = RollupCube.from_parsed(parsed_data)
+    with _CUBES_LOCK:
+        _CUBES[key] = cube
+        while len(_CUBES) > CUBE_CACHE_SIZE:
+            _CUBES.popitem(last=False)
+    return cube
@@ -0,0 +1,178 @@
+"""Dimensionnement des effectifs (Erlang C) à partir des volumes des rapports
+
+Toutes les fonctions sont vectorisées : un appel traite d'un bloc tous les
+mois, jours ou intervalles fournis. La probabilité d'attente est obtenue par
+la récurrence d'Erlang B,
+
+    B(0) = 1,   B(n) = A·B(n-1) / (n + A·B(n-1)),
+    C(N) = N·B(N) / (N - A·(1 - B(N))),
+
+qui ne manipule que des valeurs dans [0, 1] : contrairement à la formule
+directe (A^N / N!), elle ne déborde pas pour les forts trafics.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Objectif de service : part des appels décrochés en moins de ANSWER_TIME_TARGET secondes
+SERVICE_LEVEL_TARGET = 0.80
+ANSWER_TIME_TARGET = 20
+
+# Heures d'ouverture couvertes par un rapport mensuel (21 jours ouvrés de 8 h)
+OPEN_HOURS_PER_MONTH = 21 * 8
+
+# Borne de la recherche de l'effectif requis : au-delà, l'objectif est
+# considéré comme inatteignable (effectif requis NaN)
+MAX_AGENTS = 2000
+
+
+def traffic_intensity(calls, aht_seconds, period_seconds) -> np.ndarray:
+    """Trafic offert en Erlangs : appels x durée moyenne / durée de la période"""
+    return np.asarray(calls, dtype=float) * np.asarray(aht_seconds, dtype=float) / np.asarray(period_seconds, dtype=float)
+
+
+def erlang_c(traffic, agents) -> np.ndarray:
+    """Probabilité qu'un appel attende (Erlang C) pour ``agents`` agents
+
+    Vaut 1 lorsque l'effectif ne dépasse pas le trafic (file instable).
+    """
+    traffic, agents = np.broadcast_arrays(np.asarray(traffic, dtype=float), np.asarray(agents, dtype=float))
+    blocking = np.ones(traffic.shape)
+    blocking_at_agents = np.ones(traffic.shape)
+    agents_int = np.nan_to_num(agents, nan=0).astype(np.int64)
+
+    for n in range(1, int(agents_int.max(initial=0)) + 1):
+        blocking = traffic * blocking / (n + traffic * blocking)
+        at_n = agents_int == n
+        blocking_at_agents[at_n] = blocking[at_n]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        waiting = agents * blocking_at_agents / (agents - traffic * (1 - blocking_at_agents))
+    waiting = np.where(agents > traffic, waiting, 1.0)
+    return np.where(np.isnan(traffic) | np.isnan(agents), np.nan, waiting)
+
+
+def service_level(traffic, agents, aht_seconds, answer_time: float = ANSWER_TIME_TARGET) -> np.ndarray:
+    """Part des appels décrochés en moins de ``answer_time`` secondes"""
+    traffic = np.asarray(traffic, dtype=float)
+    agents = np.asarray(agents, dtype=float)
+    waiting = erlang_c(traffic, agents)
+    with np.errstate(invalid='ignore', over='ignore'):
+        level = 1 - waiting * np.exp(-(agents - traffic) * answer_time / np.asarray(aht_seconds, dtype=float))
+    return np.where(agents > traffic, level, 0.0)
+
+
+def average_speed_of_answer(traffic, agents, aht_seconds) -> np.ndarray:
+    """Temps d'attente moyen en secondes (infini si l'effectif ne couvre pas le trafic)"""
+    traffic = np.asarray(traffic, dtype=float)
+    agents = np.asarray(agents, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = erlang_c(traffic, agents) * np.asarray(aht_seconds, dtype=float) / (agents - traffic)
+    return np.where(agents > traffic, speed, np.inf)
+
+
+def required_agents(traffic, aht_seconds, target: float = SERVICE_LEVEL_TARGET,
+                    answer_time: float = ANSWER_TIME_TARGET,
+                    max_occupancy: Optional[float] = None) -> np.ndarray:
+    """Effectif minimal atteignant l'objectif de service
+
+    NaN si le trafic est inconnu, ou si l'objectif n'est pas atteint avec
+    ``MAX_AGENTS`` agents (voir ``compute_staffing`` pour distinguer les deux
+    cas). La récurrence d'Erlang B avance d'un agent à la fois pour toutes les
+    périodes ensemble ; une période sort de la recherche dès que son
+    objectif est atteint. ``max_occupancy`` (0-1) impose en plus un taux
+    d'occupation maximal des agents.
+    """
+    traffic, aht_seconds = np.broadcast_arrays(np.asarray(traffic, dtype=float),
+                                               np.asarray(aht_seconds, dtype=float))
+    result = np.full(traffic.shape, np.nan)
+    valid = ~(np.isnan(traffic) | np.isnan(aht_seconds))
+    result[valid & (traffic <= 0)] = 0
+    pending = valid & (traffic > 0)
+
+    blocking = np.ones(traffic.shape)
+    n = 0
+    while pending.any() and n < MAX_AGENTS:
+        n += 1
+        blocking = traffic * blocking / (n + traffic * blocking)
+        stable = pending & (n > traffic)
+        if not stable.any():
+            continue
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            waiting = n * blocking / (n - traffic * (1 - blocking))
+            level = 1 - waiting * np.exp(-(n - traffic) * answer_time / aht_seconds)
+        reached = stable & (level >= target)
+        if max_occupancy is not None:
+            reached &= traffic / n <= max_occupancy
+        result[reached] = n
+        pending &= ~reached
+
+    # Périodes encore en attente : objectif inatteignable, laissées à NaN
+    return result
+
+
+def compute_staffing(calls, aht_seconds, period_hours, agents=None,
+                     target: float = SERVICE_LEVEL_TARGET,
+                     answer_time: float = ANSWER_TIME_TARGET) -> Dict[str, np.ndarray]:
+    """Dimensionnement de chaque période (mois, jour ou intervalle)
+
+    ``calls`` et ``aht_seconds`` (durée moyenne de traitement) décrivent
+    chaque période, ``period_hours`` sa durée d'ouverture (scalaire ou
+    tableau) et ``agents`` l'effectif constaté, facultatif. Retourne des
+    tableaux alignés : trafic, effectif requis, occupation requise,
+    ``objectif_inatteignable`` (vrai si l'objectif n'est pas atteint avec
+    ``MAX_AGENTS`` agents ; l'effectif requis est alors NaN) et, si
+    l'effectif est connu, niveau de service et temps d'attente obtenus.
+    """
+    aht_seconds = np.asarray(aht_seconds, dtype=float)
+    traffic = traffic_intensity(calls, aht_seconds, np.asarray(period_hours, dtype=float) * 3600)
+    needed = required_agents(traffic, aht_seconds, target, answer_time)
+    known_traffic = ~np.isnan(traffic) & ~np.isnan(np.broadcast_to(aht_seconds, traffic.shape))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        staffing = {
+            'trafic_erlangs': traffic,
+            'agents_requis': needed,
+            'objectif_inatteignable': known_traffic & np.isnan(needed),
+            'occupation_requise': np.where(needed > 0, traffic / needed * 100, np.nan),
+        }
+    if agents is not None:
+        agents = np.asarray(agents, dtype=float)
+        known = ~np.isnan(agents) & ~np.isnan(traffic)
+        staffing['ecart_agents'] = agents - needed
+        staffing['niveau_service'] = np.where(
+            known, service_level(traffic, np.nan_to_num(agents), aht_seconds, answer_time) * 100, np.nan
+        )
+        staffing['attente_moyenne'] = np.where(
+            known, average_speed_of_answer(traffic, np.nan_to_num(agents), aht_seconds), np.nan
+        )
+    return staffing
+
+
+def staffing_table(monthly_data: pd.DataFrame, open_hours: float = OPEN_HOURS_PER_MONTH,
+                   target: float = SERVICE_LEVEL_TARGET,
+                   answer_time: float = ANSWER_TIME_TARGET) -> pd.DataFrame:
+    """Dimensionnement mensuel d'un rapport (DataFrame vide sans volumes ni durées)
+
+    Le trafic est réparti uniformément sur les heures d'ouverture du mois :
+    l'effectif requis est celui d'une heure moyenne, pas celui des pics.
+    """
+    if monthly_data.empty or not {'appels_presentes', 'duree_moyenne_conv_s'} <= set(monthly_data.columns):
+        return pd.DataFrame()
+
+    calls = pd.to_numeric(monthly_data['appels_presentes'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    aht = pd.to_numeric(monthly_data['duree_moyenne_conv_s'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    agents = None
+    if 'nb_agents_max' in monthly_data:
+        agents = pd.to_numeric(monthly_data['nb_agents_max'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+    staffing = compute_staffing(calls, aht, open_hours, agents, target, answer_time)
+    table = pd.DataFrame({'mois': monthly_data['mois'].to_numpy() if 'mois' in monthly_data else np.arange(len(calls))})
+    if agents is not None:
+        table['nb_agents_max'] = agents
+    for column, values in staffing.items():
+        table[column] = values
+    return table
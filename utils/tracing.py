@@ -0,0 +1,188 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Traceur actif dans le contexte courant (None : instrumentation désactivée).
+# Les jobs d'export copient le contexte de la session qui les soumet.
+_CURRENT_TRACER: contextvars.ContextVar = contextvars.ContextVar('tracer', default=None)
+
+# Profondeur de la span courante, pour l'affichage hiérarchique
+_DEPTH: contextvars.ContextVar = contextvars.ContextVar('trace_depth', default=0)
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def process_rss() -> int:
+    """RSS courante du processus en octets (0 hors Linux, où elle n'est pas mesurée)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _current_memory() -> int:
+    """Mémoire courante en octets : allocations Python suivies si tracemalloc est actif, sinon RSS"""
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return process_rss()
+
+
+class Tracer:
+    """Collecteur de spans : durée et variation mémoire de chaque étape du pipeline
+
+    Les spans sont enregistrées par :func:`span` et :func:`traced` lorsque le
+    traceur est actif dans le contexte courant (``with tracer.activate():`` ou
+    :func:`set_tracer`). Avec ``trace_allocations=True``, tracemalloc est
+    démarré pendant l'activation pour mesurer les allocations Python plutôt
+    que la RSS du processus (plus précis, mais nettement plus lent).
+    """
+
+    def __init__(self, trace_allocations: bool = False, max_spans: int = 10000):
+        self.trace_allocations = trace_allocations
+        self.max_spans = max_spans
+        self.spans: List[Dict] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    @contextmanager
+    def activate(self):
+        """Active le traceur pour le bloc (et les jobs soumis depuis ce bloc)"""
+        started_tracemalloc = self.trace_allocations and not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start()
+        token = _CURRENT_TRACER.set(self)
+        try:
+            yield self
+        finally:
+            _CURRENT_TRACER.reset(token)
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+    def clear(self):
+        """Supprime les spans enregistrées"""
+        with self._lock:
+            self.spans = []
+            self._origin = time.perf_counter_ns()
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int,
+               memory_delta: int, depth: int, args: Optional[Dict] = None):
+        """Enregistre une span terminée"""
+        span_data = {
+            'name': name,
+            'category': category,
+            'start_ms': (start_ns - self._origin) / 1e6,
+            'duration_ms': (end_ns - start_ns) / 1e6,
+            'memory_delta_kb': memory_delta / 1024,
+            'depth': depth,
+            'thread': threading.current_thread().name,
+            'thread_id': threading.get_ident(),
+            'args': args or {},
+        }
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span_data)
+
+    def summary(self) -> List[Dict]:
+        """Agrégat par étape : nombre d'appels, durée totale et maximale, mémoire cumulée"""
+        totals: Dict[str, Dict] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span_data in spans:
+            entry = totals.setdefault(span_data['name'], {
+                'name': span_data['name'], 'category': span_data['category'], 'count': 0,
+                'total_ms': 0.0, 'max_ms': 0.0, 'memory_delta_kb': 0.0,
+            })
+            entry['count'] += 1
+            entry['total_ms'] += span_data['duration_ms']
+            entry['max_ms'] = max(entry['max_ms'], span_data['duration_ms'])
+            entry['memory_delta_kb'] += span_data['memory_delta_kb']
+        return sorted(totals.values(), key=lambda entry: entry['total_ms'], reverse=True)
+
+    def to_json(self) -> str:
+        """Spans au format JSON"""
+        with self._lock:
+            return json.dumps({'spans': self.spans}, ensure_ascii=False, indent=2)
+
+    def to_chrome_trace(self) -> str:
+        """Spans au format Chrome Trace Event (chrome://tracing, Perfetto)"""
+        with self._lock:
+            events = [
+                {
+                    'name': span_data['name'],
+                    'cat': span_data['category'],
+                    'ph': 'X',
+                    'ts': span_data['start_ms'] * 1000,
+                    'dur': span_data['duration_ms'] * 1000,
+                    'pid': os.getpid(),
+                    'tid': span_data['thread_id'],
+                    'args': {'memory_delta_kb': round(span_data['memory_delta_kb'], 1), **span_data['args']},
+                }
+                for span_data in self.spans
+            ]
+        return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'})
+
+    def save_json(self, path: str):
+        """Enregistre les spans au format JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    def save_chrome_trace(self, path: str):
+        """Enregistre les spans au format Chrome Trace Event"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_chrome_trace())
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Traceur actif dans le contexte courant"""
+    return _CURRENT_TRACER.get()
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """Active (ou désactive avec None) un traceur pour la suite du contexte courant"""
+    _CURRENT_TRACER.set(tracer)
+
+
+@contextmanager
+def span(name: str, category: str = '', **args):
+    """Mesure la durée et la variation mémoire du bloc si un traceur est actif"""
+    tracer = _CURRENT_TRACER.get()
+    if tracer is None:
+        yield
+        return
+
+    depth = _DEPTH.get()
+    token = _DEPTH.set(depth + 1)
+    memory_before = _current_memory()
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        _DEPTH.reset(token)
+        tracer.record(name, category, start, end, _current_memory() - memory_before, depth, args)
+
+
+def traced(category: str = '', name: Optional[str] = None) -> Callable:
+    """Décorateur : enregistre chaque appel de la fonction comme une span
+
+    Le nom par défaut est le nom qualifié de la fonction
+    (``TelephoneReportParser.parse_pdf``).
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _CURRENT_TRACER.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -5,6 +5,17 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 
+from .staffing import MAX_AGENTS, SERVICE_LEVEL_TARGET, staffing_table
+from .tracing import traced
+
+# Au-delà de ce nombre de points, les séries sont tracées en WebGL
+WEBGL_THRESHOLD = 1000
+
+
+def _conversation_minutes(df: pd.DataFrame) -> pd.Series:
+    """Durée moyenne de conversation en minutes (NaN si inconnue), convertie depuis les secondes stockées"""
+    return pd.to_numeric(df['duree_moyenne_conv_s'], errors='coerce').astype('float64') / 60
+
 class TelephoneReportVisualizer:
     """Créateur de visualisations pour les rapports de téléphonie"""
     
@@ -21,6 +32,7 @@ class TelephoneReportVisualizer:
         
         self.template = "plotly_white"
     
+    @traced('visualizer')
     def create_monthly_performance_dashboard(self, monthly_data: pd.DataFrame) -> Dict[str, go.Figure]:
         """Crée un dashboard complet des performances mensuelles"""
         figures = {}
@@ -43,8 +55,14 @@ class TelephoneReportVisualizer:
         # 5. Indicateurs de tendance
         figures['trend_indicators'] = self._create_trend_indicators(monthly_data)
         
+        # 6. Dimensionnement des effectifs (volumes et durées requis)
+        staffing = staffing_table(monthly_data)
+        if not staffing.empty:
+            figures['staffing'] = self.create_staffing_chart(staffing)
+        
         return figures
     
+    @traced('visualizer')
     def _create_volume_calls_chart(self, df: pd.DataFrame) -> go.Figure:
         """Volume d'appels présentés vs traités"""
         fig = make_subplots(
@@ -100,15 +118,16 @@ class TelephoneReportVisualizer:
         
         return fig
     
+    @traced('visualizer')
     def _create_temporal_evolution_chart(self, df: pd.DataFrame) -> go.Figure:
         """Évolution temporelle des métriques clés"""
         fig = go.Figure()
         
         # Durée moyenne de conversation
-        if 'duree_moyenne_conv' in df:
+        if 'duree_moyenne_conv_s' in df:
             fig.add_trace(go.Scatter(
                 x=df['mois'],
-                y=df['duree_moyenne_conv'],
+                y=_conversation_minutes(df),
                 mode='lines+markers',
                 name='Durée Moyenne (min)',
                 line=dict(color=self.color_palette['info'], width=3),
@@ -138,6 +157,7 @@ class TelephoneReportVisualizer:
         
         return fig
     
+    @traced('visualizer')
     def _create_performance_radar(self, df: pd.DataFrame) -> go.Figure:
         """Graphique radar des performances moyennes"""
         # Calcul des moyennes
@@ -148,10 +168,11 @@ class TelephoneReportVisualizer:
             metrics.append('Volume Traité')
             values.append(df['appels_traites'].mean() / df['appels_traites'].max() * 100)
         
-        if 'duree_moyenne_conv' in df and not df['duree_moyenne_conv'].empty:
+        if 'duree_moyenne_conv_s' in df and not df['duree_moyenne_conv_s'].empty:
             metrics.append('Efficacité Temps')
             # Inverser pour que moins de temps = meilleure performance
-            values.append((df['duree_moyenne_conv'].max() - df['duree_moyenne_conv'].mean()) / df['duree_moyenne_conv'].max() * 100)
+            duree = _conversation_minutes(df)
+            values.append((duree.max() - duree.mean()) / duree.max() * 100)
         
         if 'nb_agents_max' in df and not df['nb_agents_max'].empty:
             metrics.append('Utilisation Ressources')
@@ -187,6 +208,7 @@ class TelephoneReportVisualizer:
         
         return fig
     
+    @traced('visualizer')
     def _create_activity_heatmap(self, df: pd.DataFrame) -> go.Figure:
         """Heatmap d'intensité d'activité"""
         if df.empty or 'mois' not in df:
@@ -209,8 +231,8 @@ class TelephoneReportVisualizer:
                 values = df['appels_traites']
                 normalized = (values - values.min()) / (values.max() - values.min()) * 100
                 row = normalized.tolist()
-            elif metric == 'Durée Moy.' and 'duree_moyenne_conv' in df:
-                values = df['duree_moyenne_conv']
+            elif metric == 'Durée Moy.' and 'duree_moyenne_conv_s' in df:
+                values = _conversation_minutes(df)
                 # Inverser pour que moins de temps = plus d'intensité
                 normalized = (values.max() - values) / (values.max() - values.min()) * 100
                 row = normalized.tolist()
@@ -239,6 +261,7 @@ class TelephoneReportVisualizer:
         
         return fig
     
+    @traced('visualizer')
     def _create_trend_indicators(self, df: pd.DataFrame) -> go.Figure:
         """Indicateurs de tendance avec flèches"""
         fig = make_subplots(
@@ -295,6 +318,56 @@ class TelephoneReportVisualizer:
         
         return fig
     
+    @traced('visualizer')
+    def create_staffing_chart(self, staffing: pd.DataFrame, x: str = 'mois') -> go.Figure:
+        """Effectif requis (Erlang C) comparé à l'effectif constaté, et niveau de service obtenu
+        
+        ``staffing`` est le résultat de ``staffing_table`` ou un DataFrame de
+        ``compute_staffing`` (un point par mois, jour ou intervalle).
+        """
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        many_points = len(staffing) > WEBGL_THRESHOLD
+        scatter = go.Scattergl if many_points else go.Scatter
+        mode = 'lines' if many_points else 'lines+markers'
+        x_values = staffing[x] if x in staffing else staffing.index
+        
+        if many_points:
+            fig.add_trace(scatter(x=x_values, y=staffing['agents_requis'], mode=mode,
+                                  name="Agents Requis", line=dict(color=self.color_palette['primary'])))
+        else:
+            fig.add_trace(go.Bar(x=x_values, y=staffing['agents_requis'], name="Agents Requis",
+                                 marker_color=self.color_palette['primary'], opacity=0.8))
+        
+        if 'objectif_inatteignable' in staffing and staffing['objectif_inatteignable'].any():
+            # Effectif requis inconnu (NaN) : les périodes concernées sont marquées sur l'axe
+            unreachable = staffing['objectif_inatteignable'].to_numpy(dtype=bool)
+            fig.add_trace(scatter(x=np.asarray(x_values)[unreachable], y=np.zeros(unreachable.sum()),
+                                  mode='markers', name=f"Objectif inatteignable (> {MAX_AGENTS} agents)",
+                                  marker=dict(color=self.color_palette['accent'], symbol='x', size=10)))
+        
+        if 'nb_agents_max' in staffing:
+            fig.add_trace(scatter(x=x_values, y=staffing['nb_agents_max'], mode=mode,
+                                  name="Agents Constatés", line=dict(color=self.color_palette['warning'], width=3)))
+        
+        if 'niveau_service' in staffing:
+            fig.add_trace(scatter(x=x_values, y=staffing['niveau_service'], mode=mode,
+                                  name="Niveau de Service (%)",
+                                  line=dict(color=self.color_palette['secondary'], dash='dot')),
+                          secondary_y=True)
+            fig.add_hline(y=SERVICE_LEVEL_TARGET * 100, line_dash="dash", line_color=self.color_palette['accent'],
+                          annotation_text="Objectif", secondary_y=True)
+        
+        fig.update_layout(
+            title="Dimensionnement des Effectifs (Erlang C)",
+            template=self.template,
+            hovermode='x unified'
+        )
+        fig.update_yaxes(title_text="Nombre d'Agents", secondary_y=False)
+        fig.update_yaxes(title_text="Niveau de Service (%)", secondary_y=True, range=[0, 105])
+        
+        return fig
+    
+    @traced('visualizer')
     def create_agents_performance_dashboard(self, agents_data: pd.DataFrame) -> Dict[str, go.Figure]:
         """Dashboard de performance des agents"""
         figures = {}
@@ -313,6 +386,7 @@ class TelephoneReportVisualizer:
         
         return figures
     
+    @traced('visualizer')
     def _create_agents_comparison(self, df: pd.DataFrame) -> go.Figure:
         """Comparaison des performances des agents"""
         fig = make_subplots(
@@ -348,6 +422,7 @@ class TelephoneReportVisualizer:
         fig.update_layout(title="Comparaison des Agents", template=self.template)
         return fig
     
+    @traced('visualizer')
     def _create_workload_distribution(self, df: pd.DataFrame) -> go.Figure:
         """Répartition de la charge de travail"""
         if 'agent' in df and 'appels_presentes' in df:
@@ -364,6 +439,7 @@ class TelephoneReportVisualizer:
         fig.update_layout(template=self.template)
         return fig
     
+    @traced('visualizer')
     def _create_productivity_analysis(self, df: pd.DataFrame) -> go.Figure:
         """Analyse de productivité des agents"""
         fig = go.Figure()
@@ -410,9 +486,10 @@ class TelephoneReportVisualizer:
             trends['quality_trend'] = second_half - first_half
         
         # Tendance efficacité (durée - inversée car moins = mieux)
-        if 'duree_moyenne_conv' in df:
-            first_half = df['duree_moyenne_conv'][:len(df)//2].mean()
-            second_half = df['duree_moyenne_conv'][len(df)//2:].mean()
+        if 'duree_moyenne_conv_s' in df:
+            duree = _conversation_minutes(df)
+            first_half = duree[:len(df)//2].mean()
+            second_half = duree[len(df)//2:].mean()
             trends['efficiency_trend'] = -((second_half - first_half) / first_half * 100) if first_half > 0 else 0
         
         # Tendance ressources
@@ -423,6 +500,7 @@ class TelephoneReportVisualizer:
         
         return trends
     
+    @traced('visualizer')
     def _create_empty_figures(self) -> Dict[str, go.Figure]:
         """Crée des figures vides avec messages"""
         empty_fig = go.Figure()
@@ -442,6 +520,7 @@ class TelephoneReportVisualizer:
             'trend_indicators': empty_fig
         }
     
+    @traced('visualizer')
     def _create_empty_agents_figures(self) -> Dict[str, go.Figure]:
         """Crée des figures vides pour les agents"""
         empty_fig = go.Figure()
@@ -459,6 +538,7 @@ class TelephoneReportVisualizer:
             'productivity_analysis': empty_fig
         }
     
+    @traced('visualizer')
     def create_executive_summary(self, parsed_data: Dict) -> go.Figure:
         """Crée un résumé exécutif visuel"""
         fig = make_subplots(
@@ -481,7 +561,7 @@ class TelephoneReportVisualizer:
             total_volume = monthly_data.get('appels_presentes', pd.Series([0])).sum()
             total_traites = monthly_data.get('appels_traites', pd.Series([0])).sum()
             taux_global = (total_traites / total_volume * 100) if total_volume > 0 else 0
-            duree_moyenne = monthly_data.get('duree_moyenne_conv', pd.Series([0])).mean()
+            duree_moyenne = _conversation_minutes(monthly_data).mean() if 'duree_moyenne_conv_s' in monthly_data else 0
             
             # Indicateurs KPI
             fig.add_trace(go.Indicator(
@@ -546,6 +626,7 @@ class TelephoneReportVisualizer:
         
         return fig
     
+    @traced('visualizer')
     def create_comparison_chart(self, data_2024: pd.DataFrame, data_2025: pd.DataFrame) -> go.Figure:
         """Crée un graphique de comparaison année sur année"""
         fig = go.Figure()
@@ -0,0 +1,230 @@
+"""Service d'ingestion d'un répertoire de rapports PDF
+
+Le répertoire surveillé est parcouru périodiquement. Les PDF nouveaux ou
+modifiés sont parsés sur un pool de processus borné, puis une présentation
+est générée pour chaque rapport dont les données extraites ont changé.
+
+- Déduplication : un contenu déjà traité (même empreinte SHA-256, quel que
+  soit le nom du fichier) n'est pas reparsé.
+- Reprise : l'état (fichiers vus, empreintes, données par rapport) est
+  enregistré dans un fichier de checkpoint après chaque rapport ; un
+  redémarrage reprend là où le service s'est arrêté.
+- Régénération incrémentale : un PDF réexporté dont les données extraites
+  sont identiques ne régénère pas sa présentation.
+
+Usage :
+    python -m utils.watcher <répertoire> --output decks [--interval 60] [--workers 2] [--once]
+"""
+
+import json
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .batch import parse_reports_concurrently, parsed_data_hash
+from .ingestion import PDFSource
+
+CHECKPOINT_FILE = '.ingestion_checkpoint.json'
+CHECKPOINT_VERSION = 1
+
+# Un fichier modifié depuis moins longtemps est peut-être encore en cours de copie
+SETTLE_SECONDS = 5
+
+# Statuts définitifs : tout autre statut (``en_cours`` après un arrêt brutal)
+# fait retraiter le fichier au passage suivant
+FINAL_STATUSES = ('traité', 'dupliqué', 'échec')
+
+
+class IngestionService:
+    """Surveille un répertoire et transforme chaque rapport nouveau ou modifié en présentation"""
+
+    def __init__(self, watch_dir: str, output_dir: str, max_workers: int = 2,
+                 parser_options: Optional[Dict] = None, checkpoint_path: Optional[str] = None,
+                 settle_seconds: float = SETTLE_SECONDS):
+        self.watch_dir = watch_dir
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.parser_options = parser_options or {}
+        self.checkpoint_path = checkpoint_path or os.path.join(output_dir, CHECKPOINT_FILE)
+        self.settle_seconds = settle_seconds
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.state = self._load_checkpoint()
+        self._pipeline = None
+        self._stopping = False
+
+    def run(self, interval: float = 60, once: bool = False):
+        """Boucle de surveillance (jusqu'à SIGINT/SIGTERM, ou un seul passage avec ``once``)"""
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            while not self._stopping:
+                self.process_pending(executor)
+                if once:
+                    break
+                # Attente fractionnée : l'arrêt est pris en compte rapidement
+                deadline = time.monotonic() + interval
+                while not self._stopping and time.monotonic() < deadline:
+                    time.sleep(min(1.0, interval))
+
+    def process_pending(self, executor) -> Dict[str, int]:
+        """Traite les fichiers nouveaux ou modifiés et retourne le décompte par issue"""
+        counts = {'parsés': 0, 'dupliqués': 0, 'présentations': 0, 'inchangés': 0, 'échecs': 0}
+        to_parse: Dict[str, str] = {}
+
+        for path in self._changed_files():
+            stat = os.stat(path)
+            with PDFSource.from_path(path) as source:
+                digest = source.digest
+            record = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+
+            # Contenu déjà traité : copie sous un autre nom, ou fichier touché sans
+            # modification. Un retour à une version antérieure est en revanche reparsé.
+            known = self.state['reports'].get(digest)
+            report_name = os.path.splitext(os.path.basename(path))[0]
+            if digest in to_parse.values() or (known is not None and (
+                    known['report'] != report_name
+                    or self.state['decks'].get(report_name, {}).get('data_hash') == known['data_hash'])):
+                self.state['files'][path] = {**record, 'status': 'dupliqué'}
+                counts['dupliqués'] += 1
+                continue
+            to_parse[path] = digest
+            self.state['files'][path] = {**record, 'status': 'en_cours'}
+
+        for path, parsed_data in parse_reports_concurrently(executor, {path: path for path in to_parse},
+                                                            self.parser_options):
+            if self._stopping:
+                # Les fichiers restés « en_cours » seront repris au prochain démarrage
+                break
+            outcome = self._handle_report(path, to_parse[path], parsed_data)
+            counts[outcome] += 1
+            if outcome != 'échecs':
+                counts['parsés'] += 1
+            self._save_checkpoint()
+        self._save_checkpoint()
+
+        if any(counts.values()):
+            print(f"{datetime.now():%Y-%m-%d %H:%M:%S} " + ", ".join(f"{n} {k}" for k, n in counts.items()), flush=True)
+        return counts
+
+    def _changed_files(self) -> List[str]:
+        """PDF du répertoire absents du checkpoint, non traités jusqu'au bout ou dont la taille/date a changé"""
+        changed = []
+        now = time.time()
+        for entry in sorted(os.scandir(self.watch_dir), key=lambda entry: entry.name):
+            if not entry.is_file() or not entry.name.lower().endswith('.pdf'):
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime < self.settle_seconds:
+                continue
+            known = self.state['files'].get(entry.path)
+            if (known and known.get('status') in FINAL_STATUSES
+                    and (known['size'], known['mtime_ns']) == (stat.st_size, stat.st_mtime_ns)):
+                continue
+            changed.append(entry.path)
+        return changed
+
+    def _handle_report(self, path: str, digest: str, parsed_data: Dict) -> str:
+        """Enregistre un rapport parsé et régénère sa présentation si ses données ont changé"""
+        file_record = self.state['files'][path]
+        if not parsed_data.get('parsing_success'):
+            # Non retraité tant que le fichier n'est pas modifié
+            file_record.update(status='échec', error=parsed_data.get('error'))
+            print(f"❌ {path}: {parsed_data.get('error')}", flush=True)
+            return 'échecs'
+
+        report_name = os.path.splitext(os.path.basename(path))[0]
+        data_hash = parsed_data_hash(parsed_data)
+        previous = self.state['decks'].get(report_name)
+        self.state['reports'][digest] = {'report': report_name, 'data_hash': data_hash,
+                                         'parsed_at': datetime.now().isoformat(timespec='seconds')}
+        file_record.update(status='traité')
+
+        deck_path = os.path.join(self.output_dir, f"{report_name}.pptx")
+        if previous and previous['data_hash'] == data_hash and os.path.exists(deck_path):
+            return 'inchangés'
+
+        try:
+            self._write_deck(parsed_data, deck_path)
+        except Exception as e:
+            # Une présentation en échec n'interrompt pas le service
+            file_record.update(status='échec', error=f"Génération de la présentation: {e}")
+            print(f"❌ {path}: génération de la présentation impossible: {e}", flush=True)
+            return 'échecs'
+        self.state['decks'][report_name] = {'data_hash': data_hash, 'path': deck_path, 'digest': digest}
+        print(f"✅ {path} -> {deck_path}", flush=True)
+        return 'présentations'
+
+    def _write_deck(self, parsed_data: Dict, deck_path: str):
+        """Génère la présentation d'un rapport (écriture atomique)"""
+        if self._pipeline is None:
+            from .pipeline import load_pipeline
+            self._pipeline = load_pipeline(components=['visualizer', 'generator'], strict=True)
+
+        figures = self._pipeline.visualizer.create_monthly_performance_dashboard(parsed_data['monthly_data'])
+        prs = self._pipeline.generator.create_presentation(parsed_data, figures)
+        temp_path = f"{deck_path}.tmp"
+        try:
+            with open(temp_path, 'wb') as output:
+                self._pipeline.generator.write_presentation(prs, output)
+            os.replace(temp_path, deck_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _load_checkpoint(self) -> Dict:
+        """Charge l'état du dernier passage (état vide si absent ou illisible)"""
+        empty = {'version': CHECKPOINT_VERSION, 'files': {}, 'reports': {}, 'decks': {}}
+        if not os.path.exists(self.checkpoint_path):
+            return empty
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Checkpoint illisible ({self.checkpoint_path}), reprise complète: {e}", flush=True)
+            return empty
+        if state.get('version') != CHECKPOINT_VERSION:
+            return empty
+        return state
+
+    def _save_checkpoint(self):
+        """Enregistre l'état (écriture atomique : un arrêt brutal laisse l'état précédent)"""
+        os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def _request_stop(self, signum, frame):
+        """Demande l'arrêt après le rapport en cours"""
+        self._stopping = True
+
+
+def main():
+    """Surveille un répertoire de rapports PDF et génère leurs présentations"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('watch_dir', help="Répertoire surveillé")
+    parser.add_argument('--output', default='decks', help="Répertoire des présentations et du checkpoint")
+    parser.add_argument('--interval', type=float, default=60, help="Intervalle entre deux passages (secondes)")
+    parser.add_argument('--workers', type=int, default=2, help="Nombre de processus de parsing")
+    parser.add_argument('--once', action='store_true', help="Un seul passage puis arrêt")
+    parser.add_argument('--memory-limit', type=float, help="Plafond mémoire du parsing en Mo")
+    parser.add_argument('--page-timeout', type=float, help="Budget de temps par page en secondes")
+    parser.add_argument('--layout-cache', help="Fichier des gabarits de mise en page")
+    args = parser.parse_args()
+
+    service = IngestionService(
+        args.watch_dir, args.output, max_workers=args.workers,
+        parser_options={'memory_limit_mb': args.memory_limit, 'page_timeout': args.page_timeout,
+                        'layout_cache_path': args.layout_cache},
+    )
+    service.run(interval=args.interval, once=args.once)
+
+
+if __name__ == "__main__":
+    main()